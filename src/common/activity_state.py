@@ -213,6 +213,15 @@ class ActivityState:
         """
         return self._history[index]
 
+    def getHistory(self) -> list[FlIndex]:
+        """
+        Returns the activity history, with the most recent activity first.
+
+        ### Returns:
+        * `list[FlIndex]`: activity history
+        """
+        return list(self._history)
+
     def ignoreNextHistory(self) -> None:
         """
         Don't add the next activity change to the history
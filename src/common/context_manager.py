@@ -18,6 +18,7 @@ __all__ = [
     'unsafeResetContext'
 ]
 
+import startup_profiler
 from .profiler import profilerDecoration
 from . import logger
 from typing import NoReturn, Optional, Callable, TYPE_CHECKING
@@ -31,7 +32,8 @@ from .util.api_fixes import catchUnsafeOperation
 from .util.misc import NoneNoPrintout
 from .util.events import isEventForwarded, isEventForwardedHere
 from .util.catch_exception_decorator import catchExceptionDecorator
-from .profiler import ProfilerManager
+from .profiler import ProfilerManager, setProfiler
+from .tracks import TrackPropertyCache
 
 from .states import (
     IScriptState,
@@ -60,14 +62,21 @@ class DeviceContextManager:
         modules
         """
         self.settings = Settings()
+        # Stop recording the startup if it isn't needed, so that the import
+        # hook is removed as early as possible
+        if not self.settings.get("debug.startup_profile"):
+            startup_profiler.finish()
         self.activity = ActivityState()
+        # Cache of track properties, active during each tick
+        self.track_cache = TrackPropertyCache()
         # Set the state of the script to wait for the device to be recognized
         self.state: Optional[IScriptState] = None
-        if self.settings.get("debug.profiling"):
-            trace = self.settings.get("debug.exec_tracing")
-            self.profiler: Optional[ProfilerManager] = ProfilerManager(trace)
-        else:
-            self.profiler = None
+        # Set through the property, so that the instrumentation of any
+        # previous context is disabled
+        self.profiler = None
+        self.__profiling_setting = False
+        self.__settings_version = -1
+        self.__updateProfiler()
         # Time the script last ticked at
         self._last_tick = time_ns()
         self._ticks = 0
@@ -75,19 +84,60 @@ class DeviceContextManager:
         self._slow_ticks = 0
         self._device: Optional['Device'] = None
 
-    def enableProfiler(self, trace: bool = False) -> None:
+    @property
+    def profiler(self) -> Optional[ProfilerManager]:
+        """
+        The performance profiler, or `None` if profiling is disabled
+        """
+        return self.__profiler
+
+    @profiler.setter
+    def profiler(self, profiler: Optional[ProfilerManager]) -> None:
+        self.__profiler: Optional[ProfilerManager] = profiler
+        # Update the instrumentation, so that it doesn't need to look up the
+        # context
+        setProfiler(profiler)
+
+    def __updateProfiler(self) -> None:
+        """
+        Enable or disable the profiler if the profiling setting has changed
+        """
+        self.__settings_version = self.settings.getVersion()
+        profiling = bool(self.settings.get("debug.profiling"))
+        if profiling == self.__profiling_setting:
+            return
+        self.__profiling_setting = profiling
+        if profiling:
+            self.profiler = ProfilerManager(
+                self.settings.get("debug.exec_tracing"),
+                self.settings.get("debug.profiling_sample_rate"),
+                self.settings.get("debug.profiling_quota"),
+            )
+        else:
+            self.profiler = None
+
+    def enableProfiler(
+        self,
+        trace: bool = False,
+        sample_rate: int = 1,
+        quota: float = 0.0,
+    ) -> None:
         """
         Enable the performance profiler
 
         ### Args:
         * `trace` (`bool`, optional): Whether to print traces. Defaults to
           `False`.
+        * `sample_rate` (`int`, optional): only profile 1 in every
+          `sample_rate` ticks or events. Defaults to `1`.
+        * `quota` (`float`, optional): maximum time in ms per second to spend
+          profiling ticks and events. Defaults to `0.0` (no limit).
         """
-        self.profiler = ProfilerManager(trace)
+        self.profiler = ProfilerManager(trace, sample_rate, quota)
 
+    @profilerDecoration("initialize")
     @catchExceptionDecorator(StateChangeException)
     @catchExceptionDecorator(UcsError, toErrorState)
-    @profilerDecoration("initialize")
     def initialize(self, state: IScriptState) -> None:
         """Initialize the controller associated with this context manager.
 
@@ -97,11 +147,12 @@ class DeviceContextManager:
         # Ensure settings are valid
         self.settings.assert_loaded()
         self.state = state
-        state.initialize()
+        with startup_profiler.phase(f"initialize.{type(state).__name__}"):
+            state.initialize()
 
+    @profilerDecoration("deinitialize")
     @catchExceptionDecorator(StateChangeException)
     @catchExceptionDecorator(UcsError, toErrorState)
-    @profilerDecoration("deinitialize")
     def deinitialize(self) -> None:
         """Deinitialize the controller when FL Studio closes or begins a render
         """
@@ -112,10 +163,10 @@ class DeviceContextManager:
             self.state.deinitialize()
             self.state = None
 
+    @profilerDecoration("processEvent")
     @catchUnsafeOperation
     @catchExceptionDecorator(StateChangeException)
     @catchExceptionDecorator(UcsError, toErrorState)
-    @profilerDecoration("processEvent")
     def processEvent(self, event: FlMidiMsg) -> None:
         """Process a MIDI event
 
@@ -132,16 +183,19 @@ class DeviceContextManager:
             raise MissingContextException("State not set")
         self.state.processEvent(event)
 
+    @profilerDecoration("tick")
     @catchUnsafeOperation
     @catchExceptionDecorator(StateChangeException)
     @catchExceptionDecorator(UcsError, toErrorState)
-    @profilerDecoration("tick")
     def tick(self) -> None:
         """
         Called frequently to allow any required updates to the controller
         """
         if self.state is None:
             raise MissingContextException("State not set")
+        # Apply changes to the profiling setting
+        if self.settings.getVersion() != self.__settings_version:
+            self.__updateProfiler()
         # Update number of ticks
         self._ticks += 1
         # If the last tick was over 60 ms ago, then our script is getting laggy
@@ -153,10 +207,21 @@ class DeviceContextManager:
             self._dropped_ticks += 1
             return
         tick_start = time_ns()
-        # Tick active plugin
-        self.activity.tick()
-        # Tick the current script state
-        self.state.tick()
+        # The startup is finished after the first tick once the device is
+        # recognized, since that is when the first plugin is applied
+        first_tick = startup_profiler.isActive() and self._device is not None
+        if first_tick:
+            startup_profiler.beginPhase("first-tick")
+        self.track_cache.beginFrame()
+        try:
+            # Tick active plugin
+            self.activity.tick()
+            # Tick the current script state
+            self.state.tick()
+        finally:
+            self.track_cache.endFrame()
+            if first_tick:
+                self.finishStartup()
         tick_end = time_ns()
         slow_tick_time = self.settings.get("advanced.slow_tick_time")
         if (tick_end - tick_start) / 1_000_000 > slow_tick_time:
@@ -210,9 +275,32 @@ class DeviceContextManager:
         * `StateChangeException`: state changed successfully
         """
         self.state = new_state
-        new_state.initialize()
+        with startup_profiler.phase(f"initialize.{type(new_state).__name__}"):
+            new_state.initialize()
         raise StateChangeException("State changed")
 
+    def finishStartup(self) -> None:
+        """
+        Finish profiling the script's startup, writing the profile to
+        `startup_profile.txt` in the script's directory.
+        """
+        try:
+            profile = startup_profiler.finish(startup_profiler.PROFILE_FILE)
+        except OSError as e:
+            logger.log(
+                "bootstrap.startup",
+                f"Failed to write startup profile: {e}",
+                logger.verbosity.WARNING,
+            )
+            return
+        if profile is not None:
+            logger.log(
+                "bootstrap.startup",
+                f"Startup took {profile.getTotalTime():.1f} ms, profile "
+                f"written to {startup_profiler.PROFILE_FILE}",
+                logger.verbosity.INFO,
+            )
+
     def registerDevice(self, dev: 'Device'):
         """
         Register a recognized device
@@ -349,7 +437,8 @@ def _initContext() -> None:
     Initializes the context manager for the script
     """
     global _context
-    _context = DeviceContextManager()
+    with startup_profiler.phase("create-context"):
+        _context = DeviceContextManager()
 
 
 _initContext()
@@ -60,6 +60,11 @@ CONFIG = {
         # How long to wait after sending a universal device enquiry until the
         # fallback device recognition method is used, in seconds.
         "detection_timeout": 3.0,
+        # Whether to remember the device recognized on each port, so that
+        # device detection can be skipped the next time the script starts.
+        # The device is still checked in the background, and the script will
+        # switch devices if the remembered one turns out to be incorrect.
+        "fingerprint_cache": True,
         # Associations between device name (as shown in FL Studio) and device
         # id to register (listed in class under getId() function)
         # This can be used to skip using universal device enquiry messages, if
@@ -73,10 +78,23 @@ CONFIG = {
     "debug": {
         # Whether performance profiling should be enabled
         "profiling": False,
+        # Only profile 1 in every N ticks or events (of each type), to reduce
+        # the overhead of profiling. Results are scaled to estimate the total
+        # time. 1 profiles every tick and event.
+        "profiling_sample_rate": 1,
+        # Maximum time in ms per second to spend profiling ticks and events,
+        # after which they aren't profiled until the next second. 0 for no
+        # limit.
+        "profiling_quota": 0,
         # Whether profiling should print the tracing of profiler contexts
         # within the script. Useful for troubleshooting crashes in FL Studio's
         # MIDI API. Requires profiling to be enabled.
-        "exec_tracing": False
+        "exec_tracing": False,
+        # Whether to profile the startup of the script, including the time
+        # taken to import each module. The profile is written to
+        # `startup_profile.txt` in the script's directory once the script has
+        # finished starting up.
+        "startup_profile": False,
     },
     # Logging settings
     "logger": {
@@ -97,6 +115,22 @@ CONFIG = {
         # Verbosity levels at or above this will be discarded entirely be the
         # logger to improve performance
         "discard_verbosity": verbosity.NOTE,
+        # Maximum number of log entries to keep for recalling. Older entries
+        # are discarded.
+        "max_history": 10000,
+        # Writing log entries to a file (log.jsonl in the script's directory),
+        # with one JSON object per line. Entries are written by a background
+        # thread, and are dropped if they can't be written fast enough.
+        "sink": {
+            # Whether to write log entries to the file
+            "enabled": False,
+            # Maximum number of entries waiting to be written
+            "max_queue": 1000,
+            # Size of the file at which it is rotated, in KB
+            "max_file_size": 1024,
+            # Number of rotated files to keep
+            "backups": 2,
+        },
     },
     # Advanced settings for the script. Don't edit these unless you know what
     # you're doing, as they could cause the script to break, or behave badly.
@@ -112,5 +146,24 @@ CONFIG = {
         "slow_tick_time": 50,
         # The maximum length of the plugin/window tracking history
         "activity_history_length": 25,
+        # Time in ms that can be spent during each tick preparing plugins that
+        # are likely to be used soon (based on the plugin/window history and
+        # the plugins in the project), so that they respond quickly when they
+        # are first used. Set to 0 to disable this.
+        "prewarm_budget": 5,
+        # Limits on the plugins that are kept in memory. When these are
+        # exceeded, the least recently used plugins are discarded, and are
+        # created again if they are used later. These limits apply separately
+        # to plugins and windows.
+        "plugin_cache": {
+            # Maximum number of plugins to keep in memory
+            "max_plugins": 32,
+            # Maximum estimated memory usage of plugins, in KB
+            "max_memory": 4096,
+        },
+        # Whether to save the controls bound by each plugin, so that plugins
+        # can be bound without searching for matching controls the next time
+        # the script starts.
+        "binding_plan_cache": False,
     },
 }
@@ -9,28 +9,98 @@ Authors:
 This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
-from typing import TYPE_CHECKING
+import startup_profiler
+from typing import TYPE_CHECKING, Optional
+from typing_extensions import TypeAlias
 from common.exceptions import DeviceRecognizeError, DeviceInitializeError
 from common.util.events import eventToString
 from fl_classes import FlMidiMsg
+from .loader import (
+    MANUFACTURER_START,
+    getManufacturerId,
+    loadAllDevices,
+    loadDeviceById,
+    loadDeviceByName,
+    loadDevicesForEnquiry,
+)
 
 
 if TYPE_CHECKING:
     from devices import Device
+    from control_surfaces.event_patterns import IEventPattern
+
+# Key used to index universal device enquiry responses: the manufacturer ID,
+# and the family code, or None if any family code could match
+EnquiryKey = tuple[tuple[int, ...], Optional[int]]
+
+# A candidate for matching a universal device enquiry response: the order in
+# which the device was registered, the device and its response pattern
+EnquiryCandidate: TypeAlias = "tuple[int, type[Device], IEventPattern]"
+
+
+def getFamilyCodes(
+    sysex: list,
+    manufacturer: tuple[int, ...],
+) -> Optional[list[int]]:
+    """
+    Returns the family codes matched by a universal device enquiry response
+    pattern
+
+    ### Args:
+    * `sysex` (`list`): sysex data of the pattern
+    * `manufacturer` (`tuple[int, ...]`): manufacturer ID in the pattern
+
+    ### Returns:
+    * `Optional[list[int]]`: family codes, or None if any family code could
+      match
+    """
+    position = MANUFACTURER_START + len(manufacturer)
+    if len(sysex) <= position:
+        return None
+    family = sysex[position]
+    if isinstance(family, int):
+        return [family]
+    elif isinstance(family, range):
+        return list(family)
+    elif isinstance(family, tuple):
+        codes: list[int] = []
+        for f in family:
+            if isinstance(f, range):
+                codes.extend(f)
+            else:
+                codes.append(f)
+        return codes
+    else:
+        # Wildcard
+        return None
 
 
 class DeviceCollection:
     """Collection of devices registered to the script
+
+    When devices are registered, they are indexed by the manufacturer ID and
+    family code of their universal device enquiry response, as well as by
+    their device IDs and names, so that recognizing a device only requires
+    checking a small number of candidates, regardless of how many devices are
+    registered.
     """
     def __init__(self) -> None:
         self.__devices: list[type['Device']] = []
+        # Universal device enquiry response index
+        self.__enquiry_index: dict[EnquiryKey, list[EnquiryCandidate]] = {}
+        # Devices whose manufacturer couldn't be determined from their
+        # pattern, which need to be checked against every response
+        self.__enquiry_unindexed: list[EnquiryCandidate] = []
+        # Device IDs and names
+        self.__ids: dict[str, type['Device']] = {}
+        self.__names: dict[str, type['Device']] = {}
 
     def register(self, device: type['Device']) -> None:
         """
-        Register a standard plugin
+        Register a device
 
-        This should be called after defining the class object for a plugin, so
-        that the class can be instantiated if the plugin is in use.
+        This should be called after defining the class object for a device,
+        so that the class can be instantiated if the device is in use.
 
         ### Args:
         * `device` (`type[Device]`): device to register
@@ -44,7 +114,58 @@ class DeviceCollection:
         ExtensionManager.devices.register(MyDevice)
         ```
         """
+        order = len(self.__devices)
         self.__devices.append(device)
+        for id in device.getSupportedIds():
+            self.__ids.setdefault(id, device)
+        for name in device.getDeviceNames():
+            self.__names.setdefault(name, device)
+
+        pattern = device.getUniversalEnquiryResponsePattern()
+        if pattern is None:
+            return
+        candidate = (order, device, pattern)
+        # Only basic patterns can be indexed
+        sysex = getattr(pattern, 'sysex', None)
+        manufacturer = None if sysex is None else getManufacturerId(sysex)
+        if sysex is None or manufacturer is None:
+            self.__enquiry_unindexed.append(candidate)
+            return
+        codes = getFamilyCodes(sysex, manufacturer)
+        keys: list[EnquiryKey] = (
+            [(manufacturer, None)] if codes is None
+            else [(manufacturer, c) for c in codes]
+        )
+        for key in keys:
+            self.__enquiry_index.setdefault(key, []).append(candidate)
+
+    def getEnquiryCandidates(self, sysex: bytes) -> list[EnquiryCandidate]:
+        """
+        Returns the devices that could match a universal device enquiry
+        response, in the order they were registered.
+
+        ### Args:
+        * `sysex` (`bytes`): sysex data of the response
+
+        ### Returns:
+        * `list[EnquiryCandidate]`: candidates, as tuples of registration
+          order, device and response pattern
+        """
+        manufacturer = getManufacturerId(sysex)
+        if manufacturer is None:
+            return list(self.__enquiry_unindexed)
+        position = MANUFACTURER_START + len(manufacturer)
+        family = sysex[position] if len(sysex) > position else None
+        index = self.__enquiry_index
+        candidates = (
+            index.get((manufacturer, family), [])
+            + index.get((manufacturer, None), [])
+            + self.__enquiry_unindexed
+        )
+        # Candidates come from multiple lists, so restore their original
+        # order so that earlier devices take priority
+        candidates.sort(key=lambda c: c[0])
+        return candidates
 
     def get(self, arg: 'FlMidiMsg | str') -> 'Device':
         """
@@ -62,30 +183,43 @@ class DeviceCollection:
         """
         # Device name
         if isinstance(arg, str):
-            for device in self.__devices:
-                if device.matchDeviceName(arg):
-                    # If it matches the pattern, then we found the right device
-                    # create an instance and return it
-                    try:
+            loadDeviceByName(arg)
+            device = self.__names.get(arg)
+            if device is None:
+                # Devices can also match names using matchDeviceName(), so
+                # give them all an opportunity to match
+                loadAllDevices()
+                for d in self.__devices:
+                    if d.matchDeviceName(arg):
+                        device = d
+                        break
+            if device is not None:
+                # If it matches the pattern, then we found the right device
+                # create an instance and return it
+                try:
+                    with startup_profiler.phase(
+                        f"create-device.{device.__name__}"
+                    ):
                         return device.create(None)
-                    except Exception as e:
-                        raise DeviceInitializeError(
-                            "Failed to initialise device") from e
+                except Exception as e:
+                    raise DeviceInitializeError(
+                        "Failed to initialise device") from e
             raise DeviceRecognizeError(
                 f"Device not recognized, using device name {arg}")
         # Sysex event
         # elif isinstance(arg, FlMidiMsg):
         # Can't runtime type check for MIDI events
         else:
-            for device in self.__devices:
-                pattern = device.getUniversalEnquiryResponsePattern()
-                if pattern is None:
-                    pass
-                elif pattern.matchEvent(arg):
+            loadDevicesForEnquiry(arg.sysex)
+            for _, device, pattern in self.getEnquiryCandidates(arg.sysex):
+                if pattern.matchEvent(arg):
                     # If it matches the pattern, then we found the right device
                     # create an instance and return it
                     try:
-                        return device.create(arg)
+                        with startup_profiler.phase(
+                            f"create-device.{device.__name__}"
+                        ):
+                            return device.create(arg)
                     except Exception as e:
                         raise DeviceInitializeError(
                             "Failed to initialise device") from e
@@ -107,13 +241,17 @@ class DeviceCollection:
         ### Returns:
         * `Device`: matching device
         """
-        for device in self.__devices:
-            if id in device.getSupportedIds():
-                try:
+        loadDeviceById(id)
+        device = self.__ids.get(id)
+        if device is not None:
+            try:
+                with startup_profiler.phase(
+                    f"create-device.{device.__name__}"
+                ):
                     return device.create(id=id)
-                except Exception as e:
-                    raise DeviceInitializeError(
-                        "Failed to initialise device") from e
+            except Exception as e:
+                raise DeviceInitializeError(
+                    "Failed to initialise device") from e
         raise DeviceRecognizeError(f"Device with ID {id} not found")
 
     def all(self) -> list[type['Device']]:
@@ -22,6 +22,7 @@ from .standard_plugs import StandardPluginCollection
 from .special_plugs import SpecialPluginCollection
 from .window_plugs import WindowPluginCollection
 from .devices import DeviceCollection
+from . import loader, manifest
 
 
 class ExtensionManager:
@@ -78,6 +79,17 @@ class ExtensionManager:
         cls.special.reset()
         cls.super_special.reset()
 
+    @classmethod
+    def loadAll(cls) -> None:
+        """
+        Load all extensions listed in the manifest.
+
+        Extensions are usually loaded when they are first required, so this
+        should only be used when all extensions need to be registered (for
+        example, when testing them all).
+        """
+        loader.loadAll()
+
     @classmethod
     def getInfo(cls) -> str:
         """
@@ -93,14 +105,17 @@ class ExtensionManager:
         def instantiated(obj) -> str:
             return f" ({len(obj)} instantiated)" if len(obj) else ""
 
-        # Number of devices
-        n_dev = f"{len(cls.devices)} device{plural(cls.devices)}"
-        # Number of plugins
-        n_plug = f"{len(cls.plugins)} plugin{plural(cls.plugins)}"
+        # Number of devices, including those that aren't loaded yet
+        devices = manifest.DEVICE_IDS
+        n_dev = f"{len(devices)} device{plural(devices)}"
+        # Number of plugins, including those that aren't loaded yet
+        plugins = manifest.PLUGINS
+        n_plug = f"{len(plugins)} plugin{plural(plugins)}"
         # Number of instantiated plugins
         ni_plug = instantiated(cls.plugins.instantiated())
-        # Number of windows
-        n_wind = f"{len(cls.windows)} window plugin{plural(cls.windows)}"
+        # Number of windows, including those that aren't loaded yet
+        windows = manifest.WINDOWS
+        n_wind = f"{len(windows)} window plugin{plural(windows)}"
         # Number of instantiated windows
         ni_wind = instantiated(cls.windows.instantiated())
         # Number of special plugins
@@ -135,10 +150,10 @@ class ExtensionManager:
             return 's' if len(obj) != 1 else ''
 
         # Number of devices
-        n_dev = len(cls.devices)
-        # Number of plugins
+        n_dev = len(manifest.DEVICE_IDS)
+        # Number of plugins, including those that aren't loaded yet
         n_plug = (
-            len(cls.plugins) + len(cls.windows)
+            len(manifest.PLUGINS) + len(manifest.WINDOWS)
             + len(cls.special) + len(cls.super_special)
         )
         return (
@@ -0,0 +1,167 @@
+"""
+common > extension_manager > loader
+
+Contains functions for loading the modules that register extensions when they
+are first required, using the extension manifest.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import sys
+import importlib
+import startup_profiler
+from typing import Any, Optional, Sequence
+from common.logger import log, verbosity
+from common.profiler import ProfilerContext
+from . import manifest
+
+__all__ = [
+    'getManufacturerId',
+    'loadModule',
+    'loadDevicesForEnquiry',
+    'loadDeviceById',
+    'loadDeviceByName',
+    'loadAllDevices',
+    'loadPlugin',
+    'loadWindow',
+    'loadAll',
+]
+
+LOG_CAT = "extensions.loader"
+
+# Index of the first manufacturer byte in a universal device enquiry response
+MANUFACTURER_START = 5
+
+
+def getManufacturerId(sysex: Sequence[Any]) -> Optional[tuple[int, ...]]:
+    """
+    Returns the manufacturer ID contained within a universal device enquiry
+    response, or the equivalent part of a response pattern.
+
+    Manufacturer IDs are either a single byte, or three bytes where the first
+    is zero.
+
+    ### Args:
+    * `sysex` (`Sequence[Any]`): sysex data of the response, or of the
+      pattern used to match it
+
+    ### Returns:
+    * `tuple[int, ...]`: manufacturer ID, or `None` if it couldn't be
+      determined (the data is too short or isn't a constant value)
+    """
+    if len(sysex) <= MANUFACTURER_START:
+        return None
+    first = sysex[MANUFACTURER_START]
+    if not isinstance(first, int):
+        return None
+    if first != 0:
+        return (first,)
+    manufacturer = tuple(sysex[MANUFACTURER_START:MANUFACTURER_START + 3])
+    if len(manufacturer) != 3 or not all(
+        isinstance(b, int) for b in manufacturer
+    ):
+        return None
+    return manufacturer
+
+
+def loadModule(module: str) -> None:
+    """
+    Load an extension module if it hasn't been loaded already
+
+    ### Args:
+    * `module` (`str`): full name of the module
+    """
+    if module in sys.modules:
+        return
+    log(LOG_CAT, f"Loading extension module '{module}'", verbosity.INFO)
+    with ProfilerContext(f"load-{module}"), \
+            startup_profiler.phase(f"load.{module}"):
+        importlib.import_module(module)
+
+
+def loadDevicesForEnquiry(sysex: bytes) -> None:
+    """
+    Load the modules for all devices that could match the given universal
+    device enquiry response
+
+    ### Args:
+    * `sysex` (`bytes`): sysex data of the response
+    """
+    for module in manifest.DEVICE_MANUFACTURERS.get(
+        getManufacturerId(sysex), ()
+    ):
+        loadModule(module)
+    # Devices whose manufacturer couldn't be determined could match anything
+    for module in manifest.DEVICE_MANUFACTURERS.get(None, ()):
+        loadModule(module)
+
+
+def loadDeviceById(id: str) -> None:
+    """
+    Load the module for the device with the given ID, if there is one
+
+    ### Args:
+    * `id` (`str`): device ID
+    """
+    module = manifest.DEVICE_IDS.get(id)
+    if module is not None:
+        loadModule(module)
+
+
+def loadDeviceByName(name: str) -> None:
+    """
+    Load the module for the device with the given name, if there is one
+
+    ### Args:
+    * `name` (`str`): device name, as given by `device.getName()`
+    """
+    module = manifest.DEVICE_NAMES.get(name)
+    if module is not None:
+        loadModule(module)
+
+
+def loadAllDevices() -> None:
+    """
+    Load the modules for all devices
+    """
+    for module in sorted(set(manifest.DEVICE_IDS.values())):
+        loadModule(module)
+
+
+def loadPlugin(id: str) -> None:
+    """
+    Load the module for the standard plugin with the given ID, if there is one
+
+    ### Args:
+    * `id` (`str`): plugin ID
+    """
+    module = manifest.PLUGINS.get(id)
+    if module is not None:
+        loadModule(module)
+
+
+def loadWindow(index: int) -> None:
+    """
+    Load the module for the window plugin for the given window, if there is
+    one
+
+    ### Args:
+    * `index` (`int`): index of the window
+    """
+    module = manifest.WINDOWS.get(index)
+    if module is not None:
+        loadModule(module)
+
+
+def loadAll() -> None:
+    """
+    Load all the modules listed in the manifest
+    """
+    loadAllDevices()
+    for module in sorted(set(manifest.PLUGINS.values())):
+        loadModule(module)
+    for module in sorted(set(manifest.WINDOWS.values())):
+        loadModule(module)
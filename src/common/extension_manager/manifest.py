@@ -0,0 +1,113 @@
+"""
+common > extension_manager > manifest
+
+Manifest of the modules that register each extension, so that they can be
+loaded when they are first required, rather than when the script starts.
+
+THIS FILE IS GENERATED. To regenerate it after adding or removing an
+extension, run the following from the `src` directory:
+
+```sh
+python -m common.extension_manager.manifest_generator
+```
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import Optional
+
+# Device IDs, mapped to the module defining the device
+DEVICE_IDS: dict[str, str] = {
+    'Akai.Mpk.Mini.Mk3': 'devices.akai.mpk_mini_mk3',
+    'Korg.NanoKontrol.Mk1': 'devices.korg.nano_kontrol.mk1.nano_kontrol',
+    'Maudio.Hammer88Pro': 'devices.maudio.hammer88pro.hammer88pro',
+    'Novation.Launchkey.Mk2.25': 'devices.novation.launchkey.mk2.launchkey',
+    'Novation.Launchkey.Mk2.49': 'devices.novation.launchkey.mk2.launchkey',
+    'Novation.Launchkey.Mk2.61': 'devices.novation.launchkey.mk2.launchkey',
+    'Novation.Launchkey.Mk3.25': 'devices.novation.launchkey.mk3.lk_25_37',
+    'Novation.Launchkey.Mk3.37': 'devices.novation.launchkey.mk3.lk_25_37',
+    'Novation.Launchkey.Mk3.49': 'devices.novation.launchkey.mk3.lk_49_61',
+    'Novation.Launchkey.Mk3.61': 'devices.novation.launchkey.mk3.lk_49_61',
+    'Novation.Launchkey.Mk3.88': 'devices.novation.launchkey.mk3.lk_49_61',
+    'Novation.Launchkey.Mk3.Mini': 'devices.novation.launchkey.mk3_mini.mini',
+    'Novation.SL.Mk3': 'devices.novation.sl.mk3.device',
+}
+
+# Device names, mapped to the module defining the device
+DEVICE_NAMES: dict[str, str] = {
+}
+
+# Manufacturer IDs from universal device enquiry responses, mapped to the
+# modules defining devices from that manufacturer. Devices whose manufacturer
+# is unknown are listed under `None`.
+DEVICE_MANUFACTURERS: dict[Optional[tuple[int, ...]], tuple[str, ...]] = {
+    (0x00, 0x01, 0x05): ('devices.maudio.hammer88pro.hammer88pro',),
+    (0x00, 0x20, 0x29): (
+        'devices.novation.launchkey.mk2.launchkey',
+        'devices.novation.launchkey.mk3.lk_25_37',
+        'devices.novation.launchkey.mk3.lk_49_61',
+        'devices.novation.launchkey.mk3_mini.mini',
+        'devices.novation.sl.mk3.device',
+    ),
+    (0x42,): ('devices.korg.nano_kontrol.mk1.nano_kontrol',),
+    (0x47,): ('devices.akai.mpk_mini_mk3',),
+}
+
+# Plugin names, mapped to the module defining their plugin
+PLUGINS: dict[str, str] = {
+    'Abbey Road One': 'plugs.standard.spitfire.spitfire_generic',
+    'Abbey Road Two': 'plugs.standard.spitfire.spitfire_generic',
+    'Appassionata Strings': 'plugs.standard.spitfire.spitfire_generic',
+    'BBC Symphony Orchestra': 'plugs.standard.spitfire.spitfire_generic',
+    'DAW Cassette': 'plugs.standard.klevgrand.daw_cassette',
+    'Eric Whitacre Choir': 'plugs.standard.spitfire.spitfire_generic',
+    'FLEX': 'plugs.standard.fl.flex',
+    'FPC': 'plugs.standard.fl.fpc',
+    'Fink Signatures': 'plugs.standard.spitfire.spitfire_generic',
+    'Fruity Slicer': 'plugs.standard.fl.slicers',
+    'Fruity parametric EQ 2': 'plugs.standard.fl.parametric_eq',
+    'Hammers': 'plugs.standard.spitfire.spitfire_generic',
+    'Hans Zimmer Strings': 'plugs.standard.spitfire.spitfire_generic',
+    'Harmless': 'plugs.standard.fl.harmless',
+    'Heirloom': 'plugs.standard.spitfire.spitfire_generic',
+    'LABS': 'plugs.standard.spitfire.spitfire_generic',
+    'OTT': 'plugs.standard.xfer',
+    'Originals - Cimbalom': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Cinematic Frozen Strings':
+        'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Cinematic Pads': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Cinematic Percussion':
+        'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Cinematic Soft Piano':
+        'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Drumline': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Epic Brass & Woodwinds':
+        'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Epic Choir': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Epic Strings': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Felt Piano': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Firewood Piano': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Intimate Grand Piano':
+        'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Intimate Strings': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Jangle Box Piano': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Media Toolkit': 'plugs.standard.spitfire.spitfire_generic',
+    'Originals - Mrs Mills Piano': 'plugs.standard.spitfire.spitfire_generic',
+    'Polaris': 'plugs.standard.spitfire.spitfire_generic',
+    'Serum': 'plugs.standard.xfer',
+    'Slicex': 'plugs.standard.fl.slicers',
+    'Transistor Bass': 'plugs.standard.fl.transistor_bass',
+    'Vital': 'plugs.standard.matt_tytel.vital',
+}
+
+# Window indexes, mapped to the module defining their plugin
+WINDOWS: dict[int, str] = {
+    0: 'plugs.windows.mixer',
+    1: 'plugs.windows.channel_rack.plug',
+    2: 'plugs.windows.playlist',
+    3: 'plugs.windows.piano_roll',
+    4: 'plugs.windows.browser',
+}
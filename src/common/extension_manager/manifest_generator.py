@@ -0,0 +1,198 @@
+"""
+common > extension_manager > manifest_generator
+
+Contains functions for generating the extension manifest, which lists the
+module that registers each extension.
+
+To regenerate the manifest after adding or removing an extension, run the
+following from the `src` directory:
+
+```sh
+python -m common.extension_manager.manifest_generator
+```
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import importlib
+import pkgutil
+from pathlib import Path
+from typing import Any, Optional
+from .extension_manager import ExtensionManager
+from .loader import getManufacturerId
+
+__all__ = [
+    'importAllExtensions',
+    'buildManifest',
+    'generateManifest',
+]
+
+MANIFEST_HEADER = '''"""
+common > extension_manager > manifest
+
+Manifest of the modules that register each extension, so that they can be
+loaded when they are first required, rather than when the script starts.
+
+THIS FILE IS GENERATED. To regenerate it after adding or removing an
+extension, run the following from the `src` directory:
+
+```sh
+python -m common.extension_manager.manifest_generator
+```
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import Optional
+'''
+
+MANIFEST_TABLES = {
+    'DEVICE_IDS': (
+        'dict[str, str]',
+        'Device IDs, mapped to the module defining the device',
+    ),
+    'DEVICE_NAMES': (
+        'dict[str, str]',
+        'Device names, mapped to the module defining the device',
+    ),
+    'DEVICE_MANUFACTURERS': (
+        'dict[Optional[tuple[int, ...]], tuple[str, ...]]',
+        'Manufacturer IDs from universal device enquiry responses, mapped to '
+        'the\n# modules defining devices from that manufacturer. Devices '
+        'whose manufacturer\n# is unknown are listed under `None`.',
+    ),
+    'PLUGINS': (
+        'dict[str, str]',
+        'Plugin names, mapped to the module defining their plugin',
+    ),
+    'WINDOWS': (
+        'dict[int, str]',
+        'Window indexes, mapped to the module defining their plugin',
+    ),
+}
+
+# Maximum line length of the generated code
+MAX_LINE = 79
+
+
+def importAllExtensions() -> None:
+    """
+    Import every module in the `devices` and `plugs` packages, regardless of
+    whether it is listed in the manifest.
+    """
+    import devices
+    import plugs
+    for package in [devices, plugs]:
+        for info in pkgutil.walk_packages(
+            package.__path__,
+            f"{package.__name__}.",
+        ):
+            importlib.import_module(info.name)
+
+
+def buildManifest() -> dict[str, dict[Any, Any]]:
+    """
+    Build the manifest from the extensions that are currently registered.
+
+    All extension modules should be imported before calling this, otherwise
+    the manifest will be incomplete.
+
+    ### Returns:
+    * `dict[str, dict]`: mapping of the name of each table in the manifest to
+      its contents
+    """
+    device_ids: dict[str, str] = {}
+    device_names: dict[str, str] = {}
+    manufacturers: dict[Optional[tuple[int, ...]], set[str]] = {}
+    for dev in ExtensionManager.devices.all():
+        for id in dev.getSupportedIds():
+            device_ids[id] = dev.__module__
+        for name in dev.getDeviceNames():
+            device_names[name] = dev.__module__
+        pattern = dev.getUniversalEnquiryResponsePattern()
+        if pattern is None:
+            continue
+        key = getManufacturerId(getattr(pattern, 'sysex', []))
+        manufacturers.setdefault(key, set()).add(dev.__module__)
+
+    plugins: dict[str, str] = {}
+    for plug in ExtensionManager.plugins.all():
+        for plug_id in plug.getPlugIds():
+            plugins[plug_id] = plug.__module__
+
+    windows: dict[int, str] = {}
+    for window in ExtensionManager.windows.all():
+        windows[window.getWindowId().index] = window.__module__
+
+    return {
+        'DEVICE_IDS': dict(sorted(device_ids.items())),
+        'DEVICE_NAMES': dict(sorted(device_names.items())),
+        'DEVICE_MANUFACTURERS': {
+            k: tuple(sorted(manufacturers[k]))
+            for k in sorted(
+                manufacturers.keys(),
+                key=lambda k: (k is not None, k or ()),
+            )
+        },
+        'PLUGINS': dict(sorted(plugins.items())),
+        'WINDOWS': dict(sorted(windows.items())),
+    }
+
+
+def formatValue(value: Any) -> str:
+    """
+    Format a value in the manifest, showing bytes in hexadecimal
+    """
+    if isinstance(value, tuple):
+        if len(value) == 1:
+            return f"({formatValue(value[0])},)"
+        return f"({', '.join(formatValue(v) for v in value)})"
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"0x{value:02X}"
+    return repr(value)
+
+
+def formatEntry(key: Any, value: Any) -> str:
+    """
+    Format an entry of a table in the manifest, wrapping it if it is too long
+    """
+    # Window indexes aren't bytes, so shouldn't be shown in hexadecimal
+    key_str = repr(key) if isinstance(key, int) else formatValue(key)
+    line = f"    {key_str}: {formatValue(value)},"
+    if len(line) <= MAX_LINE:
+        return line + "\n"
+    if isinstance(value, tuple):
+        values = ''.join(f"        {formatValue(v)},\n" for v in value)
+        return f"    {key_str}: (\n{values}    ),\n"
+    return f"    {key_str}:\n        {formatValue(value)},\n"
+
+
+def generateManifest() -> str:
+    """
+    Import all extensions, and generate the source code of the manifest
+
+    ### Returns:
+    * `str`: source code of manifest module
+    """
+    importAllExtensions()
+    source = MANIFEST_HEADER
+    for name, table in buildManifest().items():
+        table_type, comment = MANIFEST_TABLES[name]
+        source += f"\n# {comment}\n"
+        source += f"{name}: {table_type} = {{\n"
+        for key, value in table.items():
+            source += formatEntry(key, value)
+        source += "}\n"
+    return source
+
+
+if __name__ == '__main__':
+    path = Path(__file__).parent.joinpath('manifest.py')
+    path.write_text(generateManifest())
+    print(f"Wrote manifest to {path}")
@@ -0,0 +1,202 @@
+"""
+common > extension_manager > plugin_cache
+
+Contains the PluginCache class, which stores instantiated plugins, discarding
+the least recently used plugins when there are too many of them.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, Hashable, Optional, TypeVar
+
+import common
+from common.logger import log, verbosity
+
+if TYPE_CHECKING:
+    from plugs import Plugin
+
+__all__ = [
+    'PluginCache',
+]
+
+LOG_CAT = "extensions.plugins.cache"
+
+K = TypeVar('K', bound=Hashable)
+P = TypeVar('P', bound='Plugin')
+
+
+class PluginCache(Generic[K, P]):
+    """
+    A least-recently-used cache of instantiated plugins.
+
+    The number of plugins and their estimated memory usage are limited by the
+    `advanced.plugin_cache` settings. When a plugin is added and the limits
+    are exceeded, the least recently used plugins are evicted (calling their
+    `onEvict()` method), so that they are created again next time they are
+    used. The most recently added plugin is never evicted.
+
+    Hits, misses and evictions are counted by the profiler, under the name
+    given when creating the cache.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Create a PluginCache
+
+        ### Args:
+        * `name` (`str`): name of the cache, used for profiler counters (eg
+          `plugins.cache`)
+        """
+        self.__name = name
+        # Plugins, and their estimated memory usage in bytes, with the least
+        # recently used plugins first
+        self.__plugins: OrderedDict[K, tuple[P, int]] = OrderedDict()
+        self.__memory = 0
+        self.__evictions = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"PluginCache({len(self.__plugins)} plugins, "
+            f"{self.__memory / 1024:.1f} KB, {self.__evictions} evictions)"
+        )
+
+    def __len__(self) -> int:
+        return len(self.__plugins)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.__plugins
+
+    def __count(self, counter: str) -> None:
+        profiler = common.getContext().profiler
+        if profiler is not None:
+            profiler.incrementCounter(f"{self.__name}.{counter}")
+
+    @staticmethod
+    def __getLimits() -> tuple[int, int]:
+        """
+        Returns the maximum number of plugins, and the maximum memory usage
+        in bytes
+        """
+        settings = common.getContext().settings
+        return (
+            settings.get("advanced.plugin_cache.max_plugins"),
+            settings.get("advanced.plugin_cache.max_memory") * 1024,
+        )
+
+    def get(self, key: K) -> Optional[P]:
+        """
+        Returns the plugin with the given key, marking it as the most recently
+        used plugin
+
+        ### Args:
+        * `key` (`K`): key of plugin
+
+        ### Returns:
+        * `Optional[P]`: plugin, or `None` if it isn't in the cache
+        """
+        try:
+            plug, _ = self.__plugins[key]
+        except KeyError:
+            self.__count("misses")
+            return None
+        self.__plugins.move_to_end(key)
+        self.__count("hits")
+        return plug
+
+    def peek(self, key: K) -> Optional[P]:
+        """
+        Returns the plugin with the given key, without marking it as used
+
+        ### Args:
+        * `key` (`K`): key of plugin
+
+        ### Returns:
+        * `Optional[P]`: plugin, or `None` if it isn't in the cache
+        """
+        entry = self.__plugins.get(key)
+        return None if entry is None else entry[0]
+
+    def hasSpace(self) -> bool:
+        """
+        Returns whether a plugin can be added without evicting others. This is
+        used so that plugins that are created ahead of time don't replace
+        plugins that have actually been used.
+
+        ### Returns:
+        * `bool`: whether there is space
+        """
+        max_plugins, max_memory = self.__getLimits()
+        return len(self.__plugins) < max_plugins and self.__memory < max_memory
+
+    def add(self, key: K, plug: P) -> None:
+        """
+        Add a plugin as the most recently used plugin, evicting the least
+        recently used plugins if the limits are exceeded
+
+        ### Args:
+        * `key` (`K`): key of plugin
+        * `plug` (`P`): plugin
+        """
+        if key in self.__plugins:
+            self.__memory -= self.__plugins.pop(key)[1]
+        size = plug.estimateMemory()
+        self.__plugins[key] = (plug, size)
+        self.__memory += size
+        max_plugins, max_memory = self.__getLimits()
+        while len(self.__plugins) > 1 and (
+            len(self.__plugins) > max_plugins or self.__memory > max_memory
+        ):
+            self.__evictOldest()
+
+    def __evictOldest(self) -> None:
+        key, (plug, size) = self.__plugins.popitem(last=False)
+        self.__memory -= size
+        self.__evictions += 1
+        log(
+            LOG_CAT,
+            f"Evicted plugin {key!r} ({size / 1024:.1f} KB)",
+            verbosity.INFO,
+        )
+        self.__count("evictions")
+        plug.onEvict()
+
+    def clear(self) -> None:
+        """
+        Remove all plugins from the cache, without evicting them
+        """
+        self.__plugins.clear()
+        self.__memory = 0
+
+    def keys(self) -> list[K]:
+        """
+        Returns the keys of the plugins in the cache, least recently used first
+        """
+        return list(self.__plugins.keys())
+
+    def values(self) -> list[P]:
+        """
+        Returns the plugins in the cache, least recently used first
+        """
+        return [plug for plug, _ in self.__plugins.values()]
+
+    def getMemory(self) -> int:
+        """
+        Returns the total estimated memory usage of the plugins in the cache
+
+        ### Returns:
+        * `int`: memory usage in bytes
+        """
+        return self.__memory
+
+    def getEvictions(self) -> int:
+        """
+        Returns the number of plugins that have been evicted from the cache
+
+        ### Returns:
+        * `int`: number of evictions
+        """
+        return self.__evictions
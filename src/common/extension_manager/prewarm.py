@@ -0,0 +1,262 @@
+"""
+common > extension_manager > prewarm
+
+Contains the PluginPrewarmer class, which instantiates plugins that are likely
+to be used soon during idle ticks, so that switching to them for the first
+time is as fast as switching to a plugin that has already been used.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import time
+import channels
+import mixer
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+import common
+from common.logger import log, verbosity
+from common.plug_indexes import (
+    FlIndex,
+    PluginIndex,
+    WindowIndex,
+    GeneratorIndex,
+    EffectIndex,
+)
+from common.profiler import ProfilerContext
+from . import manifest
+from .extension_manager import ExtensionManager
+
+if TYPE_CHECKING:
+    from devices import Device
+
+__all__ = [
+    'PluginPrewarmer',
+]
+
+LOG_CAT = "extensions.prewarm"
+
+# Number of effect slots on each mixer track
+EFFECT_SLOTS = 10
+
+# Number of ticks to wait before instantiating a plugin that is expected to
+# take longer than the whole budget
+OVER_BUDGET_TICKS = 20
+
+# A plugin ID or a window index
+Candidate = Union[str, WindowIndex]
+
+
+class PluginPrewarmer:
+    """
+    Instantiates plugins that are likely to be used soon, within a time budget
+    for each tick (given by the `advanced.prewarm_budget` setting).
+
+    Plugins are considered in the following order:
+    1. Plugins and windows in the activity history, most recent first
+    2. Generator plugins in the project
+    3. Effect plugins in the project
+    4. All other windows
+
+    Since a plugin can't be partially instantiated, a plugin is only
+    instantiated if the average time taken to instantiate the previous plugins
+    fits within the remaining budget for the tick. Otherwise, it is left until
+    the next tick. Before any plugins have been instantiated, the time is
+    unknown, so a plugin is only instantiated if the full budget remains. If
+    plugins are expected to take longer than the whole budget, a plugin is
+    instantiated at the start of a tick once every `OVER_BUDGET_TICKS` ticks,
+    so that prewarming continues slowly rather than stopping.
+    """
+
+    def __init__(self, device: 'Device') -> None:
+        """
+        Create a PluginPrewarmer
+
+        ### Args:
+        * `device` (`Device`): device to bind plugins to
+        """
+        self.__device = device
+        self.__candidates: Optional[Iterator[Candidate]] = None
+        self.__seen: set[Candidate] = set()
+        # Candidate that didn't fit into the budget during the previous tick
+        self.__pending: Optional[Candidate] = None
+        # Number of ticks that the pending candidate has waited
+        self.__waited = 0
+        # Number of plugins instantiated, and total time taken to do so (ms)
+        self.__created = 0
+        self.__time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"PluginPrewarmer({self.__created} plugins prepared, "
+            f"{self.getAverageCost():.3f} ms average)"
+        )
+
+    def getAverageCost(self) -> float:
+        """
+        Returns the average time taken to instantiate a plugin
+
+        ### Returns:
+        * `float`: time in ms, or `0.0` if no plugins have been instantiated
+        """
+        if self.__created == 0:
+            return 0.0
+        return self.__time / self.__created
+
+    def restart(self) -> None:
+        """
+        Restart the search for plugins to instantiate. This should be called
+        when the activity history changes.
+        """
+        self.__candidates = None
+        self.__pending = None
+        self.__seen = set()
+
+    def tick(self, changed: bool) -> None:
+        """
+        Instantiate plugins that are likely to be used, within the time budget
+
+        ### Args:
+        * `changed` (`bool`): whether the active plugin or window changed
+          during this tick. If so, no plugins are instantiated this tick, and
+          the search is restarted so that the new history is considered.
+        """
+        if changed:
+            self.restart()
+            return
+        budget = common.getContext().settings.get("advanced.prewarm_budget")
+        if budget <= 0:
+            return
+        if self.__candidates is None:
+            self.__candidates = self.__getCandidates()
+        start = time.perf_counter()
+        # Whether a plugin was instantiated during this tick
+        created = False
+        with ProfilerContext("prewarm"):
+            while True:
+                remaining = budget - (time.perf_counter() - start) * 1000
+                if remaining <= 0:
+                    return
+                if self.__pending is not None:
+                    candidate: Optional[Candidate] = self.__pending
+                    self.__pending = None
+                else:
+                    candidate = self.__nextCandidate()
+                if candidate is None:
+                    return
+                if self.__isInstantiated(candidate):
+                    continue
+                if not self.__fits(remaining, created):
+                    self.__pending = candidate
+                    if not created:
+                        self.__waited += 1
+                    return
+                if self.__preload(candidate):
+                    self.__waited = 0
+                    created = True
+
+    def __fits(self, remaining: float, created: bool) -> bool:
+        """
+        Returns whether a plugin is expected to fit within the remaining
+        budget
+
+        ### Args:
+        * `remaining` (`float`): remaining budget for this tick, in ms
+        * `created` (`bool`): whether a plugin was already instantiated during
+          this tick
+
+        ### Returns:
+        * `bool`: whether a plugin should be instantiated
+        """
+        if created:
+            return self.getAverageCost() <= remaining
+        if self.__created == 0:
+            # The cost is unknown, but the full budget remains
+            return True
+        return (
+            self.getAverageCost() <= remaining
+            or self.__waited >= OVER_BUDGET_TICKS
+        )
+
+    def __nextCandidate(self) -> Optional[Candidate]:
+        """
+        Returns the next candidate that hasn't been considered yet, or `None`
+        if there are none left
+        """
+        assert self.__candidates is not None
+        for candidate in self.__candidates:
+            if candidate not in self.__seen:
+                self.__seen.add(candidate)
+                return candidate
+        return None
+
+    def __getCandidates(self) -> Iterator[Candidate]:
+        """
+        Yields the plugins that could be instantiated, in order of priority
+        """
+        for activity in common.getContext().activity.getHistory():
+            candidate = self.__toCandidate(activity)
+            if candidate is not None:
+                yield candidate
+        for i in range(channels.channelCount(True)):
+            generator = GeneratorIndex(i)
+            if generator.isValid():
+                yield generator.getName()
+        for track in range(mixer.trackCount()):
+            for slot in range(EFFECT_SLOTS):
+                effect = EffectIndex(track, slot)
+                if effect.isValid():
+                    yield effect.getName()
+        for index in manifest.WINDOWS.keys():
+            yield WindowIndex(index)
+
+    @staticmethod
+    def __toCandidate(activity: FlIndex) -> Optional[Candidate]:
+        if isinstance(activity, WindowIndex):
+            return activity
+        assert isinstance(activity, PluginIndex)
+        if not activity.isValid():
+            return None
+        return activity.getName()
+
+    @staticmethod
+    def __isInstantiated(candidate: Candidate) -> bool:
+        if isinstance(candidate, WindowIndex):
+            return ExtensionManager.windows.isInstantiated(candidate)
+        return ExtensionManager.plugins.isInstantiated(candidate)
+
+    def __preload(self, candidate: Candidate) -> bool:
+        """
+        Instantiate the plugin for the given candidate, recording the time
+        taken if a plugin was instantiated
+
+        ### Returns:
+        * `bool`: whether a plugin was instantiated
+        """
+        start = time.perf_counter()
+        if isinstance(candidate, WindowIndex):
+            created = ExtensionManager.windows.preload(
+                candidate,
+                self.__device,
+            )
+        else:
+            created = ExtensionManager.plugins.preload(
+                candidate,
+                self.__device,
+            )
+        if not created:
+            return False
+        duration = (time.perf_counter() - start) * 1000
+        self.__created += 1
+        self.__time += duration
+        log(
+            LOG_CAT,
+            f"Prepared plugin for {candidate!r} in {duration:.3f} ms",
+            verbosity.NOTE,
+        )
+        profiler = common.getContext().profiler
+        if profiler is not None:
+            profiler.incrementCounter("plugins.prewarm.created")
+        return True
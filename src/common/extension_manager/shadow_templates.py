@@ -0,0 +1,127 @@
+"""
+common > extension_manager > shadow_templates
+
+Contains the ShadowTemplateCache class, which stores the device shadow
+templates used by each plugin class, and saves their binding plans so that
+they can be reused when the script is next started.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import TYPE_CHECKING, Optional
+
+import common
+from common.logger import log, verbosity
+from common.util.binding_plans import (
+    getPlanKey,
+    getBindingPlan,
+    saveBindingPlan,
+)
+
+if TYPE_CHECKING:
+    from devices import Device, DeviceShadow, ShadowTemplate
+    from plugs import Plugin
+
+__all__ = [
+    'ShadowTemplateCache',
+]
+
+LOG_CAT = "extensions.plugins.plans"
+
+
+class ShadowTemplateCache:
+    """
+    Device shadow templates for each plugin class, so that classes which are
+    associated with many plugins can share their controls and bindings.
+
+    If the `advanced.binding_plan_cache` setting is enabled, the binding plan
+    recorded by each template is saved, and is loaded next time the template
+    is created, so that plugins are bound without needing to search for
+    matching controls. If the plugin binds different controls to the saved
+    plan, it falls back to searching, and the new plan is saved.
+    """
+
+    def __init__(self) -> None:
+        self.__templates: dict[type['Plugin'], 'ShadowTemplate'] = {}
+        # Template whose control shadows are shared by the other templates
+        self.__base: Optional['ShadowTemplate'] = None
+        # Templates whose plans were loaded, but haven't been used yet
+        self.__unverified: set['ShadowTemplate'] = set()
+
+    def get(
+        self,
+        plug: type['Plugin'],
+        device: 'Device',
+    ) -> 'ShadowTemplate':
+        """
+        Returns the device shadow template for the given plugin class,
+        creating it if required
+
+        ### Args:
+        * `plug` (`type[Plugin]`): plugin class
+        * `device` (`Device`): device to shadow
+
+        ### Returns:
+        * `ShadowTemplate`: template
+        """
+        from devices import ShadowTemplate
+        template = self.__templates.get(plug)
+        if template is not None and template.getDevice() is device:
+            return template
+        if self.__base is None or self.__base.getDevice() is not device:
+            self.__base = ShadowTemplate(device)
+        template = ShadowTemplate(device, self.__base)
+        self.__templates[plug] = template
+        if common.getContext().settings.get("advanced.binding_plan_cache"):
+            plan = getBindingPlan(getPlanKey(device, plug))
+            if plan is not None:
+                template.recordPlan(plan)
+                self.__unverified.add(template)
+                log(
+                    LOG_CAT,
+                    f"Loaded binding plan for {plug.__name__}",
+                    verbosity.INFO,
+                )
+        return template
+
+    def record(
+        self,
+        plug: type['Plugin'],
+        template: 'ShadowTemplate',
+        shadow: 'DeviceShadow',
+    ) -> None:
+        """
+        Record the binding plan of a device shadow created from a template,
+        saving it if it wasn't already saved
+
+        ### Args:
+        * `plug` (`type[Plugin]`): plugin class
+        * `template` (`ShadowTemplate`): template that the shadow was created
+          from
+        * `shadow` (`DeviceShadow`): device shadow, after the plugin was
+          created
+        """
+        plan = shadow.getBindingPlan()
+        if template in self.__unverified:
+            self.__unverified.remove(template)
+            if plan == template.getPlan():
+                return
+            # The saved plan is out of date
+            template.recordPlan(plan, replace=True)
+        elif template.getPlan() is None:
+            template.recordPlan(plan)
+        else:
+            return
+        if common.getContext().settings.get("advanced.binding_plan_cache"):
+            saveBindingPlan(getPlanKey(template.getDevice(), plug), plan)
+
+    def clear(self) -> None:
+        """
+        Remove all the templates
+        """
+        self.__templates.clear()
+        self.__unverified.clear()
+        self.__base = None
@@ -10,6 +10,7 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+import startup_profiler
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -57,7 +58,10 @@ class SpecialPluginCollection:
             if p.shouldBeActive():
                 # If it hasn't been instantiated yet, instantiate it
                 if p not in self.__instantiated.keys():
-                    self.__instantiated[p] = p.create(DeviceShadow(device))
+                    with startup_profiler.phase(
+                        f"create-plugin.{p.__name__}"
+                    ):
+                        self.__instantiated[p] = p.create(DeviceShadow(device))
                 ret.append(self.__instantiated[p])
         return ret
 
@@ -10,8 +10,13 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+import startup_profiler
 from typing import TYPE_CHECKING, Optional
 
+from .loader import loadPlugin
+from .plugin_cache import PluginCache
+from .shadow_templates import ShadowTemplateCache
+
 if TYPE_CHECKING:
     from plugs import StandardPlugin
     from devices import Device
@@ -22,9 +27,11 @@ class StandardPluginCollection:
     """
     def __init__(self) -> None:
         self.__mappings: dict[str, type['StandardPlugin']] = {}
-        self.__instantiated: dict[str, 'StandardPlugin'] = {}
+        self.__instantiated: PluginCache[str, 'StandardPlugin'] \
+            = PluginCache("plugins.cache")
         self.__fallback: Optional[type['StandardPlugin']] = None
         self.__fallback_inst: Optional['StandardPlugin'] = None
+        self.__templates = ShadowTemplateCache()
 
     def register(self, plug: type['StandardPlugin']) -> None:
         """
@@ -63,39 +70,88 @@ class StandardPluginCollection:
     def get(self, id: str, device: 'Device') -> Optional['StandardPlugin']:
         """Get an instance of the plugin matching this plugin id
         """
-        from devices.device_shadow import DeviceShadow
+        from devices import DeviceShadow
         # Plugin already instantiated
-        if id in self.__instantiated.keys():
-            return self.__instantiated[id]
+        instance = self.__instantiated.get(id)
+        if instance is not None:
+            return instance
+        # Plugin may exist, but its module hasn't been loaded yet
+        if id not in self.__mappings.keys():
+            loadPlugin(id)
         # Plugin exists but isn't instantiated
-        elif id in self.__mappings.keys():
-            self.__instantiated[id] \
-                = self.__mappings[id].create(DeviceShadow(device))
-            return self.__instantiated[id]
+        if id in self.__mappings.keys():
+            plug = self.__mappings[id]
+            template = self.__templates.get(plug, device)
+            with startup_profiler.phase(f"create-plugin.{plug.__name__}"):
+                shadow = DeviceShadow(device, template)
+                instance = plug.create(shadow)
+            self.__templates.record(plug, template, shadow)
+            self.__instantiated.add(id, instance)
+            return instance
         # Plugin doesn't exist
         else:
             if self.__fallback_inst is None:
                 if self.__fallback is None:
                     return None
                 else:
-                    self.__fallback_inst \
-                        = self.__fallback.create(DeviceShadow(device))
+                    with startup_profiler.phase(
+                        f"create-plugin.{self.__fallback.__name__}"
+                    ):
+                        self.__fallback_inst \
+                            = self.__fallback.create(DeviceShadow(device))
             return self.__fallback_inst
 
+    def preload(self, id: str, device: 'Device') -> bool:
+        """
+        Instantiate the plugin matching this plugin ID ahead of time, so that
+        it is ready when it is first used.
+
+        Unlike `get()`, the fallback plugin isn't instantiated if there is no
+        matching plugin.
+
+        ### Args:
+        * `id` (`str`): plugin ID
+        * `device` (`Device`): device to bind the plugin to
+
+        ### Returns:
+        * `bool`: whether a plugin was instantiated
+        """
+        if id in self.__instantiated or not self.__instantiated.hasSpace():
+            return False
+        if id not in self.__mappings.keys():
+            loadPlugin(id)
+        if id not in self.__mappings.keys():
+            return False
+        self.get(id, device)
+        return True
+
+    def isInstantiated(self, id: str) -> bool:
+        """
+        Returns whether the plugin matching this plugin ID is instantiated
+
+        ### Args:
+        * `id` (`str`): plugin ID
+
+        ### Returns:
+        * `bool`: whether it is instantiated
+        """
+        return id in self.__instantiated
+
     def getFallback(self) -> Optional['StandardPlugin']:
         """Return the fallback plugin if registered
         """
         return self.__fallback_inst
 
     def reset(self) -> None:
-        self.__instantiated = {}
+        self.__instantiated.clear()
+        self.__templates.clear()
         self.__fallback_inst = None
 
     def all(self) -> list[type['StandardPlugin']]:
         return list(self.__mappings.values())
 
     def instantiated(self) -> list['StandardPlugin']:
-        return list(self.__instantiated.values())
+        return self.__instantiated.values()
 
     def __len__(self) -> int:
         return len(self.__mappings)
@@ -126,8 +182,8 @@ class StandardPluginCollection:
 
         for id, p in self.__mappings.items():
             if p == plug:
-                if id in self.__instantiated.keys():
-                    matches.append((id, self.__instantiated[id]))
+                if id in self.__instantiated:
+                    matches.append((id, self.__instantiated.peek(id)))
                 else:
                     matches.append((id, None))
 
@@ -146,8 +202,11 @@ class StandardPluginCollection:
             ])
 
     def _inspect_id(self, id: str) -> str:
-        if id in self.__instantiated.keys():
-            return f"{id} associated with:\n\n{self.__instantiated[id]}"
+        # Plugin may exist, but its module hasn't been loaded yet
+        if id not in self.__mappings.keys():
+            loadPlugin(id)
+        if id in self.__instantiated:
+            return f"{id} associated with:\n\n{self.__instantiated.peek(id)}"
         elif id in self.__mappings.keys():
             return f"{id} associated with: {self.__mappings[id]} "\
                     "(not instantiated)"
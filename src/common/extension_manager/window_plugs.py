@@ -10,8 +10,13 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+import startup_profiler
 from typing import TYPE_CHECKING, Optional
 
+from .loader import loadWindow
+from .plugin_cache import PluginCache
+from .shadow_templates import ShadowTemplateCache
+
 if TYPE_CHECKING:
     from plugs import WindowPlugin
     from devices import Device
@@ -23,7 +28,9 @@ class WindowPluginCollection:
     """
     def __init__(self) -> None:
         self.__mappings: dict[WindowIndex, type['WindowPlugin']] = {}
-        self.__instantiated: dict[WindowIndex, 'WindowPlugin'] = {}
+        self.__instantiated: PluginCache[WindowIndex, 'WindowPlugin'] \
+            = PluginCache("windows.cache")
+        self.__templates = ShadowTemplateCache()
 
     def register(self, plug: type['WindowPlugin']) -> None:
         """
@@ -53,15 +60,24 @@ class WindowPluginCollection:
     ) -> Optional['WindowPlugin']:
         """Get an instance of the plugin matching this window index
         """
-        from devices.device_shadow import DeviceShadow
+        from devices import DeviceShadow
         # Plugin already instantiated
-        if id in self.__instantiated.keys():
-            return self.__instantiated[id]
+        instance = self.__instantiated.get(id)
+        if instance is not None:
+            return instance
+        # Plugin may exist, but its module hasn't been loaded yet
+        if id not in self.__mappings.keys():
+            loadWindow(id.index)
         # Plugin exists but isn't instantiated
-        elif id in self.__mappings.keys():
-            self.__instantiated[id] \
-                = self.__mappings[id].create(DeviceShadow(device))
-            return self.__instantiated[id]
+        if id in self.__mappings.keys():
+            plug = self.__mappings[id]
+            template = self.__templates.get(plug, device)
+            with startup_profiler.phase(f"create-plugin.{plug.__name__}"):
+                shadow = DeviceShadow(device, template)
+                instance = plug.create(shadow)
+            self.__templates.record(plug, template, shadow)
+            self.__instantiated.add(id, instance)
+            return instance
         # Plugin doesn't exist
         else:
             # log(
@@ -71,14 +87,43 @@ class WindowPluginCollection:
             # )
             return None
 
+    def preload(self, id: 'WindowIndex', device: 'Device') -> bool:
+        """
+        Instantiate the plugin matching this window index ahead of time, so
+        that it is ready when it is first used.
+
+        ### Args:
+        * `id` (`WindowIndex`): window index
+        * `device` (`Device`): device to bind the plugin to
+
+        ### Returns:
+        * `bool`: whether a plugin was instantiated
+        """
+        if id in self.__instantiated or not self.__instantiated.hasSpace():
+            return False
+        return self.get(id, device) is not None
+
+    def isInstantiated(self, id: 'WindowIndex') -> bool:
+        """
+        Returns whether the plugin matching this window index is instantiated
+
+        ### Args:
+        * `id` (`WindowIndex`): window index
+
+        ### Returns:
+        * `bool`: whether it is instantiated
+        """
+        return id in self.__instantiated
+
     def reset(self) -> None:
-        self.__instantiated = {}
+        self.__instantiated.clear()
+        self.__templates.clear()
 
     def all(self) -> list[type['WindowPlugin']]:
         return list(self.__mappings.values())
 
     def instantiated(self) -> list['WindowPlugin']:
-        return list(self.__instantiated.values())
+        return self.__instantiated.values()
 
     def __len__(self) -> int:
         return len(self.__mappings)
@@ -112,8 +157,8 @@ class WindowPluginCollection:
 
         for id, p in self.__mappings.items():
             if p == plug:
-                if id in self.__instantiated.keys():
-                    matches.append((id, self.__instantiated[id]))
+                if id in self.__instantiated:
+                    matches.append((id, self.__instantiated.peek(id)))
                 else:
                     matches.append((id, None))
 
@@ -0,0 +1,119 @@
+"""
+common > logger > category_filter
+
+Contains CategoryFilter, which determines the verbosity at which log items of
+each category are printed
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import Iterator
+from .log_hierarchy import HIERARCHY
+from .verbosity import Verbosity
+
+
+def isInCategory(category: str, parent: str) -> bool:
+    """
+    Returns whether a category is the given parent category, or one of its
+    sub-categories
+
+    For example, `device.event.in` is in `device.event`, but
+    `device.eventful` isn't.
+
+    ### Args:
+    * `category` (`str`): category to check
+    * `parent` (`str`): parent category. An empty string matches all
+      categories.
+
+    ### Returns:
+    * `bool`: whether the category is in the parent
+    """
+    return (
+        parent == ''
+        or category == parent
+        or category.startswith(parent + '.')
+    )
+
+
+def _flatten(hierarchy: dict, prefix: str = '') -> Iterator[str]:
+    """
+    Yields the full names of all the categories in a hierarchy
+    """
+    for name, children in hierarchy.items():
+        category = prefix + name
+        yield category
+        yield from _flatten(children, category + '.')
+
+
+class CategoryFilter:
+    """
+    A lookup table of the maximum verbosity at which items in each category
+    are printed, compiled from the logger settings.
+
+    Categories in the log hierarchy are added when the filter is created, and
+    other categories are added when they are first used, so that checking
+    whether an item should be printed only needs one dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        watched_categories: list[str],
+        max_verbosity: Verbosity,
+        max_watched_verbosity: Verbosity,
+        critical_verbosity: Verbosity,
+        discard_verbosity: Verbosity,
+    ) -> None:
+        """
+        Create a CategoryFilter
+
+        ### Args:
+        * `watched_categories` (`list[str]`): categories to print at the
+          watched verbosity, including their sub-categories
+        * `max_verbosity` (`Verbosity`): maximum verbosity to print for
+          categories that aren't watched
+        * `max_watched_verbosity` (`Verbosity`): maximum verbosity to print for
+          watched categories
+        * `critical_verbosity` (`Verbosity`): maximum verbosity to print with
+          full details, for all categories
+        * `discard_verbosity` (`Verbosity`): items more verbose than this
+          aren't logged at all
+        """
+        self.__watched = tuple(watched_categories)
+        self.__max = max_verbosity
+        self.__max_watched = max_watched_verbosity
+        self.critical = critical_verbosity
+        self.discard = discard_verbosity
+        self.__thresholds: dict[str, Verbosity] = {}
+        for category in _flatten(HIERARCHY):
+            self.__thresholds[category] = self.__compile(category)
+
+    def __compile(self, category: str) -> Verbosity:
+        """
+        Calculate the maximum verbosity at which items of a category are
+        printed, either normally or with full details
+        """
+        if any(isInCategory(category, c) for c in self.__watched):
+            threshold = self.__max_watched
+        else:
+            threshold = self.__max
+        return max(threshold, self.critical)
+
+    def getThreshold(self, category: str) -> Verbosity:
+        """
+        Returns the maximum verbosity at which items in the given category are
+        printed
+
+        ### Args:
+        * `category` (`str`): category
+
+        ### Returns:
+        * `Verbosity`: maximum verbosity to print
+        """
+        threshold = self.__thresholds.get(category)
+        if threshold is None:
+            threshold = self.__compile(category)
+            self.__thresholds[category] = threshold
+        return threshold
@@ -21,7 +21,9 @@ HIERARCHY = {
         "device": {
             "type_detect": {},
             "initialize": {},
-        }
+            "fingerprint": {},
+        },
+        "startup": {},
     },
     "device": {
         "event": {
@@ -37,7 +39,11 @@ HIERARCHY = {
     },
     "extensions": {
         "manager": {},
+        "loader": {},
+        "prewarm": {},
         "plugins": {
+            "cache": {},
+            "plans": {},
             "special": {},
             "window": {},
             "standard": {}
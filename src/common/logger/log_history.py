@@ -0,0 +1,178 @@
+"""
+common > logger > log_history
+
+Contains LogHistory, a fixed-capacity ring buffer used to store the most
+recent entries of the script's log
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from collections import deque
+from typing import Iterator, Optional
+from .log_item import LogItem
+
+
+class LogHistory:
+    """
+    The most recent items in the log.
+
+    Items are stored in a ring buffer, so that once the buffer is full, each
+    new item replaces the oldest item, and the memory used by the log doesn't
+    grow during long sessions. Items are accessed using their index in the
+    log, which continues to increase after old items are discarded.
+
+    The indexes of the items in each category (and each of their parent
+    categories) are also stored, so that the items in a category can be found
+    without checking every item.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Create a LogHistory
+
+        ### Args:
+        * `capacity` (`int`): maximum number of items to store
+        """
+        self.__items: list[Optional[LogItem]] = [None] * max(capacity, 1)
+        # Total number of items that have been added
+        self.__total = 0
+        # Indexes of the items in each category and its sub-categories, from
+        # oldest to newest
+        self.__categories: dict[str, deque[int]] = {}
+        # Indexes that each category is added to, which are those of the
+        # category and all its parent categories
+        self.__indexes: dict[str, tuple[deque[int], ...]] = {}
+
+    def __getIndexes(self, category: str) -> tuple[deque[int], ...]:
+        """
+        Returns the indexes of the category and all its parent categories
+        """
+        indexes = self.__indexes.get(category)
+        if indexes is None:
+            parts = category.split('.')
+            indexes = tuple(
+                self.__categories.setdefault('.'.join(parts[:i]), deque())
+                for i in range(1, len(parts) + 1)
+            )
+            self.__indexes[category] = indexes
+        return indexes
+
+    def __len__(self) -> int:
+        return min(self.__total, len(self.__items))
+
+    def getCapacity(self) -> int:
+        """
+        Returns the maximum number of items that can be stored
+
+        ### Returns:
+        * `int`: capacity
+        """
+        return len(self.__items)
+
+    def setCapacity(self, capacity: int) -> None:
+        """
+        Change the maximum number of items that can be stored, discarding the
+        oldest items if there are too many
+
+        ### Args:
+        * `capacity` (`int`): new capacity
+        """
+        capacity = max(capacity, 1)
+        items = list(self)[-capacity:]
+        self.__items = [None] * capacity
+        for indexes in self.__categories.values():
+            indexes.clear()
+        for item in items:
+            self.__items[item.index % capacity] = item
+            for indexes in self.__getIndexes(item.category):
+                indexes.append(item.index)
+
+    def getTotal(self) -> int:
+        """
+        Returns the total number of items that have been added, including
+        items that have since been discarded. This is the index of the next
+        item.
+
+        ### Returns:
+        * `int`: number of items added
+        """
+        return self.__total
+
+    def append(self, item: LogItem) -> None:
+        """
+        Add an item, replacing the oldest item if the history is full
+
+        ### Args:
+        * `item` (`LogItem`): item to add. Its index should be the value of
+          `getTotal()`.
+        """
+        slot = self.__total % len(self.__items)
+        old = self.__items[slot]
+        if old is not None:
+            # The replaced item is the oldest item, so it is first in each
+            # index
+            for indexes in self.__getIndexes(old.category):
+                indexes.popleft()
+        self.__items[slot] = item
+        for indexes in self.__getIndexes(item.category):
+            indexes.append(item.index)
+        self.__total += 1
+
+    def __getitem__(self, index: int) -> LogItem:
+        """
+        Returns the item with the given index in the log
+
+        ### Args:
+        * `index` (`int`): index of the item. Negative indexes count back
+          from the newest item, so `-1` is the newest item.
+
+        ### Raises:
+        * `IndexError`: item was discarded, or hasn't been logged yet
+
+        ### Returns:
+        * `LogItem`: item
+        """
+        if index < 0:
+            index += self.__total
+        if not self.__total - len(self) <= index < self.__total:
+            raise IndexError(f"Log item #{index} isn't in the log history")
+        item = self.__items[index % len(self.__items)]
+        assert item is not None
+        return item
+
+    def __iter__(self) -> Iterator[LogItem]:
+        """
+        Iterate over the items, from oldest to newest
+        """
+        for i in range(self.__total - len(self), self.__total):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[LogItem]:
+        """
+        Iterate over the items, from newest to oldest
+        """
+        for i in range(self.__total - 1, self.__total - len(self) - 1, -1):
+            yield self[i]
+
+    def iterCategory(self, category: str) -> Iterator[LogItem]:
+        """
+        Iterate over the items in a category and its sub-categories, from
+        newest to oldest
+
+        ### Args:
+        * `category` (`str`): category. An empty string matches all items.
+
+        ### Returns:
+        * `Iterator[LogItem]`: items in the category
+        """
+        if category == '':
+            yield from reversed(self)
+            return
+        indexes = self.__categories.get(category)
+        if indexes is None:
+            return
+        for i in reversed(indexes):
+            yield self[i]
@@ -14,21 +14,45 @@ import time
 
 # import traceback
 
+from typing import Optional
 from .verbosity import Verbosity
 
+# Types of format arguments that can't change after they are logged, and
+# don't belong to FL Studio, so can be formatted from other threads
+IMMUTABLE_TYPES = frozenset({str, int, float, bool, bytes, type(None)})
+
 
 class LogItem:
     """
-    Internal representation of an item that has been logged
+    Internal representation of an item that has been logged.
+
+    If format arguments are given, the message and details are only formatted
+    when they are needed (for example when the item is printed), so that
+    items that are never printed are cheap to log. Formatting is safe to do
+    from multiple threads, as the templates are never modified, and the
+    formatted message and details are assigned together.
     """
 
+    __slots__ = (
+        'category',
+        'verbosity',
+        'index',
+        'time',
+        'trace',
+        '__message',
+        '__details',
+        '__args',
+        '__formatted',
+    )
+
     def __init__(
         self,
         category: str,
         message: str,
         details: str,
         verbosity: Verbosity,
-        index: int
+        index: int,
+        args: tuple = (),
     ) -> None:
         """
         Create a LogItem
@@ -39,15 +63,73 @@ class LogItem:
         * `details` (`str`): detailed message if required
         * `verbosity` (`Verbosity`): verbosity to log at
         * `index` (`int`): index of this log item
+        * `args` (`tuple`, optional): arguments used to format the message and
+          details, using `str.format()`. Defaults to `()`, meaning that the
+          message and details aren't formatted.
         """
         self.category = category
-        self.message = message
-        self.details = details
+        self.__message = message
+        self.__details = details
+        self.__args = args
+        # Formatted (message, details), or None if not formatted yet
+        self.__formatted: Optional[tuple[str, str]] = \
+            None if len(args) else (message, details)
         self.verbosity = verbosity
         self.index = index
         self.time = time.time()
         self.trace = None  # traceback.extract_stack(limit=-2)
 
+    def __format(self) -> tuple[str, str]:
+        """
+        Format the message and details using the format arguments
+
+        ### Returns:
+        * `tuple[str, str]`: formatted message and details
+        """
+        # The arguments are read before checking whether another thread
+        # formatted the item, as they are only cleared after that
+        args = self.__args
+        formatted = self.__formatted
+        if formatted is not None:
+            return formatted
+        message = self.__message.format(*args)
+        details = self.__details.format(*args) if len(self.__details) else ''
+        formatted = (message, details)
+        self.__formatted = formatted
+        self.__args = ()
+        return formatted
+
+    def snapshot(self) -> None:
+        """
+        Make sure that the item can be formatted from another thread, by
+        formatting it now unless all of its format arguments are immutable
+        values.
+        """
+        if self.__formatted is None and any(
+            type(arg) not in IMMUTABLE_TYPES for arg in self.__args
+        ):
+            self.__format()
+
+    @property
+    def message(self) -> str:
+        """
+        The message of the log item
+        """
+        formatted = self.__formatted
+        if formatted is None:
+            formatted = self.__format()
+        return formatted[0]
+
+    @property
+    def details(self) -> str:
+        """
+        The detailed message of the log item
+        """
+        formatted = self.__formatted
+        if formatted is None:
+            formatted = self.__format()
+        return formatted[1]
+
     def __str__(self) -> str:
         """
         Convert this log item to a string, usually for printing.
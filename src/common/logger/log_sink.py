@@ -0,0 +1,237 @@
+"""
+common > logger > log_sink
+
+Contains LogSink, which writes log items to a local file as JSON lines, using
+a background thread so that logging never blocks the script
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from .log_item import LogItem
+
+try:
+    # FL Studio's Python environment may not include these modules, in which
+    # case the log sink is unavailable
+    import json
+    import os
+    import queue
+    import threading
+except ImportError:  # pragma: no cover
+    SINK_AVAILABLE = False
+else:
+    SINK_AVAILABLE = True
+
+__all__ = [
+    'SINK_AVAILABLE',
+    'LOG_FILE',
+    'LogSink',
+]
+
+LOG_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-3]) + '/log.jsonl'
+
+# Time in seconds that the writer waits for items before checking whether it
+# should stop
+POLL_TIME = 0.1
+
+
+class LogSink:
+    """
+    Writes log items to a local file, with one JSON object per line.
+
+    Items are added to a bounded queue, which is drained by a background
+    writer thread. If the queue is full, items are dropped, so that adding
+    items never blocks. Once the file exceeds its maximum size, it is rotated,
+    keeping the given number of old files, named `<path>.1`, `<path>.2`, etc.
+
+    Items are formatted by the writer thread where possible. Items with
+    format arguments that could change or that belong to FL Studio are
+    formatted before they are added, since FL Studio's objects can't be
+    used safely from other threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int,
+        max_file_size: int,
+        backups: int,
+    ) -> None:
+        """
+        Create a LogSink, starting its writer thread
+
+        ### Args:
+        * `path` (`str`): path of the file to write to
+        * `max_queue` (`int`): maximum number of items waiting to be written
+        * `max_file_size` (`int`): size in bytes at which the file is rotated
+        * `backups` (`int`): number of rotated files to keep
+        """
+        if not SINK_AVAILABLE:  # pragma: no cover
+            raise NotImplementedError(
+                "The log sink isn't supported in this Python environment"
+            )
+        self.__path = path
+        self.__max_file_size = max_file_size
+        self.__backups = backups
+        self.__queue: 'queue.Queue[LogItem]' = queue.Queue(max(max_queue, 1))
+        self.__stopping = threading.Event()
+        # Backpressure counters
+        self.__queued = 0
+        self.__dropped = 0
+        self.__written = 0
+        self.__errors = 0
+        self.__rotations = 0
+        self.__max_depth = 0
+        self.__thread = threading.Thread(
+            target=self.__run,
+            name="ucs-log-sink",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def getPath(self) -> str:
+        """
+        Returns the path of the file being written to
+
+        ### Returns:
+        * `str`: path
+        """
+        return self.__path
+
+    def put(self, item: LogItem) -> bool:
+        """
+        Add an item to be written, dropping it if the queue is full
+
+        ### Args:
+        * `item` (`LogItem`): item to write
+
+        ### Returns:
+        * `bool`: whether the item was added
+        """
+        if self.__queue.full():
+            self.__dropped += 1
+            return False
+        item.snapshot()
+        try:
+            self.__queue.put_nowait(item)
+        except queue.Full:
+            self.__dropped += 1
+            return False
+        self.__queued += 1
+        depth = self.__queue.qsize()
+        if depth > self.__max_depth:
+            self.__max_depth = depth
+        return True
+
+    def getCounters(self) -> dict[str, int]:
+        """
+        Returns counters describing the items handled by the sink
+
+        * `queued`: items added to the queue
+        * `dropped`: items dropped because the queue was full
+        * `written`: items written to the file
+        * `pending`: items waiting to be written
+        * `max_depth`: greatest number of items waiting to be written
+        * `errors`: items that couldn't be written, and failed rotations
+        * `rotations`: number of times the file was rotated
+
+        ### Returns:
+        * `dict[str, int]`: counters
+        """
+        return {
+            "queued": self.__queued,
+            "dropped": self.__dropped,
+            "written": self.__written,
+            "pending": self.__queue.qsize(),
+            "max_depth": self.__max_depth,
+            "errors": self.__errors,
+            "rotations": self.__rotations,
+        }
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Stop the writer thread, after it writes the items in the queue
+
+        ### Args:
+        * `timeout` (`float`, optional): maximum time to wait for the writer,
+          in seconds. Defaults to `1.0`.
+        """
+        self.__stopping.set()
+        self.__thread.join(timeout)
+
+    @staticmethod
+    def __encode(item: LogItem) -> str:
+        return json.dumps({
+            "index": item.index,
+            "time": item.time,
+            "category": item.category,
+            "verbosity": item.verbosity,
+            "message": item.message,
+            "details": item.details,
+        }) + '\n'
+
+    def __getSize(self) -> int:
+        """
+        Returns the current size of the file
+        """
+        try:
+            return os.path.getsize(self.__path)
+        except OSError:
+            return 0
+
+    def __rotate(self) -> None:
+        """
+        Rotate the file, discarding the oldest backup
+        """
+        try:
+            for i in range(self.__backups - 1, 0, -1):
+                if os.path.exists(f"{self.__path}.{i}"):
+                    os.replace(f"{self.__path}.{i}", f"{self.__path}.{i + 1}")
+            if self.__backups > 0:
+                os.replace(self.__path, f"{self.__path}.1")
+            else:
+                os.remove(self.__path)
+        except OSError:
+            self.__errors += 1
+        self.__rotations += 1
+
+    def __run(self) -> None:
+        """
+        Write items from the queue until the sink is closed
+        """
+        size = self.__getSize()
+        while True:
+            try:
+                items = [self.__queue.get(timeout=POLL_TIME)]
+            except queue.Empty:
+                if self.__stopping.is_set():
+                    return
+                continue
+            # Write all available items at once
+            while True:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for item in items:
+                try:
+                    lines.append(self.__encode(item))
+                except Exception:
+                    # Formatting the message failed
+                    self.__errors += 1
+            data = ''.join(lines)
+            try:
+                with open(self.__path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            except OSError:
+                self.__errors += len(lines)
+                continue
+            self.__written += len(lines)
+            size += len(data.encode('utf-8'))
+            if size >= self.__max_file_size:
+                self.__rotate()
+                size = 0
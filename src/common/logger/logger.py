@@ -14,10 +14,19 @@ more details.
 __all__ = [
     'log'
 ]
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+from .category_filter import CategoryFilter
 from .log_item import LogItem
+from .log_history import LogHistory
+from . import log_sink
 from .verbosity import Verbosity, DEFAULT, ERROR, NOTE
 
+if TYPE_CHECKING:
+    from common.settings import Settings
+
+# Number of items to keep before the settings are loaded
+DEFAULT_HISTORY = 1000
+
 
 class Log:
     """
@@ -34,142 +43,142 @@ class Log:
             " * length(): returns the length of the log",
             " * recall(): recall log entries",
             " * inspect(index): print detailed info about a log entry",
+            " * sinkInfo(): print statistics about the log file",
         ]))
         return ""
 
     def __init__(self) -> None:
-        self._history: list[LogItem] = []
-
-    @staticmethod
-    def _shouldPrint(
-        item: LogItem,
-        category: Optional[str] = None,
-        verbosity: Optional[Verbosity] = None
-    ) -> bool:
-        """Returns whether the logger should print an item
-
-        * By default (no category or verbosity specified), it checks whether
-          the item's categories are in the watched categories. If so, it will
-          print out if the verbosity is less than the given verbosity, or the
-          `logger.max_watched_verbosity` setting if that isn't provided.
-          Otherwise it will print out if the verbosity is less than the given
-          verbosity, or the `logger.max_verbosity` setting if that isn't
-          provided.
-        * If a category is specified, it will print if the item is in that
-          category and the verbosity is less than the given verbosity, or the
-          `logger.max_watched_verbosity` setting if that isn't provided.
-
-        Args:
-        * `item` (`LogItem`): item to check
-        * `category` (`str`, optional): category  to filter by. Defaults to
-          `None`.
-        * `verbosity` (`Verbosity`, optional): greatest verbosity to print.
-          Defaults to `None`.
-
-        Returns:
-        * `bool`: whether it was printed
+        # Most recent items. The capacity is updated from the
+        # `logger.max_history` setting once the context is available.
+        self._history = LogHistory(DEFAULT_HISTORY)
+        # Filter used if the context isn't loaded
+        self.__default_filter = CategoryFilter(
+            [],
+            DEFAULT,
+            DEFAULT,
+            ERROR,
+            NOTE,
+        )
+        # Filter compiled from the settings, along with the settings and the
+        # settings version it was compiled from
+        self.__filter = self.__default_filter
+        self.__filter_source: Optional[tuple['Settings', int]] = None
+        # Sink that writes items to a file, and the settings it was created
+        # with
+        self.__sink: Optional[log_sink.LogSink] = None
+        self.__sink_settings: Optional[dict] = None
+
+    def _getFilter(self) -> CategoryFilter:
         """
-        # If a category was provided, ignore all events not from it
-        if category is not None and not item.category.startswith(category):
-            return False
+        Returns the category filter for the current settings, compiling it if
+        the settings have changed
 
+        ### Returns:
+        * `CategoryFilter`: filter
+        """
         # Make sure we log things, even if the context isn't loaded
         # They will still (hopefully) be recallable later
         import common
         try:
-            context = common.getContext()
+            settings = common.getContext().settings
         except common.context_manager.MissingContextException:
-            verbosity = DEFAULT
-        else:
-            if verbosity is None:
-                # TODO: Potentially buggy if a `.` isn't the next char in the
-                # watched category
-                if any(item.category.startswith(c)
-                       for c in context.settings.get(
-                           "logger.watched_categories"
-                )):
-                    verbosity = context.settings.get(
-                        "logger.max_watched_verbosity")
-                else:
-                    verbosity = context.settings.get("logger.max_verbosity")
-
-        assert verbosity is not None
-        if item.verbosity <= verbosity:
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def _shouldDetailedPrint(item: LogItem) -> bool:
+            return self.__default_filter
+        source = (settings, settings.getVersion())
+        if self.__filter_source != source:
+            self.__filter = CategoryFilter(
+                settings.get("logger.watched_categories"),
+                settings.get("logger.max_verbosity"),
+                settings.get("logger.max_watched_verbosity"),
+                settings.get("logger.critical_verbosity"),
+                settings.get("logger.discard_verbosity"),
+            )
+            self.__filter_source = source
+            capacity = settings.get("logger.max_history")
+            if capacity != self._history.getCapacity():
+                self._history.setCapacity(capacity)
+            self.__updateSink(settings.get("logger.sink"))
+        return self.__filter
+
+    def __updateSink(self, sink_settings: dict) -> None:
         """
-        Returns whether the logger should do a detailed printout of the item.
-
-        Reserved for errors that the user should be notified of.
+        Start, stop or restart the log sink if its settings have changed
 
         ### Args:
-        * `item` (`LogItem`): item to check
+        * `sink_settings` (`dict`): the `logger.sink` settings
+        """
+        if sink_settings == self.__sink_settings:
+            return
+        self.__sink_settings = dict(sink_settings)
+        if self.__sink is not None:
+            self.__sink.close()
+            self.__sink = None
+        if not sink_settings["enabled"]:
+            return
+        if not log_sink.SINK_AVAILABLE:  # pragma: no cover
+            print("Log sink isn't supported in this Python environment")
+            return
+        self.__sink = log_sink.LogSink(
+            log_sink.LOG_FILE,
+            sink_settings["max_queue"],
+            sink_settings["max_file_size"] * 1024,
+            sink_settings["backups"],
+        )
+
+    def close(self) -> None:
+        """
+        Stop writing items to the log file, after writing any items that are
+        waiting. The sink is started again when the next item is logged, if
+        it is still enabled.
+        """
+        if self.__sink is not None:
+            self.__sink.close()
+            self.__sink = None
+        self.__sink_settings = None
+        self.__filter_source = None
 
-        ### Returns:
-        * `bool`: whether we should detailed print it
+    def sinkInfo(self):
         """
-        # Make sure we log things, even if the context isn't loaded
-        # They will still (hopefully) be recallable later
-        import common
-        try:
-            verbosity: Verbosity = common.getContext().settings.get(
-                "logger.critical_verbosity"
-            )
-        except common.context_manager.MissingContextException:
-            verbosity = ERROR
-        return item.verbosity <= verbosity
+        Print statistics about the log file that items are written to, as
+        configured by the `logger.sink` settings.
+        """
+        from common.util.misc import NoneNoPrintout
+        if self.__sink is None:
+            print("The log sink is disabled")
+        else:
+            print(f"Writing log to {self.__sink.getPath()}")
+            for name, value in self.__sink.getCounters().items():
+                print(f" * {name}: {value}")
+        return NoneNoPrintout
 
     @staticmethod
-    def _conditionalPrint(
-        item: LogItem,
-        category: Optional[str] = None,
-        verbosity: Optional[Verbosity] = None
-    ) -> bool:
+    def _conditionalPrint(item: LogItem, log_filter: CategoryFilter) -> bool:
         """If the logger should print this particular item, prints it. It does
-        a detailed print if required.
-
-        * By default (no category or verbosity specified), it checks whether
-          the item's categories are in the watched categories. If so, it will
-          print out if the verbosity is less than the given verbosity, or the
-          `logger.max_watched_verbosity` setting if that isn't provided.
-          Otherwise it will print out if the verbosity is less than the given
-          verbosity, or the `logger.max_verbosity` setting if that isn't
-          provided.
-        * If a category is specified, it will print if the item is in that
-          category and the verbosity is less than the given verbosity, or the
-          `logger.max_watched_verbosity` setting if that isn't provided.
+        a detailed print if the item is at or below the
+        `logger.critical_verbosity` setting.
 
         Args:
         * `item` (`LogItem`): item to check
-        * `category` (`str`, optional): category  to filter by. Defaults to
-          `None`.
-        * `verbosity` (`Verbosity`, optional): greatest verbosity to print.
-          Defaults to `None`.
+        * `log_filter` (`CategoryFilter`): filter for the current settings
 
         Returns:
         * `bool`: whether it was printed
         """
-        if Log._shouldDetailedPrint(item):
+        if item.verbosity > log_filter.getThreshold(item.category):
+            return False
+        if item.verbosity <= log_filter.critical:
             item.printDetails()
-            print()
-            return True
-        elif Log._shouldPrint(item, category, verbosity):
-            print(item)
-            print()
-            return True
         else:
-            return False
+            print(item)
+        print()
+        return True
 
     def __len__(self) -> int:
         return len(self._history)
 
     def length(self) -> int:
         """
-        Returns the length of the log
+        Returns the length of the log. Only the most recent entries are kept,
+        as configured by the `logger.max_history` setting.
 
         ### Returns:
         * `int`: log length
@@ -188,27 +197,32 @@ class Log:
         last
 
         ### Args:
-        * `category` (`str`, optional): category to match, defaults to all.
+        * `category` (`str`, optional): category to match, including its
+          sub-categories. Defaults to all.
         * `verbosity` (`Verbosity`, optional): verbosity level. Defaults to
           `DEFAULT`.
         * `number` (`int`, optional): number of values to recall, defaults to
           all.
         """
         from common.util.misc import NoneNoPrintout
-        # Figure out what to print
+        # Figure out what to print, starting from the most recent item, and
+        # only checking items in the category
         num_prints = 0
         num_skips = 0
         prints: list[LogItem] = []
         v = DEFAULT if verbosity is None else verbosity
-        for item in reversed(self._history):
+        for item in self._history.iterCategory(
+            '' if category is None else category
+        ):
             # Print if required
-            if self._shouldPrint(item, category, v):
+            if item.verbosity <= v:
                 num_prints += 1
-                prints.insert(0, item)
+                prints.append(item)
             else:
                 num_skips += 1
             if num_prints == number:
                 break
+        prints.reverse()
 
         # Then print it
         print("----------------------------------------")
@@ -238,10 +252,20 @@ class Log:
         This is a helper function for debugging.
 
         ### Args:
-        * `itemNumber` (`int`): entry number
+        * `itemNumber` (`int`): entry number. Negative numbers count back
+          from the newest entry, so `-1` is the newest entry.
         """
         from common.util.misc import NoneNoPrintout
-        self._history[itemNumber].printDetails()
+        try:
+            item = self._history[itemNumber]
+        except IndexError:
+            print(
+                f"Log item #{itemNumber} isn't available. The oldest "
+                f"available item is "
+                f"#{self._history.getTotal() - len(self._history)}."
+            )
+        else:
+            item.printDetails()
 
         return NoneNoPrintout
 
@@ -250,7 +274,8 @@ class Log:
         category: str,
         msg: str,
         verbosity: Verbosity = DEFAULT,
-        detailed_msg: str = ''
+        detailed_msg: str = '',
+        args: tuple = (),
     ) -> None:
         """
         Add a message to the log
@@ -264,22 +289,26 @@ class Log:
         * `msg` (`str`): message to log
         * `verbosity` (`Verbosity`, optional): verbosity to log under. Defaults
           to `DEFAULT`.
+        * `detailed_msg` (`str`, optional): details to show when the message is
+          inspected. Defaults to `''`.
+        * `args` (`tuple`, optional): arguments to format the message and
+          details with, using `str.format()`. Formatting is deferred until the
+          message is printed, so that messages that are never printed don't
+          need to be formatted. As such, arguments shouldn't be modified after
+          they are logged. Defaults to `()`, meaning the message and details
+          aren't formatted.
         """
-        import common
-        try:
-            discarded = common.getContext().settings.get(
-                "logger.discard_verbosity"
-            )
-        except common.context_manager.MissingContextException:
-            discarded = NOTE
-        if verbosity > discarded:
+        log_filter = self._getFilter()
+        if verbosity > log_filter.discard:
             return
         # TODO: Maybe get traceback
         item = LogItem(category, msg, detailed_msg,
-                       verbosity, len(self._history))
+                       verbosity, self._history.getTotal(), args)
         self._history.append(item)
+        if self.__sink is not None:
+            self.__sink.put(item)
         # Print if required
-        self._conditionalPrint(item)
+        self._conditionalPrint(item, log_filter)
 
 
 log = Log()
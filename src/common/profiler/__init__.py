@@ -14,7 +14,12 @@ __all__ = [
     'ProfilerContext',
     'profilerDecoration',
     'ProfilerManager',
+    'setProfiler',
 ]
 
-from .profiler_context import ProfilerContext, profilerDecoration
+from .profiler_context import (
+    ProfilerContext,
+    profilerDecoration,
+    setProfiler,
+)
 from .manager import ProfilerManager
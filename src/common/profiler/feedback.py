@@ -0,0 +1,125 @@
+"""
+common > profiler > feedback
+
+Contains FeedbackLatency, which records the time between an event from the
+device and the feedback (such as LED colors or text) sent to the device in
+response to it
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from .histogram import LatencyHistogram
+
+__all__ = [
+    'FEEDBACK_TIMEOUT',
+    'FeedbackLatency',
+]
+
+# Time in ns after an event, after which feedback is no longer expected for
+# it
+FEEDBACK_TIMEOUT = 1_000_000_000
+
+
+class FeedbackLatency:
+    """
+    Records the latency between events and the feedback sent in response to
+    them, for each type of control.
+
+    Each event is given a correlation ID, which is stamped on the control it
+    touches. Once the control sends a change to the device, the time since
+    the event is recorded for the type of the control. If no change is sent
+    before the timeout, the event is counted as having no feedback.
+
+    Counts and histograms only include events since they were last reset.
+    """
+
+    def __init__(self) -> None:
+        # Correlation ID of the latest event
+        self.__last_id = 0
+        # Correlation ID of the first event since the counts were reset
+        self.__first_id = 1
+        # Number of events that were given correlation IDs
+        self.__events = 0
+        # Number of events that didn't get feedback
+        self.__missed = 0
+        # Distribution of latencies for each type of control, since they were
+        # last reset
+        self.__histograms: dict[str, LatencyHistogram] = {}
+
+    def begin(self) -> int:
+        """
+        Start waiting for feedback for a new event
+
+        ### Returns:
+        * `int`: correlation ID for the event
+        """
+        self.__events += 1
+        self.__last_id += 1
+        return self.__last_id
+
+    def record(self, control_type: str, latency: int) -> None:
+        """
+        Record the latency between an event and its feedback
+
+        ### Args:
+        * `control_type` (`str`): name of the type of the control the event
+          touched
+        * `latency` (`int`): time from the event to the feedback, in ns
+        """
+        histogram = self.__histograms.get(control_type)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            self.__histograms[control_type] = histogram
+        histogram.record(latency)
+
+    def miss(self, correlation_id: int) -> None:
+        """
+        Record that an event didn't get any feedback
+
+        ### Args:
+        * `correlation_id` (`int`): correlation ID of the event. Events from
+          before the counts were reset are ignored.
+        """
+        if correlation_id >= self.__first_id:
+            self.__missed += 1
+
+    def getEvents(self) -> int:
+        """
+        Returns the number of events that were given correlation IDs
+
+        ### Returns:
+        * `int`: number of events
+        """
+        return self.__events
+
+    def getMissed(self) -> int:
+        """
+        Returns the number of events that didn't get feedback
+
+        ### Returns:
+        * `int`: number of events
+        """
+        return self.__missed
+
+    def getHistograms(self) -> dict[str, LatencyHistogram]:
+        """
+        Returns the latency histogram for each type of control
+
+        ### Returns:
+        * `dict[str, LatencyHistogram]`: histograms
+        """
+        return self.__histograms
+
+    def reset(self) -> None:
+        """
+        Reset the latency histograms and the counts of events, so that they
+        only include events after this
+        """
+        self.__first_id = self.__last_id + 1
+        self.__events = 0
+        self.__missed = 0
+        for histogram in self.__histograms.values():
+            histogram.reset()
@@ -0,0 +1,111 @@
+"""
+common > profiler > histogram
+
+Contains LatencyHistogram, which records the distribution of the times taken
+by a profile, so that percentiles can be calculated
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+__all__ = [
+    'LatencyHistogram',
+]
+
+# Number of buckets for each power of two. Each bucket is at most 25% wider
+# than its lower bound, which limits the error of percentiles.
+SUB_BUCKET_BITS = 2
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Largest time that can be recorded (about 18 minutes), in ns. Larger times
+# are recorded in the last bucket.
+MAX_BITS = 40
+NUM_BUCKETS = (MAX_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+
+def _getBucket(ns: int) -> int:
+    """
+    Returns the bucket for a time in ns
+    """
+    bits = ns.bit_length()
+    if bits <= SUB_BUCKET_BITS + 1:
+        # Small values are recorded exactly
+        return ns if ns > 0 else 0
+    if bits > MAX_BITS:
+        return NUM_BUCKETS - 1
+    # Keep the top bits of the value. Since the highest of these is always
+    # set, the buckets for each power of two follow on from the previous
+    # power.
+    shift = bits - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+
+def _getBounds(bucket: int) -> tuple[int, int]:
+    """
+    Returns the lower (inclusive) and upper (exclusive) bounds of a bucket,
+    in ns
+    """
+    if bucket < 2 * SUB_BUCKETS:
+        return bucket, bucket + 1
+    shift, sub = divmod(bucket, SUB_BUCKETS)
+    shift -= 1
+    lower = (SUB_BUCKETS + sub) << shift
+    return lower, lower + (1 << shift)
+
+
+class LatencyHistogram:
+    """
+    A histogram of the times taken by a profile, using logarithmically sized
+    buckets, so that it uses a fixed amount of memory regardless of the
+    number of times recorded, while percentiles have a bounded relative
+    error.
+    """
+
+    def __init__(self) -> None:
+        self.__buckets = [0] * NUM_BUCKETS
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def record(self, ns: int) -> None:
+        """
+        Record a time
+
+        ### Args:
+        * `ns` (`int`): time in ns
+        """
+        self.__buckets[_getBucket(ns)] += 1
+        self.__count += 1
+
+    def reset(self) -> None:
+        """
+        Remove all recorded times
+        """
+        self.__buckets = [0] * NUM_BUCKETS
+        self.__count = 0
+
+    def getPercentile(self, percentile: float) -> float:
+        """
+        Returns an estimate of the given percentile of the recorded times
+
+        ### Args:
+        * `percentile` (`float`): percentile, from 0-100
+
+        ### Returns:
+        * `float`: time in ms, or `0.0` if no times were recorded
+        """
+        if self.__count == 0:
+            return 0.0
+        # Number of times that must be at or below the percentile
+        target = max(1, self.__count * percentile / 100)
+        seen = 0
+        for bucket, count in enumerate(self.__buckets):
+            seen += count
+            if seen >= target:
+                lower, upper = _getBounds(bucket)
+                return (lower + upper) / 2 / 1_000_000
+        raise AssertionError("Unreachable")  # pragma: no cover
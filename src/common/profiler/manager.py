@@ -10,10 +10,16 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import time
 
 from common.util.console_helpers import NoneNoPrintout
+from .feedback import FEEDBACK_TIMEOUT, FeedbackLatency
+from .histogram import LatencyHistogram
+from .trace import TRACE_FILE, TraceBuffer
+
+if TYPE_CHECKING:
+    from control_surfaces import ControlSurface
 
 MAX_NAME = 48
 
@@ -35,6 +41,17 @@ class ProfileNode:
         """
         self.parent = parent
         self.name = name
+        if parent is None:
+            # Full name of the profile, including its parents
+            self.path = name
+            # Name of the top-level profile that contains this profile
+            self.root = name
+            # Number of the top-level profile, set by the profiler
+            self.root_id = 0
+        else:
+            self.path = f"{parent.path}.{name}"
+            self.root = parent.root
+            self.root_id = parent.root_id
         self._children: list[ProfileNode] = []
         self._opened = time.time_ns()
         self._time: Optional[int] = None
@@ -80,24 +97,54 @@ class ProfilerManager:
 
     It is called upon by profiler context managers in order to manage
     profiling.
+
+    To reduce the overhead of profiling, the profiler can sample top-level
+    profiles (such as ticks and events), so that only some of them are
+    profiled, along with all the profiles they contain. The totals and
+    numbers of samples are then scaled to estimate the values if every
+    profile was recorded. Maximum times aren't scaled, so they are the
+    greatest time of the sampled profiles.
     """
-    @staticmethod
-    def _getProfileName(n: ProfileNode) -> str:
-        if n.parent is None:
-            return n.name
-        else:
-            return ProfilerManager._getProfileName(n.parent) + "." + n.name
 
-    def __init__(self, print_traces: bool) -> None:
+    def __init__(
+        self,
+        print_traces: bool,
+        sample_rate: int = 1,
+        quota: float = 0.0,
+    ) -> None:
         """
         Create a ProfilerManager
 
         ### Args:
         * `print_traces` (`bool`): whether to print the trace of which profiles
           are entered and exited. This has a massive performance impact, but
-          can be helpful when debugging crashes in FL Studio's API.
+          can be helpful when debugging crashes in FL Studio's API. Sampling
+          is disabled when tracing.
+        * `sample_rate` (`int`, optional): only profile 1 in every
+          `sample_rate` top-level profiles of each name. Defaults to `1`
+          (profile everything).
+        * `quota` (`float`, optional): maximum time in ms to spend in sampled
+          top-level profiles each second, after which top-level profiles
+          aren't sampled until the next second. Defaults to `0.0` (no limit).
         """
         self._print = print_traces
+        # Tracing requires every profile to be recorded
+        self._sample_rate = 1 if print_traces else max(sample_rate, 1)
+        self._quota = 0 if print_traces else int(quota * 1_000_000)
+        self._sampling = self._sample_rate > 1 or self._quota > 0
+        # Depth within a top-level profile that isn't being sampled, or 0 if
+        # profiles are being recorded
+        self._skip_depth = 0
+        # Number of top-level profiles of each name that were opened, and that
+        # were sampled
+        self._seen: dict[str, int] = {}
+        self._sampled: dict[str, int] = {}
+        # Start of the current second for the sampling quota, and the time in
+        # ns spent in sampled profiles during it
+        self._window_start = 0
+        self._window_used = 0
+        # Top-level profile containing each profile
+        self._roots: dict[str, str] = {}
         # Current profiler node
         self._current: Optional[ProfileNode] = None
         # Current depth of the profiler
@@ -110,6 +157,18 @@ class ProfilerManager:
         self._number: dict[str, float] = {}
         # Max times from each profiler
         self._maxes: dict[str, float] = {}
+        # Distribution of times from each profiler, since the last time they
+        # were reset
+        self._histograms: dict[str, LatencyHistogram] = {}
+        # Number of top-level profiles of each name that were recorded, used
+        # to identify them in traces
+        self._root_ids: dict[str, int] = {}
+        # Spans recorded for exporting a trace, if recording
+        self._trace: Optional[TraceBuffer] = None
+        # Counters for events that aren't timed (eg cache hits)
+        self._counters: dict[str, int] = {}
+        # Latency between events and the feedback sent in response
+        self._feedback = FeedbackLatency()
 
     def __repr__(self) -> str:
         if not len(self._totals):
@@ -118,6 +177,45 @@ class ProfilerManager:
             total = sum(self._number.values())
             return f"Profiler ({total} profiles taken)"
 
+    def _shouldSample(self, name: str) -> bool:
+        """
+        Returns whether a top-level profile should be sampled, recording that
+        it was opened
+
+        ### Args:
+        * `name` (`str`): name of top-level profile
+
+        ### Returns:
+        * `bool`: whether to sample it
+        """
+        seen = self._seen.get(name, 0)
+        self._seen[name] = seen + 1
+        if seen % self._sample_rate:
+            return False
+        if self._quota:
+            now = time.time_ns()
+            if now - self._window_start >= 1_000_000_000:
+                self._window_start = now
+                self._window_used = 0
+            elif self._window_used >= self._quota:
+                return False
+        self._sampled[name] = self._sampled.get(name, 0) + 1
+        return True
+
+    def _getScale(self, name: str) -> float:
+        """
+        Returns the amount to scale the results of a profile by, to account
+        for sampling
+
+        ### Args:
+        * `name` (`str`): full name of profile
+
+        ### Returns:
+        * `float`: scale
+        """
+        root = self._roots[name]
+        return self._seen[root] / self._sampled[root]
+
     def openProfile(self, name: str):
         """
         Open a new profile
@@ -125,12 +223,25 @@ class ProfilerManager:
         ### Args:
         * `name` (`str`): name of profile to open
         """
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if (
+            self._sampling
+            and self._current is None
+            and not self._shouldSample(name)
+        ):
+            self._skip_depth = 1
+            return
         self._depth += 1
         if self._print:
             print("+"*self._depth + name)
         n = ProfileNode(self._current, name)
         if self._current is not None:
             self._current.addChild(n)
+        else:
+            n.root_id = self._root_ids.get(name, 0) + 1
+            self._root_ids[name] = n.root_id
         self._current = n
 
     def closeProfile(self):
@@ -140,6 +251,9 @@ class ProfilerManager:
         ### Raises:
         * `ValueError`: no profile to close
         """
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
         if self._current is None:
             raise ValueError("No profile to close")
         if self._print:
@@ -147,8 +261,11 @@ class ProfilerManager:
         self._depth -= 1
         self._current.close()
         parent = self._current.parent
-        name = self._getProfileName(self._current)
-        t = self._current.getTime() / 1_000_000
+        name = self._current.path
+        ns = self._current.getTime()
+        if parent is None and self._quota:
+            self._window_used += ns
+        t = ns / 1_000_000
         if len(name) > self._max_name:
             self._max_name = len(name)
         if name in self._totals:
@@ -160,8 +277,49 @@ class ProfilerManager:
             self._totals[name] = t
             self._number[name] = 1
             self._maxes[name] = t
+            self._roots[name] = self._current.root
+            self._histograms[name] = LatencyHistogram()
+        self._histograms[name].record(ns)
+        if self._trace is not None:
+            node = self._current
+            self._trace.record(
+                node.name,
+                name,
+                node.root,
+                node.root_id,
+                node._opened,
+                ns,
+            )
         self._current = parent
 
+    def incrementCounter(self, name: str, amount: int = 1) -> None:
+        """
+        Increment a counter, used to keep track of the number of times
+        something happened (for example, cache hits and misses).
+
+        ### Args:
+        * `name` (`str`): name of counter
+        * `amount` (`int`, optional): amount to increment by. Defaults to `1`.
+        """
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def getHitRate(self, name: str) -> float:
+        """
+        Returns the hit rate for a cache, given by the counters `{name}.hits`
+        and `{name}.misses`.
+
+        ### Args:
+        * `name` (`str`): name of the cache
+
+        ### Returns:
+        * `float`: proportion of lookups that were hits, from 0 - 1
+        """
+        hits = self._counters.get(f"{name}.hits", 0)
+        misses = self._counters.get(f"{name}.misses", 0)
+        if hits + misses == 0:
+            return 0.0
+        return hits / (hits + misses)
+
     def inspect(self):
         """
         Inspect details about the profiler
@@ -171,33 +329,266 @@ class ProfilerManager:
             f"| Samples | Ave (ms)   | Max (ms)"
         )
         print()
+        if self._sampling:
+            print(
+                f"Sampling 1 in {self._sample_rate} top-level profiles"
+                + (f", for up to {self._quota / 1_000_000} ms per second"
+                   if self._quota else "")
+                + ". Totals and samples are estimates."
+            )
         print(header)
         print('=' * len(header))
-        for (name, total), number, max in zip(
-            self._totals.items(), self._number.values(), self._maxes.values()
+        for (name, total), number, max_t in zip(
+            self.getTotals().items(),
+            self.getNumbers().values(),
+            self._maxes.values(),
         ):
             ave = total / number
             print(
-                f" {name.ljust(self._max_name)} | {total: 14.5f} | {number:7} "
-                f"| {ave: 10.5f} | {max: 10.5f}"
+                f" {name.ljust(self._max_name)} | {total: 14.5f} "
+                f"| {round(number):7} | {ave: 10.5f} | {max_t: 10.5f}"
+            )
+        print()
+        if len(self._counters):
+            # Caches, which have hit rates, are given by their hit counters
+            caches = [
+                name.removesuffix(".hits") for name in self._counters
+                if name.endswith(".hits")
+            ]
+            rows = [
+                (name, str(count)) for name, count in self._counters.items()
+            ]
+            rows += [
+                (f"{cache}.hit_rate", f"{self.getHitRate(cache):.1%}")
+                for cache in caches
+            ]
+            name_len = len(max((name for name, _ in rows), key=len))
+            header = f" {'Counter'.ljust(name_len)} | Count"
+            print(header)
+            print('=' * len(header))
+            for name, value in rows:
+                print(f" {name.ljust(name_len)} | {value}")
+            print()
+        return NoneNoPrintout
+
+    def startTrace(self, max_spans: int = 100_000) -> None:
+        """
+        Start recording a trace of the time spans covered by each profile, so
+        that it can be exported using `exportTrace()`. Any existing trace is
+        discarded.
+
+        ### Args:
+        * `max_spans` (`int`, optional): maximum number of spans to keep.
+          After this, the oldest spans are discarded. Defaults to `100_000`.
+        """
+        self._trace = TraceBuffer(max_spans, time.time_ns())
+
+    def stopTrace(self) -> None:
+        """
+        Stop recording a trace, discarding the recorded spans
+        """
+        self._trace = None
+
+    def exportTrace(self, path: str = TRACE_FILE):
+        """
+        Export the recorded trace to a file, in the Chrome Trace Event format,
+        which can be opened offline using Perfetto, speedscope or
+        `chrome://tracing`. Recording continues after exporting.
+
+        ### Args:
+        * `path` (`str`, optional): file to write to. Defaults to `trace.json`
+          in the script's directory.
+
+        ### Raises:
+        * `ValueError`: a trace isn't being recorded
+        """
+        if self._trace is None:
+            raise ValueError(
+                "No trace recorded. Start recording using `startTrace()`"
             )
+        self._trace.export(path)
+        print(
+            f"Exported {len(self._trace)} spans to {path} "
+            f"({self._trace.getDropped()} dropped)"
+        )
+        return NoneNoPrintout
+
+    def correlateEvent(self, control: 'ControlSurface', start: int) -> None:
+        """
+        Give an event a correlation ID, and stamp it on the control it
+        touched, so that the latency until the control sends feedback to the
+        device can be measured.
+
+        ### Args:
+        * `control` (`ControlSurface`): control that the event touched
+        * `start` (`int`): time that the event started being processed, in ns
+        """
+        if not control.hasFeedback():
+            return
+        previous = control.getCorrelation()
+        if previous is not None:
+            # The previous event for this control didn't get feedback
+            self._feedback.miss(previous[0])
+        control.setCorrelation((self._feedback.begin(), start))
+
+    def updateFeedback(
+        self,
+        control: 'ControlSurface',
+        correlation: tuple[int, int],
+        sent: bool,
+    ) -> bool:
+        """
+        Called each tick by controls that are waiting to send feedback for an
+        event, to record the latency once the feedback is sent, or give up
+        once it times out.
+
+        ### Args:
+        * `control` (`ControlSurface`): control waiting to send feedback
+        * `correlation` (`tuple[int, int]`): correlation ID of the event and
+          the time it started being processed, in ns
+        * `sent` (`bool`): whether the control sent feedback this tick
+
+        ### Returns:
+        * `bool`: whether the control is finished waiting for feedback
+        """
+        correlation_id, start = correlation
+        latency = time.time_ns() - start
+        if latency > FEEDBACK_TIMEOUT:
+            self._feedback.miss(correlation_id)
+            return True
+        if not sent:
+            return False
+        control_type = type(control).__name__
+        self._feedback.record(control_type, latency)
+        if self._trace is not None:
+            name = f"feedback-{control_type}"
+            self._trace.record(
+                name, name, "feedback", correlation_id, start, latency)
+        return True
+
+    def getPercentile(self, name: str, percentile: float) -> float:
+        """
+        Returns an estimate of a percentile of the times taken by a profile,
+        since the latency histograms were last reset.
+
+        Times are recorded in buckets, so the estimate is within about 12%
+        of the actual time.
+
+        ### Args:
+        * `name` (`str`): full name of profile
+        * `percentile` (`float`): percentile, from 0-100
+
+        ### Returns:
+        * `float`: time in ms
+        """
+        return self._histograms[name].getPercentile(percentile)
+
+    def resetLatency(self) -> None:
+        """
+        Reset the latency histograms and the counts of events waiting for
+        feedback, so that they only include times recorded after this
+        """
+        for histogram in self._histograms.values():
+            histogram.reset()
+        self._feedback.reset()
+
+    def inspectLatency(self, number: int = 10, reset: bool = True):
+        """
+        Print the percentiles of the profiles with the worst tail latency
+        (99th percentile), followed by the latency from events to the
+        feedback sent in response for each type of control, then reset the
+        latency histograms.
+
+        ### Args:
+        * `number` (`int`, optional): number of profiles to print. Defaults to
+          `10`.
+        * `reset` (`bool`, optional): whether to reset the histograms, so that
+          the next printout only includes times recorded after this one.
+          Defaults to `True`.
+        """
+        percentiles = [50, 90, 99, 99.9]
         print()
+        self._printPercentiles("Name", self._histograms, percentiles, number)
+        feedback = self._feedback.getHistograms()
+        if len(feedback):
+            print("Latency from events to feedback:")
+            self._printPercentiles("Control", feedback, percentiles, number)
+            print(
+                f"{self._feedback.getMissed()} of "
+                f"{self._feedback.getEvents()} events got no feedback"
+            )
+            print()
+        if reset:
+            self.resetLatency()
         return NoneNoPrintout
 
+    @staticmethod
+    def _printPercentiles(
+        title: str,
+        histograms: dict[str, LatencyHistogram],
+        percentiles: list[float],
+        number: int,
+    ) -> None:
+        """
+        Print a table of the percentiles of the histograms with the worst
+        99th percentile
+        """
+        rows = sorted(
+            (
+                (name, [h.getPercentile(p) for p in percentiles], len(h))
+                for name, h in histograms.items()
+                if len(h)
+            ),
+            key=lambda row: row[1][2],
+            reverse=True,
+        )[:number]
+        name_len = max([len(title)] + [len(name) for name, _, _ in rows])
+        header = (
+            f" {title.ljust(name_len)} | Samples | "
+            + " | ".join(f"{f'p{p} (ms)':>10}" for p in percentiles)
+        )
+        print(header)
+        print('=' * len(header))
+        for name, values, count in rows:
+            print(
+                f" {name.ljust(name_len)} | {count:7} | "
+                + " | ".join(f"{v: 10.5f}" for v in values)
+            )
+        print()
+
     def getTotals(self):
         """
-        Return a dictionary with the total times for each category
+        Return a dictionary with the total times for each category, scaled
+        to account for sampling
         """
-        return self._totals
+        if not self._sampling:
+            return self._totals
+        return {
+            name: total * self._getScale(name)
+            for name, total in self._totals.items()
+        }
 
     def getNumbers(self):
         """
-        Return a dictionary with the total times for each category
+        Return a dictionary with the number of samples for each category,
+        scaled to account for sampling
         """
-        return self._number
+        if not self._sampling:
+            return self._number
+        return {
+            name: number * self._getScale(name)
+            for name, number in self._number.items()
+        }
 
     def getMaxes(self):
         """
-        Return a dictionary with the total times for each category
+        Return a dictionary with the max times for each category, of the
+        profiles that were sampled
         """
         return self._maxes
+
+    def getCounters(self) -> dict[str, int]:
+        """
+        Return a dictionary with the value of each counter
+        """
+        return self._counters
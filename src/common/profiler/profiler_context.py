@@ -3,6 +3,14 @@ common > profiler > profiler_context
 
 Context manager definition for profiler
 
+Profiling instrumentation is resolved when it is created, rather than each
+time it is used. When profiling is disabled, `ProfilerContext` returns a
+shared no-op context, and methods decorated using `profilerDecoration` are
+the original function, so that instrumented code runs at full speed. When the
+profiler is enabled or disabled, these methods are swapped for their
+instrumented or original versions on the class that defines them. Other
+functions use a wrapper that checks whether profiling is enabled.
+
 Authors:
 * Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
 
@@ -10,10 +18,18 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
-import common
-from typing import TypeVar, Callable
+import weakref
+from functools import wraps, update_wrapper
+from typing import TypeVar, Callable, Optional, TYPE_CHECKING
 from typing_extensions import ParamSpec
 
+if TYPE_CHECKING:
+    from .manager import ProfilerManager
+
+# The profiler of the current context, or None if profiling is disabled. This
+# is stored here so that instrumentation doesn't need to look up the context.
+_profiler: Optional['ProfilerManager'] = None
+
 
 class ProfilerContext:
     """
@@ -27,29 +43,163 @@ class ProfilerContext:
     >>>     costlyOperation()
     >>> # Outside context
     "'Costly operation' (1000 ns)": [sub operations]
+
+    If profiling is disabled, a shared context that does nothing is returned
+    instead.
     """
-    def __init__(self, name: str) -> None:
+    _name: str
+    _profiler: 'ProfilerManager'
+
+    def __new__(cls, name: str) -> 'ProfilerContext':
+        # Everything is set up here rather than in __init__, so that creating
+        # the shared context when profiling is disabled is as fast as possible
+        profiler = _profiler
+        if profiler is None:
+            return _NULL_CONTEXT
+        self = super().__new__(cls)
         self._name = name
+        self._profiler = profiler
+        return self
+
+    def __enter__(self):
+        self._profiler.openProfile(self._name)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._profiler.closeProfile()
 
+
+class _NullProfilerContext(ProfilerContext):
+    """
+    A profiler context that does nothing, used when profiling is disabled
+    """
     def __enter__(self):
-        c = common.getContext()
-        if c.profiler is not None:
-            c.profiler.openProfile(self._name)
+        pass
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        c = common.getContext()
-        if c.profiler is not None:
-            c.profiler.closeProfile()
+        pass
+
+
+_NULL_CONTEXT = object.__new__(_NullProfilerContext)
 
 
 Params = ParamSpec("Params")
 RT = TypeVar("RT")
 
 
+def _instrument(func: Callable[Params, RT], name: str) -> Callable[Params, RT]:
+    """
+    Returns a version of the function that is profiled whenever profiling is
+    enabled
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        profiler.openProfile(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.closeProfile()
+    return wrapper
+
+
+class _ProfiledMethod:
+    """
+    A method decorated using `profilerDecoration`. When it is assigned to a
+    class, it replaces itself with the original or instrumented version of
+    the method, depending on whether profiling is enabled, and the method is
+    swapped on that class whenever profiling is enabled or disabled.
+
+    If it is wrapped by another decorator, it can't be assigned to a class,
+    so it is called through the instrumented version instead.
+    """
+
+    def __init__(self, func: Callable, name: str) -> None:
+        self.func = func
+        self.wrapper = _instrument(func, name)
+        self.owner: Optional['weakref.ref[type]'] = None
+        self.attr = ''
+        update_wrapper(self, func)
+
+    def __set_name__(self, owner: type, attr: str) -> None:
+        self.owner = weakref.ref(owner)
+        self.attr = attr
+        _methods.append(self)
+        self.install(_profiler is not None)
+
+    def install(self, enabled: bool) -> bool:
+        """
+        Set the original or instrumented version of the method on its class
+
+        ### Args:
+        * `enabled` (`bool`): whether profiling is enabled
+
+        ### Returns:
+        * `bool`: whether the class still exists
+        """
+        assert self.owner is not None
+        owner = self.owner()
+        if owner is None:
+            return False
+        setattr(owner, self.attr, self.wrapper if enabled else self.func)
+        return True
+
+    def __get__(self, obj, objtype=None):
+        return self.wrapper.__get__(obj, objtype)
+
+    def __call__(self, *args, **kwargs):
+        return self.wrapper(*args, **kwargs)
+
+
+# Methods decorated using profilerDecoration, which are swapped whenever
+# profiling is enabled or disabled
+_methods: list[_ProfiledMethod] = []
+
+
 def profilerDecoration(name: str):
+    """
+    Decorator to profile a function
+
+    If profiling is disabled, methods are left unchanged on their class. If
+    profiling is enabled or disabled later, the method is replaced on its
+    class, so methods that are bound as callbacks before profiling is enabled
+    aren't profiled. For this to work, this should be the outermost decorator
+    of the method. Other functions use a wrapper that checks whether
+    profiling is enabled each time they are called.
+
+    ### Args:
+    * `name` (`str`): name of the profile
+    """
     def decorator(func: Callable[Params, RT]) -> Callable[Params, RT]:
-        def wrapper(*args, **kwargs):
-            with ProfilerContext(name):
-                return func(*args, **kwargs)
-        return wrapper
+        path = func.__qualname__.split('.')
+        if len(path) == 1 or path[-2] == '<locals>':
+            # Not defined in a class
+            return _instrument(func, name)
+        return _ProfiledMethod(func, name)  # type: ignore
     return decorator
+
+
+def _rebuild(enabled: bool) -> None:
+    """
+    Swap each decorated method for its instrumented or original version
+    """
+    _methods[:] = [m for m in _methods if m.install(enabled)]
+
+
+def setProfiler(profiler: Optional['ProfilerManager']) -> None:
+    """
+    Set the profiler used by profiler contexts and decorated functions,
+    enabling or disabling their instrumentation as required
+
+    This is called by the context when its profiler is changed.
+
+    ### Args:
+    * `profiler` (`Optional[ProfilerManager]`): profiler, or `None` to
+      disable profiling
+    """
+    global _profiler
+    was_enabled = _profiler is not None
+    _profiler = profiler
+    if was_enabled != (profiler is not None):
+        _rebuild(profiler is not None)
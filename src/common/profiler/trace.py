@@ -0,0 +1,125 @@
+"""
+common > profiler > trace
+
+Contains TraceBuffer, which records the spans of time covered by each
+profile, so that they can be exported as a trace and viewed on a timeline
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from collections import deque
+from typing import Any
+
+__all__ = [
+    'TRACE_FILE',
+    'TraceBuffer',
+]
+
+TRACE_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-3]) + '/trace.json'
+
+
+class TraceBuffer:
+    """
+    A bounded buffer of the spans recorded by the profiler. Once it is full,
+    the oldest spans are discarded.
+
+    Spans are exported in the Chrome Trace Event format, which can be opened
+    offline using Perfetto (https://ui.perfetto.dev), speedscope
+    (https://www.speedscope.app) or `chrome://tracing`.
+    """
+
+    def __init__(self, max_spans: int, start: int) -> None:
+        """
+        Create a TraceBuffer
+
+        ### Args:
+        * `max_spans` (`int`): maximum number of spans to keep
+        * `start` (`int`): time that the trace started, in ns
+        """
+        self.__spans: deque[tuple[str, str, str, int, int, int]] \
+            = deque(maxlen=max(max_spans, 1))
+        self.__start = start
+        self.__dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.__spans)
+
+    def getDropped(self) -> int:
+        """
+        Returns the number of spans that were discarded because the buffer
+        was full
+
+        ### Returns:
+        * `int`: number of spans discarded
+        """
+        return self.__dropped
+
+    def record(
+        self,
+        name: str,
+        path: str,
+        root: str,
+        root_id: int,
+        start: int,
+        duration: int,
+    ) -> None:
+        """
+        Record a span
+
+        ### Args:
+        * `name` (`str`): name of the profile
+        * `path` (`str`): full name of the profile, including its parents
+        * `root` (`str`): name of the top-level profile containing it
+        * `root_id` (`int`): number of the top-level profile, so that spans
+          from the same tick or event can be identified
+        * `start` (`int`): time the span started, in ns
+        * `duration` (`int`): duration of the span, in ns
+        """
+        if len(self.__spans) == self.__spans.maxlen:
+            self.__dropped += 1
+        self.__spans.append((name, path, root, root_id, start, duration))
+
+    def getEvents(self) -> list[dict[str, Any]]:
+        """
+        Returns the spans as Chrome trace events, ordered by their start time
+
+        ### Returns:
+        * `list[dict[str, Any]]`: trace events
+        """
+        return [
+            {
+                "name": name,
+                "cat": root,
+                "ph": "X",
+                "ts": (start - self.__start) / 1000,
+                "dur": duration / 1000,
+                "pid": 1,
+                "tid": 1,
+                "args": {"path": path, "id": f"{root}#{root_id}"},
+            }
+            for name, path, root, root_id, start, duration
+            in sorted(self.__spans, key=lambda s: (s[4], -s[5]))
+        ]
+
+    def export(self, path: str = TRACE_FILE) -> None:
+        """
+        Write the trace to a file, in the Chrome Trace Event JSON format
+
+        ### Args:
+        * `path` (`str`, optional): file to write to. Defaults to `trace.json`
+          in the script's directory.
+        """
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    "traceEvents": self.getEvents(),
+                    "displayTimeUnit": "ms",
+                    "otherData": {"dropped_spans": self.__dropped},
+                },
+                f,
+            )
@@ -0,0 +1,168 @@
+"""
+common > profiler > traffic
+
+Contains TrafficReport, which summarizes the number of events matched and
+feedback messages sent by each control on a device, so that the busiest
+controls can be found
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from time import time
+from typing import Any, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from control_surfaces import ControlSurface
+
+__all__ = [
+    'TRAFFIC_FILE',
+    'TrafficReport',
+]
+
+TRAFFIC_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-3]) + '/traffic.json'
+
+# Characters used to shade the heatmap, from least to most traffic
+SHADES = " .:-=+*#%@"
+
+
+class TrafficRow:
+    """
+    The traffic of a single control
+    """
+
+    def __init__(self, control: 'ControlSurface', now: float) -> None:
+        self.control = control
+        self.name = type(control).__name__
+        self.coordinate = control.coordinate
+        self.matches, self.sent, since = control.getTraffic()
+        self.seconds = max(now - since, 1e-6)
+
+    @property
+    def total(self) -> int:
+        return self.matches + self.sent
+
+
+class TrafficReport:
+    """
+    A snapshot of the number of events matched and feedback messages sent by
+    each control, since their counts were last reset.
+    """
+
+    def __init__(self, controls: Sequence['ControlSurface']) -> None:
+        """
+        Create a TrafficReport
+
+        ### Args:
+        * `controls` (`Sequence[ControlSurface]`): controls to report on.
+          Duplicates are ignored.
+        """
+        now = time()
+        self.__rows = sorted(
+            (TrafficRow(c, now) for c in dict.fromkeys(controls)),
+            key=lambda row: row.total,
+            reverse=True,
+        )
+
+    def getTotal(self) -> int:
+        """
+        Returns the total number of events matched and messages sent by all
+        the controls
+
+        ### Returns:
+        * `int`: total traffic
+        """
+        return sum(row.total for row in self.__rows)
+
+    def getRows(self) -> list[dict[str, Any]]:
+        """
+        Returns the traffic of each control, from busiest to quietest
+
+        ### Returns:
+        * `list[dict[str, Any]]`: traffic of each control, containing its
+          type, coordinate, number of events matched (`in`), number of
+          messages sent (`out`), and the time in seconds the counts cover
+        """
+        return [
+            {
+                "type": row.name,
+                "coordinate": list(row.coordinate),
+                "in": row.matches,
+                "out": row.sent,
+                "seconds": round(row.seconds, 3),
+            }
+            for row in self.__rows
+        ]
+
+    def print(self, number: int = 10) -> None:
+        """
+        Print a table of the busiest controls, followed by a heatmap of the
+        traffic of each type of control, laid out by coordinate
+
+        ### Args:
+        * `number` (`int`, optional): number of controls to include in the
+          table. Defaults to `10`.
+        """
+        total = max(self.getTotal(), 1)
+        rows = [row for row in self.__rows if row.total][:number]
+        name_len = max([len("Control")] + [len(row.name) for row in rows])
+        header = (
+            f" {'Control'.ljust(name_len)} | Coord    |       In | "
+            f"     Out |   In/s |  Out/s | Share"
+        )
+        print()
+        print(header)
+        print('=' * len(header))
+        for row in rows:
+            coord = f"{row.coordinate[0]}, {row.coordinate[1]}"
+            print(
+                f" {row.name.ljust(name_len)} | {coord:8} | "
+                f"{row.matches:8} | {row.sent:8} | "
+                f"{row.matches / row.seconds:6.1f} | "
+                f"{row.sent / row.seconds:6.1f} | "
+                f"{row.total / total:5.1%}"
+            )
+        print()
+        self.printHeatmap()
+
+    def printHeatmap(self) -> None:
+        """
+        Print a heatmap of the traffic for each type of control that has
+        more than one control, where each cell is a control at that
+        coordinate, shaded by its traffic relative to the busiest control
+        """
+        by_type: dict[str, list[TrafficRow]] = {}
+        for row in self.__rows:
+            by_type.setdefault(row.name, []).append(row)
+        busiest = max([row.total for row in self.__rows] + [1])
+        for name, rows in sorted(by_type.items()):
+            if len(rows) < 2 or not any(row.total for row in rows):
+                continue
+            height = max(row.coordinate[0] for row in rows) + 1
+            width = max(row.coordinate[1] for row in rows) + 1
+            grid = [[' '] * width for _ in range(height)]
+            for row in rows:
+                shade = round(row.total / busiest * (len(SHADES) - 1))
+                if row.total and not shade:
+                    # Make sure controls with any traffic are visible
+                    shade = 1
+                grid[row.coordinate[0]][row.coordinate[1]] = SHADES[shade]
+            print(f"{name}:")
+            for cells in grid:
+                print(f" |{''.join(cells)}|")
+            print()
+
+    def export(self, path: str = TRAFFIC_FILE) -> None:
+        """
+        Write the traffic of each control to a file, as JSON
+
+        ### Args:
+        * `path` (`str`, optional): file to write to. Defaults to
+          `traffic.json` in the script's directory.
+        """
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"controls": self.getRows()}, f)
@@ -52,6 +52,10 @@ class Settings:
     any user modifications.
     """
 
+    # Number of times any setting has been changed. This is shared between
+    # instances, since their nested settings dictionaries can be shared.
+    __version = 0
+
     def __init__(self) -> None:
         """
         Initialize and load the script's settings
@@ -116,6 +120,17 @@ class Settings:
         else:
             Settings._recursiveSet(keys[1:], settings[keys[0]], value)
 
+    def getVersion(self) -> int:
+        """
+        Returns a number that changes whenever a setting is changed using
+        `set()`, so that values derived from the settings can be recalculated
+        when they change.
+
+        ### Returns:
+        * `int`: settings version
+        """
+        return Settings.__version
+
     def get(self, key: str) -> Any:
         """
         Get an entry in the settings
@@ -149,6 +164,7 @@ class Settings:
         ### Raises:
         * `KeyError`: Unable to find settings
         """
+        Settings.__version += 1
         try:
             return Settings._recursiveSet(
                 key.split('.'),
@@ -18,6 +18,7 @@ __all__ = [
     'ForwardState',
     'ErrorState',
     'WaitingForDevice',
+    'VerifyingFingerprint',
 ]
 
 from .script_state import (
@@ -28,4 +29,5 @@ from .dev_state import DeviceState
 from .main_state import MainState
 from .forward_state import ForwardState
 from .error_state import ErrorState
+from .fingerprint_verify import VerifyingFingerprint
 from .device_detect import WaitingForDevice
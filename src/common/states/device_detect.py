@@ -12,7 +12,7 @@ more details.
 """
 
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import device
 
 import common
@@ -21,8 +21,17 @@ from common.exceptions import DeviceRecognizeError
 from common import log, verbosity
 from fl_classes import isMidiMsgSysex, FlMidiMsg
 from common.util.events import eventToString
+from common.util.fingerprint import (
+    getFingerprint,
+    saveFingerprint,
+    clearFingerprint,
+)
 
 from . import IScriptState, ErrorState, DeviceState
+from .fingerprint_verify import VerifyingFingerprint
+
+if TYPE_CHECKING:
+    from devices import Device
 
 LOG_CAT = "bootstrap.device.type_detect"
 
@@ -54,27 +63,32 @@ class WaitingForDevice(IScriptState):
             "bootstrap.name_associations"
         )
 
-        device_name = device.getName()
+        # Index the associations by name, keeping the order of IDs for each
+        # name so that they are tried in the order given by the user
+        associations: dict[str, list[str]] = {}
         for name, id in name_associations:
-            if name == device_name:
-                try:
-                    dev = common.ExtensionManager.devices.getById(id)
-                    log(
-                        LOG_CAT,
-                        f"Recognized device via device name associations: "
-                        f"{dev.getId()}",
-                        verbosity.INFO
-                    )
-                    common.getContext().setState(self._to.create(dev))
-                except DeviceRecognizeError:
-                    log(
-                        "bootstrap.device.type_detect",
-                        f"The device mapping '{name}' -> '{id}' didn't match "
-                        f"any known devices",
-                        verbosity.CRITICAL,
-                        "This could be caused by incorrect spelling of the "
-                        "device's ID."
-                    )
+            associations.setdefault(name, []).append(id)
+
+        device_name = device.getName()
+        for id in associations.get(device_name, []):
+            try:
+                dev = common.ExtensionManager.devices.getById(id)
+                log(
+                    LOG_CAT,
+                    f"Recognized device via device name associations: "
+                    f"{dev.getId()}",
+                    verbosity.INFO
+                )
+                common.getContext().setState(self._to.create(dev))
+            except DeviceRecognizeError:
+                log(
+                    "bootstrap.device.type_detect",
+                    f"The device mapping '{device_name}' -> '{id}' didn't "
+                    f"match any known devices",
+                    verbosity.CRITICAL,
+                    "This could be caused by incorrect spelling of the "
+                    "device's ID."
+                )
         log(
             "bootstrap.device.type_detect",
             f"No name associations found for device named '{device_name}'",
@@ -82,6 +96,57 @@ class WaitingForDevice(IScriptState):
         )
         return
 
+    def fingerprint(self) -> None:
+        """
+        Uses the fingerprint of the device last recognized on this port to
+        skip device detection, if the device name hasn't changed since then.
+
+        The device enquiry is still sent in the background, so that the
+        fingerprint can be corrected if it is wrong.
+        """
+        if not common.getContext().settings.get(
+            "bootstrap.fingerprint_cache"
+        ):
+            return
+        port = device.getPortNumber()
+        id = getFingerprint(port, device.getName())
+        if id is None:
+            log(LOG_CAT, "No device fingerprint found", verbosity.INFO)
+            return
+        try:
+            dev = common.ExtensionManager.devices.getById(id)
+        except DeviceRecognizeError:
+            log(
+                LOG_CAT,
+                f"Device fingerprint '{id}' didn't match any known devices, "
+                f"removing it",
+                verbosity.WARNING,
+            )
+            clearFingerprint(port)
+            return
+        log(
+            LOG_CAT,
+            f"Recognized device via fingerprint: {dev.getId()}",
+            verbosity.INFO
+        )
+        common.getContext().setState(VerifyingFingerprint(dev, self._to))
+
+    def recognized(self, dev: 'Device') -> None:
+        """
+        Switch to the device state after recognizing the device, saving its
+        fingerprint so that detection can be skipped next time.
+
+        ### Args:
+        * `dev` (`Device`): device that was recognized
+        """
+        if common.getContext().settings.get("bootstrap.fingerprint_cache"):
+            saveFingerprint(
+                device.getPortNumber(),
+                device.getName(),
+                dev.getId(),
+            )
+        common.getContext().setState(self._to.create(dev))
+
     def detectFallback(self) -> None:
         """
         Fallback method for device detection, using device name
@@ -93,7 +158,7 @@ class WaitingForDevice(IScriptState):
             f"Recognized device via fallback: {dev.getId()}",
             verbosity.INFO
         )
-        common.getContext().setState(self._to.create(dev))
+        self.recognized(dev)
 
     def sendEnquiry(self) -> None:
         self._sent_enquiry = True
@@ -115,6 +180,8 @@ class WaitingForDevice(IScriptState):
         # If so, a StateChangeException will be raised so this function will
         # return early
         self.nameAssociations()
+        # Likewise, if we recognized this device last time, skip detection
+        self.fingerprint()
         log(
             LOG_CAT,
             f"Device is assigned: {bool(device.isAssigned())}",
@@ -159,7 +226,7 @@ class WaitingForDevice(IScriptState):
                     verbosity.INFO,
                     eventToString(event)
                 )
-                common.getContext().setState(self._to.create(dev))
+                self.recognized(dev)
             except DeviceRecognizeError as e:
                 log(
                     LOG_CAT,
@@ -23,7 +23,7 @@ from common.exceptions import (
     EventDispatchError,
     InvalidConfigError,
 )
-from common.util.events import eventToString
+from common.util.events import EventString
 from . import IScriptState
 
 
@@ -152,5 +152,6 @@ class ErrorState(IScriptState):
     def processEvent(self, event: FlMidiMsg) -> None:
         log(
             "bootstrap.device.type_detect",
-            f"Received event: {eventToString(event)}"
+            "Received event: {}",
+            args=(EventString(event),),
         )
@@ -0,0 +1,168 @@
+"""
+common > states > fingerprint_verify
+
+Contains the definition for the fingerprint verification state of the script,
+which runs the script using the device recognized from a device fingerprint,
+while checking that the device really is connected.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+import time
+from typing import TYPE_CHECKING, Optional
+import device
+
+import common
+from consts import UNIVERSAL_DEVICE_ENQUIRY
+from common.exceptions import DeviceRecognizeError
+from common import log, verbosity
+from common.util.events import eventToString
+from common.util.fingerprint import saveFingerprint
+from fl_classes import isMidiMsgSysex, FlMidiMsg
+
+from . import IScriptState, DeviceState
+
+if TYPE_CHECKING:
+    from devices import Device
+
+LOG_CAT = "bootstrap.device.fingerprint"
+
+
+def isEnquiryResponse(event: FlMidiMsg) -> bool:
+    """
+    Returns whether the given event is a universal device enquiry response
+
+    ### Args:
+    * `event` (`FlMidiMsg`): event to check
+
+    ### Returns:
+    * `bool`: whether it is an enquiry response
+    """
+    if not isMidiMsgSysex(event):
+        return False
+    sysex = event.sysex
+    return (
+        len(sysex) > 4
+        and sysex[0] == 0xF0
+        and sysex[1] == 0x7E
+        and sysex[3] == 0x06
+        and sysex[4] == 0x02
+    )
+
+
+class VerifyingFingerprint(IScriptState):
+    """
+    State for when a device was recognized using its fingerprint.
+
+    The script runs normally using the device from the fingerprint, but a
+    universal device enquiry is also sent in the background. If the response
+    shows that a different device is connected, the fingerprint is updated
+    and the script switches to the correct device.
+    """
+    def __init__(self, dev: 'Device', switch_to: type[DeviceState]) -> None:
+        """
+        Create the VerifyingFingerprint state
+
+        ### Args:
+        * `dev` (`Device`): device recognized from the fingerprint
+        * `switch_to` (`type[DeviceState]`): state to run the device with
+        """
+        self._device = dev
+        self._to = switch_to
+        self._state = switch_to.create(dev)
+        self._init_time: Optional[float] = None
+        self._sent_enquiry = False
+        self._verified = False
+
+    @property
+    def verified(self) -> bool:
+        """
+        Whether the verification of the fingerprint has finished
+        """
+        return self._verified
+
+    def initialize(self) -> None:
+        self._init_time = time.time()
+        # If enquiries are disabled, there's nothing we can verify against
+        if common.getContext().settings.get("bootstrap.skip_enquiry"):
+            self._verified = True
+        self._state.initialize()
+
+    def deinitialize(self) -> None:
+        self._state.deinitialize()
+
+    def sendEnquiry(self) -> None:
+        self._sent_enquiry = True
+        device.midiOutSysex(UNIVERSAL_DEVICE_ENQUIRY)
+        log(
+            LOG_CAT,
+            "Sent universal device enquiry to verify fingerprint",
+            verbosity.INFO,
+        )
+
+    def tick(self) -> None:
+        if not self._verified:
+            # Send the enquiry on the first tick, for the same reason as the
+            # WaitingForDevice state
+            if not self._sent_enquiry:
+                self.sendEnquiry()
+            else:
+                assert self._init_time is not None
+                if (
+                    time.time() - self._init_time
+                    > common.getContext().settings.get(
+                        "bootstrap.detection_timeout"
+                    )
+                ):
+                    # The device was presumably recognized using the fallback
+                    # method last time, so we can keep using it
+                    log(
+                        LOG_CAT,
+                        "No response to device enquiry, keeping device from "
+                        "fingerprint",
+                        verbosity.INFO,
+                    )
+                    self._verified = True
+        self._state.tick()
+
+    def processEvent(self, event: FlMidiMsg) -> None:
+        if self._verified or not isEnquiryResponse(event):
+            self._state.processEvent(event)
+            return
+        event.handled = True
+        self._verified = True
+        try:
+            dev = common.ExtensionManager.devices.get(event)
+        except DeviceRecognizeError:
+            log(
+                LOG_CAT,
+                "Couldn't recognize device enquiry response, keeping device "
+                "from fingerprint",
+                verbosity.INFO,
+                eventToString(event),
+            )
+            return
+        if dev.getId() == self._device.getId():
+            log(
+                LOG_CAT,
+                f"Verified device fingerprint: {dev.getId()}",
+                verbosity.INFO,
+            )
+            return
+        log(
+            LOG_CAT,
+            f"Device fingerprint was incorrect (expected "
+            f"{self._device.getId()}, got {dev.getId()}), switching devices",
+            verbosity.WARNING,
+            eventToString(event),
+        )
+        saveFingerprint(device.getPortNumber(), device.getName(), dev.getId())
+        self._state.deinitialize()
+        self._device.deinitialize()
+        # Plugins are bound to the controls of the old device
+        common.ExtensionManager.resetPlugins()
+        common.getContext().setState(self._to.create(dev))
@@ -21,7 +21,7 @@ from fl_classes import FlMidiMsg
 from fl_classes import isMidiMsgStandard, isMidiMsgSysex
 from common.util.events import (
     decodeForwardedEvent,
-    eventToString,
+    EventString,
     forwardEvent,
     isEventForwarded,
     isEventForwardedHereFrom
@@ -52,7 +52,8 @@ def outputForwarded(event: FlMidiMsg):
         )
     log(
         "device.forward.in",
-        "Output event to device: " + eventToString(event)
+        "Output event to device: {}",
+        args=(EventString(event),),
     )
 
 
@@ -93,6 +94,7 @@ class ForwardState(DeviceState):
             forwardEvent(event)
             log(
                 "device.forward.out",
-                "Dispatched event to main script: " + eventToString(event)
+                "Dispatched event to main script: {}",
+                args=(EventString(event),),
             )
         event.handled = True
@@ -12,13 +12,15 @@ more details.
 """
 
 from typing import TYPE_CHECKING
+from time import time_ns
 
 import common
 from common import ProfilerContext, profilerDecoration
 from common import log, verbosity
 from fl_classes import FlMidiMsg
 from common.plug_indexes import PluginIndex, WindowIndex
-from common.util.events import eventToString
+from common.util.events import EventString
+from common.extension_manager.prewarm import PluginPrewarmer
 from .dev_state import DeviceState
 
 if TYPE_CHECKING:
@@ -40,6 +42,7 @@ class MainState(DeviceState):
             )
         common.getContext().registerDevice(device)
         self._device = device
+        self._prewarmer = PluginPrewarmer(device)
 
     @classmethod
     def create(cls, device: 'Device') -> 'DeviceState':
@@ -105,18 +108,25 @@ class MainState(DeviceState):
         # Tick the device
         self._device.doTick()
 
+        # Use the remaining time to prepare plugins that are likely to be used
+        # soon
+        self._prewarmer.tick(changed)
+
     @profilerDecoration("main.processEvent")
     def processEvent(self, event: FlMidiMsg) -> None:
+        profiler = common.getContext().profiler
+        start = time_ns() if profiler is not None else 0
         with ProfilerContext("match-event"):
             mapping = self._device.matchEvent(event)
         if mapping is None:
             event.handled = True
             log(
                 "device.event.in",
-                f"Failed to recognize event: {eventToString(event)}",
+                "Failed to recognize event: {}",
                 verbosity.CRITICAL,
                 "This usually means that the device hasn't been configured "
-                "correctly. Please contact the device's maintainer."
+                "correctly. Please contact the device's maintainer.",
+                args=(EventString(event),),
             )
             # raise ValueError(
             #     f"Couldn't identify event: "
@@ -124,13 +134,24 @@ class MainState(DeviceState):
             # )
             return
 
+        control = mapping.getControl()
         log(
             "device.event.in",
-            f"Recognized event: {mapping.getControl()}",
+            "Recognized event: {}, ({}, {})",
             verbosity.EVENT,
-            detailed_msg=eventToString(event)
+            detailed_msg="{3}",
+            args=(
+                type(control),
+                control.coordinate,
+                control.value,
+                EventString(event),
+            ),
         )
 
+        # Measure the latency until feedback is sent for the control
+        if profiler is not None:
+            profiler.correlateEvent(control, start)
+
         # Get active standard plugin
         plug_idx = common.getContext().activity.getActive()
 
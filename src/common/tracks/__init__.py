@@ -7,6 +7,7 @@ __all__ = [
     'Channel',
     'MixerTrack',
     'PlaylistTrack',
+    'TrackPropertyCache',
 ]
 
 
@@ -14,3 +15,4 @@ from .abstract import AbstractTrack
 from .channel import Channel
 from .mixer_track import MixerTrack
 from .playlist_track import PlaylistTrack
+from .cache import TrackPropertyCache
@@ -0,0 +1,179 @@
+"""
+common > tracks > cache
+
+Contains the TrackPropertyCache, which caches the properties of tracks for the
+duration of a single tick, so that tracks queried by many controls only
+require one FL Studio API call per property.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import common
+from typing import Any, Callable, TypeVar
+
+__all__ = [
+    'TrackPropertyCache',
+    'cachedProperty',
+    'invalidateProperty',
+    'invalidateAll',
+]
+
+T = TypeVar('T')
+
+
+class TrackPropertyCache:
+    """
+    A cache of track properties, which is only active during a frame (a single
+    tick of the script).
+
+    Properties are identified by the function used to get them, as well as the
+    index of the track. During a frame, the first read of each property calls
+    its getter, and any later reads are served from memory. Outside of a
+    frame, reads always call the getter, since the state of FL Studio may have
+    changed since the last tick.
+
+    Writes to a property should always go through to FL Studio, then
+    invalidate the cached value so that it is read again next time it is
+    required.
+    """
+
+    def __init__(self) -> None:
+        self.__values: dict[tuple[Callable[[int], Any], int], Any] = {}
+        self.__active = False
+        # Hits and misses during the current frame
+        self.__hits = 0
+        self.__misses = 0
+        # Hits and misses across all frames
+        self.__total_hits = 0
+        self.__total_misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"TrackPropertyCache({self.__total_hits} hits, "
+            f"{self.__total_misses} misses, "
+            f"{self.getHitRate():.1%} hit rate)"
+        )
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the cache is active (ie we are currently within a frame)
+        """
+        return self.__active
+
+    def beginFrame(self) -> None:
+        """
+        Begin a frame, clearing any values cached during the previous frame
+        """
+        self.__values.clear()
+        self.__hits = 0
+        self.__misses = 0
+        self.__active = True
+
+    def endFrame(self) -> None:
+        """
+        End a frame, clearing the cached values and recording the number of
+        hits and misses in the profiler if it is enabled.
+        """
+        self.__values.clear()
+        self.__active = False
+        self.__total_hits += self.__hits
+        self.__total_misses += self.__misses
+        profiler = common.getContext().profiler
+        if profiler is not None:
+            profiler.incrementCounter("tracks.cache.hits", self.__hits)
+            profiler.incrementCounter("tracks.cache.misses", self.__misses)
+
+    def get(self, getter: Callable[[int], T], index: int) -> T:
+        """
+        Get the value of a property of a track, using the cached value if
+        there is one
+
+        ### Args:
+        * `getter` (`Callable[[int], T]`): function used to get the property,
+          given the index of the track
+        * `index` (`int`): index of the track
+
+        ### Returns:
+        * `T`: value of the property
+        """
+        if not self.__active:
+            return getter(index)
+        key = (getter, index)
+        value: T
+        try:
+            value = self.__values[key]
+        except KeyError:
+            self.__misses += 1
+            value = self.__values[key] = getter(index)
+            return value
+        self.__hits += 1
+        return value
+
+    def invalidate(self, getter: Callable[[int], Any], index: int) -> None:
+        """
+        Invalidate the cached value of a property of a track, so that it is
+        read from FL Studio next time it is required.
+
+        ### Args:
+        * `getter` (`Callable[[int], Any]`): function used to get the property
+        * `index` (`int`): index of the track
+        """
+        self.__values.pop((getter, index), None)
+
+    def clear(self) -> None:
+        """
+        Invalidate all cached values. This should be used after operations
+        that can affect the properties of other tracks (for example, soloing a
+        track).
+        """
+        self.__values.clear()
+
+    def getHitRate(self) -> float:
+        """
+        Returns the proportion of reads across all frames that were served
+        from the cache.
+
+        ### Returns:
+        * `float`: hit rate, from 0 - 1
+        """
+        total = self.__total_hits + self.__total_misses
+        if total == 0:
+            return 0.0
+        return self.__total_hits / total
+
+
+def cachedProperty(getter: Callable[[int], T], index: int) -> T:
+    """
+    Get the value of a property of a track using the context's track property
+    cache
+
+    ### Args:
+    * `getter` (`Callable[[int], T]`): function used to get the property
+    * `index` (`int`): index of the track
+
+    ### Returns:
+    * `T`: value of the property
+    """
+    return common.getContext().track_cache.get(getter, index)
+
+
+def invalidateProperty(getter: Callable[[int], Any], index: int) -> None:
+    """
+    Invalidate a property of a track in the context's track property cache
+
+    ### Args:
+    * `getter` (`Callable[[int], Any]`): function used to get the property
+    * `index` (`int`): index of the track
+    """
+    common.getContext().track_cache.invalidate(getter, index)
+
+
+def invalidateAll() -> None:
+    """
+    Invalidate all properties in the context's track property cache
+    """
+    common.getContext().track_cache.clear()
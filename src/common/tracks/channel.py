@@ -16,6 +16,7 @@ from typing import Optional, TypeVar, Callable, Union
 from typing_extensions import ParamSpec, Concatenate
 from common.types import Color
 from common.util.api_fixes import getGroupChannelIndex
+from .cache import cachedProperty, invalidateProperty, invalidateAll
 
 
 T = TypeVar('T')
@@ -86,6 +87,34 @@ def channelAction(
         return callback(group_index, *args, **kwargs)
 
 
+def _getColor(index: int) -> Color:
+    return Color.fromInteger(channelAction(channels.getChannelColor, 0, index))
+
+
+def _getName(index: int) -> str:
+    return channelAction(channels.getChannelName, '', index)
+
+
+def _isSelected(index: int) -> bool:
+    return channelAction(channels.isChannelSelected, False, index)
+
+
+def _isMuted(index: int) -> bool:
+    return channelAction(channels.isChannelMuted, False, index)
+
+
+def _isSolo(index: int) -> bool:
+    return channelAction(channels.isChannelSolo, False, index)
+
+
+def _getVolume(index: int) -> float:
+    return channelAction(channels.getChannelVolume, 0.0, index)
+
+
+def _getPan(index: int) -> float:
+    return channelAction(channels.getChannelPan, 0.0, index)
+
+
 class Channel(AbstractTrack):
     """
     Helper class for accessing properties of channels
@@ -133,11 +162,7 @@ class Channel(AbstractTrack):
         """
         Color of the channel
         """
-        return Color.fromInteger(channelAction(
-            channels.getChannelColor,
-            0,
-            self.__index
-        ))
+        return cachedProperty(_getColor, self.__index)
 
     @color.setter
     def color(self, new_color: Color) -> None:
@@ -147,14 +172,11 @@ class Channel(AbstractTrack):
             self.__index,
             new_color.integer,
         )
+        invalidateProperty(_getColor, self.__index)
 
     @property
     def name(self) -> str:
-        return channelAction(
-            channels.getChannelName,
-            '',
-            self.__index
-        )
+        return cachedProperty(_getName, self.__index)
 
     @name.setter
     def name(self, new_name: str) -> None:
@@ -164,14 +186,11 @@ class Channel(AbstractTrack):
             self.__index,
             new_name,
         )
+        invalidateProperty(_getName, self.__index)
 
     @property
     def selected(self) -> bool:
-        return channelAction(
-            channels.isChannelSelected,
-            False,
-            self.__index,
-        )
+        return cachedProperty(_isSelected, self.__index)
 
     @selected.setter
     def selected(self, new_value: bool) -> None:
@@ -181,6 +200,7 @@ class Channel(AbstractTrack):
                 None,
                 self.__index,
             )
+            invalidateAll()
 
     def selectedToggle(self) -> None:
         channelAction(
@@ -188,14 +208,11 @@ class Channel(AbstractTrack):
             None,
             self.__index,
         )
+        invalidateAll()
 
     @property
     def mute(self) -> bool:
-        return channelAction(
-            channels.isChannelMuted,
-            False,
-            self.__index,
-        )
+        return cachedProperty(_isMuted, self.__index)
 
     @mute.setter
     def mute(self, new_value: bool) -> None:
@@ -205,6 +222,7 @@ class Channel(AbstractTrack):
                 None,
                 self.__index,
             )
+            invalidateAll()
 
     def muteToggle(self) -> None:
         channelAction(
@@ -212,14 +230,11 @@ class Channel(AbstractTrack):
             None,
             self.__index,
         )
+        invalidateAll()
 
     @property
     def solo(self) -> bool:
-        return channelAction(
-            channels.isChannelSolo,
-            False,
-            self.__index,
-        )
+        return cachedProperty(_isSolo, self.__index)
 
     @solo.setter
     def solo(self, new_value: bool) -> None:
@@ -229,6 +244,7 @@ class Channel(AbstractTrack):
                 None,
                 self.__index,
             )
+            invalidateAll()
 
     def soloToggle(self) -> None:
         channelAction(
@@ -236,17 +252,14 @@ class Channel(AbstractTrack):
             None,
             self.__index,
         )
+        invalidateAll()
 
     @property
     def volume(self) -> float:
         """
         Volume of a channel, from 0 - 1, where 0.78125 is the default
         """
-        return channelAction(
-            channels.getChannelVolume,
-            0.0,
-            self.__index,
-        )
+        return cachedProperty(_getVolume, self.__index)
 
     @volume.setter
     def volume(self, new_volume: float) -> None:
@@ -256,17 +269,14 @@ class Channel(AbstractTrack):
             self.__index,
             new_volume,
         )
+        invalidateProperty(_getVolume, self.__index)
 
     @property
     def pan(self) -> float:
         """
         Panning of a channel, from -1 to 1 where 0 is centred
         """
-        return channelAction(
-            channels.getChannelPan,
-            0.0,
-            self.__index,
-        )
+        return cachedProperty(_getPan, self.__index)
 
     @pan.setter
     def pan(self, new_pan: float) -> None:
@@ -276,3 +286,4 @@ class Channel(AbstractTrack):
             self.__index,
             new_pan,
         )
+        invalidateProperty(_getPan, self.__index)
@@ -13,6 +13,11 @@ more details.
 import mixer
 from common.types import Color
 from .abstract import AbstractTrack
+from .cache import cachedProperty, invalidateProperty, invalidateAll
+
+
+def _getColor(index: int) -> Color:
+    return Color.fromInteger(mixer.getTrackColor(index))
 
 
 class MixerTrack(AbstractTrack):
@@ -44,103 +49,116 @@ class MixerTrack(AbstractTrack):
 
     @property
     def color(self) -> Color:
-        return Color.fromInteger(mixer.getTrackColor(self.__index))
+        return cachedProperty(_getColor, self.__index)
 
     @color.setter
     def color(self, new_color: Color) -> None:
         mixer.setTrackColor(self.__index, new_color.integer)
+        invalidateProperty(_getColor, self.__index)
 
     @property
     def name(self) -> str:
-        return mixer.getTrackName(self.__index)
+        return cachedProperty(mixer.getTrackName, self.__index)
 
     @name.setter
     def name(self, new_name: str) -> None:
         mixer.setTrackName(self.__index, new_name)
+        invalidateProperty(mixer.getTrackName, self.__index)
 
     @property
     def selected(self) -> bool:
-        return mixer.isTrackSelected(self.__index)
+        return cachedProperty(mixer.isTrackSelected, self.__index)
 
     @selected.setter
     def selected(self, new_value: bool) -> None:
         if self.selected != new_value:
             mixer.selectTrack(self.__index)
+            invalidateAll()
 
     def selectedToggle(self) -> None:
         mixer.selectTrack(self.__index)
+        invalidateAll()
 
     @property
     def mute(self) -> bool:
-        return mixer.isTrackMuted(self.__index)
+        return cachedProperty(mixer.isTrackMuted, self.__index)
 
     @mute.setter
     def mute(self, new_value: bool) -> None:
         if new_value != self.mute:
             mixer.muteTrack(self.__index)
+            invalidateAll()
 
     def muteToggle(self) -> None:
         mixer.muteTrack(self.__index)
+        invalidateAll()
 
     @property
     def solo(self) -> bool:
-        return mixer.isTrackSolo(self.__index)
+        return cachedProperty(mixer.isTrackSolo, self.__index)
 
     @solo.setter
     def solo(self, new_value: bool) -> None:
         if new_value != self.solo:
             mixer.soloTrack(self.__index)
+            invalidateAll()
 
     def soloToggle(self) -> None:
         mixer.soloTrack(self.__index)
+        invalidateAll()
 
     @property
     def volume(self) -> float:
         """
         Volume of a track, from 0 - 1, where 0.8 is 100% volume
         """
-        return mixer.getTrackVolume(self.__index)
+        return cachedProperty(mixer.getTrackVolume, self.__index)
 
     @volume.setter
     def volume(self, new_volume: float) -> None:
         mixer.setTrackVolume(self.__index, new_volume)
+        invalidateProperty(mixer.getTrackVolume, self.__index)
 
     @property
     def pan(self) -> float:
         """
         Panning of a track, from -1 to 1 where 0 is centred
         """
-        return mixer.getTrackPan(self.__index)
+        return cachedProperty(mixer.getTrackPan, self.__index)
 
     @pan.setter
     def pan(self, new_pan: float) -> None:
         mixer.setTrackPan(self.__index, new_pan)
+        invalidateProperty(mixer.getTrackPan, self.__index)
 
     @property
     def stereo_separation(self) -> float:
         """
         Stereo separation of a mixer track, ranges from -1 to 1
         """
-        return mixer.getTrackStereoSep(self.__index)
+        return cachedProperty(mixer.getTrackStereoSep, self.__index)
 
     @stereo_separation.setter
     def stereo_separation(self, new_sep: float) -> None:
         mixer.setTrackStereoSep(self.__index, new_sep)
+        invalidateProperty(mixer.getTrackStereoSep, self.__index)
 
     @property
     def armed(self) -> bool:
         """
         Whether the track is armed for recording
         """
-        return mixer.isTrackArmed(self.__index)
+        return cachedProperty(mixer.isTrackArmed, self.__index)
 
     @armed.setter
     def armed(self, new_value: bool) -> None:
         if new_value != self.armed:
             mixer.armTrack(self.__index)
+            invalidateAll()
 
     def armedToggle(self) -> None:
         """
         Toggle whether a track is armed for recording
         """
         mixer.armTrack(self.__index)
+        invalidateAll()
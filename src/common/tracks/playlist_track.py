@@ -12,6 +12,11 @@ more details.
 import playlist
 from common.types import Color
 from .abstract import AbstractTrack
+from .cache import cachedProperty, invalidateProperty, invalidateAll
+
+
+def _getColor(index: int) -> Color:
+    return Color.fromInteger(playlist.getTrackColor(index))
 
 
 class PlaylistTrack(AbstractTrack):
@@ -28,56 +33,65 @@ class PlaylistTrack(AbstractTrack):
 
     @property
     def color(self) -> Color:
-        return Color.fromInteger(playlist.getTrackColor(self.__index))
+        return cachedProperty(_getColor, self.__index)
 
     @color.setter
     def color(self, new_color: Color) -> None:
         playlist.setTrackColor(self.__index, new_color.integer)
+        invalidateProperty(_getColor, self.__index)
 
     @property
     def name(self) -> str:
-        return playlist.getTrackName(self.__index)
+        return cachedProperty(playlist.getTrackName, self.__index)
 
     @name.setter
     def name(self, new_name: str) -> None:
         playlist.setTrackName(self.__index, new_name)
+        invalidateProperty(playlist.getTrackName, self.__index)
 
     @name.setter
     def name(self, new_name: str) -> None:
         playlist.setTrackName(self.__index, new_name)
+        invalidateProperty(playlist.getTrackName, self.__index)
 
     @property
     def selected(self) -> bool:
-        return playlist.isTrackSelected(self.__index)
+        return cachedProperty(playlist.isTrackSelected, self.__index)
 
     @selected.setter
     def selected(self, new_value: bool) -> None:
         if self.selected != new_value:
             playlist.selectTrack(self.__index)
+            invalidateAll()
 
     def selectedToggle(self) -> None:
         playlist.selectTrack(self.__index)
+        invalidateAll()
 
     @property
     def mute(self) -> bool:
-        return playlist.isTrackMuted(self.__index)
+        return cachedProperty(playlist.isTrackMuted, self.__index)
 
     @mute.setter
     def mute(self, new_value: bool) -> None:
         if new_value != self.mute:
             playlist.muteTrack(self.__index)
+            invalidateAll()
 
     def muteToggle(self) -> None:
         playlist.muteTrack(self.__index)
+        invalidateAll()
 
     @property
     def solo(self) -> bool:
-        return playlist.isTrackSolo(self.__index)
+        return cachedProperty(playlist.isTrackSolo, self.__index)
 
     @solo.setter
     def solo(self, new_value: bool) -> None:
         if new_value != self.solo:
             playlist.soloTrack(self.__index)
+            invalidateAll()
 
     def soloToggle(self) -> None:
         playlist.soloTrack(self.__index)
+        invalidateAll()
@@ -3,6 +3,8 @@ common > types
 
 Contains type definitions used by the script, including:
 * `Color`, used to manage colors in the script
+* `ColorPalette` and `GrayscalePalette`, used to map colors onto devices with
+  a limited set of LED colors
 * `FlMidiMsg`, used as a shadow for the real `FlMidiMsg` type when testing and
   type hinting
 
@@ -15,10 +17,13 @@ more details.
 
 __all__ = [
     'Color',
+    'ColorPalette',
+    'GrayscalePalette',
     'BoolS',
     'TrueS',
     'FalseS',
 ]
 
 from .color import Color
+from .palette import ColorPalette, GrayscalePalette
 from .bool_s import BoolS, TrueS, FalseS
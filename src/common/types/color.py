@@ -12,13 +12,25 @@ more details.
 """
 # from __future__ import annotations
 
+from array import array
 from math import floor
-from typing import Optional
+from typing import Optional, Sequence, Union
+
+try:
+    # NumPy isn't available within FL Studio, but if it is installed, it is
+    # used to speed up batch operations on colors
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
 
 __all__ = [
     'Color'
 ]
 
+# Minimum number of colors in a batch operation for NumPy to be used. Below
+# this, the overhead of creating NumPy arrays outweighs the benefits.
+NUMPY_BATCH_THRESHOLD = 64
+
 # Constants for scaling color components when getting distances
 # Higher values contribute more to closeness
 HUE_SCALE = 10.0
@@ -126,6 +138,80 @@ def rgbToHsv(r: int, g: int, b: int) -> tuple[float, float, float]:
     return h, s, v
 
 
+def hsvDistance(
+    h1: float,
+    s1: float,
+    v1: float,
+    h2: float,
+    s2: float,
+    v2: float,
+) -> float:
+    """
+    Calculate the 'distance' between two colors given in the HSV color space.
+
+    This is the underlying calculation for `Color.distance()`, and is exposed
+    so that code working with precomputed HSV values (such as palettes) can
+    avoid creating intermediate color objects.
+
+    ### Args:
+    * `h1`, `s1`, `v1` (`float`): HSV components of the starting color
+    * `h2`, `s2`, `v2` (`float`): HSV components of the finishing color
+
+    ### Returns:
+    * `float`: distance
+    """
+    # Ensure hues are within 180 deg
+    if h1 - h2 > 180:
+        h1 -= 360
+    elif h2 - h1 > 180:
+        h2 -= 360
+
+    # Get scaled deltas
+    delta_h = abs(h2 - h1) / 360 * HUE_SCALE
+    delta_s = abs(s2 - s1) * SAT_SCALE
+    delta_v = abs(v2 - v1) * VAL_SCALE
+
+    # Don't bother doing square root since it's arbitrary anyway
+    return delta_h**2 + delta_s**2 + delta_v**2
+
+
+def hsvArraysToRgb(h: array, s: array, v: array) -> list[int]:
+    """
+    Convert arrays of HSV values to packed RGB integers using NumPy, giving
+    identical results to using `hsvToRgb()` on each color, after clamping
+    the values to their valid ranges.
+
+    ### Args:
+    * `h` (`array`): hues (degrees)
+    * `s` (`array`): saturations
+    * `v` (`array`): values
+
+    ### Returns:
+    * `list[int]`: colors, as 0xRRGGBB integers
+    """
+    hue = numpy.frombuffer(h, dtype=numpy.float64)
+    sat = numpy.clip(numpy.frombuffer(s, dtype=numpy.float64), 0.0, 1.0)
+    val = numpy.clip(numpy.frombuffer(v, dtype=numpy.float64), 0.0, 1.0)
+
+    # Wrap hues to 0-360
+    hue = numpy.where(hue < 0, hue - numpy.floor(hue // 360) * 360, hue)
+    hue = numpy.where(hue >= 360.0, hue - numpy.floor(hue // 360) * 360, hue)
+
+    c = (val * sat * 255).astype(numpy.int64)
+    h_ = hue / 60
+    x = (c * (1 - numpy.abs(h_ % 2 - 1))).astype(numpy.int64)
+    zero = numpy.zeros_like(c)
+    sector = numpy.minimum(numpy.floor(h_), 5).astype(numpy.int64)
+
+    r = numpy.choose(sector, [c, x, zero, zero, x, c])
+    g = numpy.choose(sector, [x, c, c, x, zero, zero])
+    b = numpy.choose(sector, [zero, zero, x, c, c, x])
+
+    m = (val * 255).astype(numpy.int64) - c
+    rgb: list[int] = (((r + m) << 16) + ((g + m) << 8) + (b + m)).tolist()
+    return rgb
+
+
 class Color:
     """
     Color class
@@ -133,10 +219,14 @@ class Color:
     Defines an RGB color, as well as useful functions for converting between
     various color types.
 
-    NOTE: colors are stored as separate red, green and blue components
-    internally. Calculations for HSV representations are made when required
+    Color objects are immutable, so they can safely be shared between
+    controls, rather than being copied.
+
+    NOTE: colors are stored as a packed 0xRRGGBB integer internally. The HSV
+    representation is calculated the first time it is required, and is then
+    remembered for the lifetime of the object.
     """
-    __slots__ = ['__red', '__green', '__blue', '__grayscale', '__enabled']
+    __slots__ = ['__integer', '__grayscale', '__enabled', '__hsv']
 
     def __init__(self) -> None:
         """
@@ -146,12 +236,14 @@ class Color:
         * `Color.fromInt()`
         * `Color.fromRgb()`
         * `Color.fromHsv()`
+
+        If you just need black, `Color.BLACK` can be shared rather than
+        creating a new object.
         """
-        self.__red = 0
-        self.__green = 0
-        self.__blue = 0
+        self.__integer = 0
         self.__grayscale = 0.0
         self.__enabled = False
+        self.__hsv: Optional[tuple[float, float, float]] = (0.0, 0.0, 0.0)
 
     def __repr__(self) -> str:
         return f"Color(0x{self.integer:06X} | "\
@@ -174,21 +266,57 @@ class Color:
     ###########################################################################
     # Creation functions
 
-    def __setGrayscaleEnabled(
-        self,
+    @staticmethod
+    def __create(
+        rgb: int,
         grayscale: Optional[float],
         enabled: Optional[bool],
-    ):
-        """Update the grayscale and enabled values of this color object"""
-        if grayscale is None:
-            self.__grayscale = self.value
-        else:
-            self.__grayscale = grayscale
+    ) -> 'Color':
+        """
+        Create a color object from a packed integer, using the default
+        grayscale and enabled values if required.
 
+        If an identical color has been interned, that object is returned
+        instead of creating a new one.
+        """
+        if grayscale is None:
+            # Same as the HSV value, but without calculating the hue and
+            # saturation
+            grayscale = max(rgb >> 16, (rgb >> 8) & 0xFF, rgb & 0xFF) / 255
         if enabled is None:
-            self.__enabled = self != Color()
-        else:
-            self.__enabled = enabled
+            enabled = rgb != 0
+
+        interned = _INTERNED.get((rgb, grayscale, enabled))
+        if interned is not None:
+            return interned
+
+        c = object.__new__(Color)
+        c.__integer = rgb
+        c.__grayscale = grayscale
+        c.__enabled = enabled
+        c.__hsv = None
+        return c
+
+    @staticmethod
+    def intern(color: 'Color') -> 'Color':
+        """
+        Register a color as the shared object for its value, so that creating
+        an identical color (including grayscale and enabled values) returns
+        the registered object rather than allocating a new one.
+
+        This is intended for colors that are used often, such as the color
+        constants and device palettes, and should not be used for arbitrary
+        colors, since interned colors are never freed.
+
+        ### Args:
+        * `color` (`Color`): color to intern
+
+        ### Returns:
+        * `Color`: the interned color object, which is the given color unless
+          an identical color was already interned
+        """
+        key = (color.__integer, color.__grayscale, color.__enabled)
+        return _INTERNED.setdefault(key, color)
 
     @staticmethod
     def fromInteger(
@@ -209,19 +337,7 @@ class Color:
         ### Returns:
         * `Color`: new color object
         """
-        c = Color()
-
-        r = (rgb & 0xFF0000) >> 16
-        g = (rgb & 0x00FF00) >> 8
-        b = (rgb & 0x0000FF)
-
-        c.__red = r
-        c.__green = g
-        c.__blue = b
-
-        c.__setGrayscaleEnabled(grayscale, enabled)
-
-        return c
+        return Color.__create(rgb & 0xFFFFFF, grayscale, enabled)
 
     @staticmethod
     def fromRgb(
@@ -246,19 +362,11 @@ class Color:
         ### Returns:
         * `Color`: color
         """
-        c = Color()
+        r = Color.__valCheckRgb(r)
+        g = Color.__valCheckRgb(g)
+        b = Color.__valCheckRgb(b)
 
-        r = c.__valCheckRgb(r)
-        g = c.__valCheckRgb(g)
-        b = c.__valCheckRgb(b)
-
-        c.__red = r
-        c.__green = g
-        c.__blue = b
-
-        c.__setGrayscaleEnabled(grayscale, enabled)
-
-        return c
+        return Color.__create((r << 16) + (g << 8) + b, grayscale, enabled)
 
     @staticmethod
     def fromHsv(
@@ -283,21 +391,13 @@ class Color:
         ### Returns:
         * `Color`: color
         """
-        c = Color()
-
-        hue = c.__valCheckHue(hue)
-        saturation = c.__valCheckSatVal(saturation)
-        value = c.__valCheckSatVal(value)
+        hue = Color.__valCheckHue(hue)
+        saturation = Color.__valCheckSatVal(saturation)
+        value = Color.__valCheckSatVal(value)
 
         r, g, b = hsvToRgb(hue, saturation, value)
 
-        c.__red = r
-        c.__green = g
-        c.__blue = b
-
-        c.__setGrayscaleEnabled(grayscale, enabled)
-
-        return c
+        return Color.__create((r << 16) + (g << 8) + b, grayscale, enabled)
 
     @staticmethod
     def fromGrayscale(
@@ -315,20 +415,15 @@ class Color:
         ### Returns:
         * `Color`: new color object
         """
-        c = Color()
-
-        value = int(grayscale*255)
-
-        c.__red = value
-        c.__green = value
-        c.__blue = value
-        c.__grayscale = grayscale
+        value = Color.__valCheckRgb(int(grayscale*255))
         if enabled is None:
-            c.__enabled = grayscale != 0
-        else:
-            c.__enabled = enabled
+            enabled = grayscale != 0
 
-        return c
+        return Color.__create(
+            (value << 16) + (value << 8) + value,
+            grayscale,
+            enabled,
+        )
 
     ###########################################################################
     # Helper functions
@@ -413,11 +508,7 @@ class Color:
         ### Returns:
         * `int`: color rgb
         """
-        return (
-            (self.red << 16)
-            + (self.green << 8)
-            + self.blue
-        )
+        return self.__integer
 
     @property
     def hsv(self) -> tuple[float, float, float]:
@@ -425,8 +516,8 @@ class Color:
         Represents the color as a tuple of floats representing hue,
         saturation, and value
 
-        NOTE: Under the hood, values are still stored as RGB - conversions are
-        made as required.
+        NOTE: Under the hood, values are still stored as RGB - the conversion
+        is made the first time this is accessed, and then reused.
 
         ### Returns:
         * `tuple[float, float, float]`:
@@ -434,7 +525,12 @@ class Color:
             * saturation (0-1.0)
             * value (0-1.0)
         """
-        return rgbToHsv(self.red, self.green, self.blue)
+        hsv = self.__hsv
+        if hsv is None:
+            rgb = self.__integer
+            hsv = rgbToHsv(rgb >> 16, (rgb >> 8) & 0xFF, rgb & 0xFF)
+            self.__hsv = hsv
+        return hsv
 
     @property
     def red(self) -> int:
@@ -444,7 +540,7 @@ class Color:
         ### Returns:
         * `int`: red
         """
-        return self.__red
+        return self.__integer >> 16
 
     @property
     def green(self) -> int:
@@ -454,7 +550,7 @@ class Color:
         ### Returns:
         * `int`: green
         """
-        return self.__green
+        return (self.__integer >> 8) & 0xFF
 
     @property
     def blue(self) -> int:
@@ -464,7 +560,7 @@ class Color:
         ### Returns:
         * `int`: blue
         """
-        return self.__blue
+        return self.__integer & 0xFF
 
     @property
     def hue(self) -> float:
@@ -472,7 +568,7 @@ class Color:
         Represents the hue of the color
 
         NOTE: Under the hood, values are still stored as RGB - conversions are
-        made as required.
+        made when first required.
 
         ### Returns:
         * `float`: hue (degrees: 0-360)
@@ -485,7 +581,7 @@ class Color:
         Represents the saturation of the color
 
         NOTE: Under the hood, values are still stored as RGB - conversions are
-        made as required.
+        made when first required.
 
         ### Returns:
         * `float`: saturation
@@ -498,7 +594,7 @@ class Color:
         Represents the value of the color
 
         NOTE: Under the hood, values are still stored as RGB - conversions are
-        made as required.
+        made when first required.
 
         ### Returns:
         * `float`: value
@@ -559,8 +655,8 @@ class Color:
         ### Returns:
         * `Color`: faded color
         """
-        hue_start = start.hue
-        hue_end = end.hue
+        hue_start, sat_start, val_start = start.hsv
+        hue_end, sat_end, val_end = end.hsv
         # Ensure hues are within 180 deg
         if hue_start - hue_end > 180:
             hue_start -= 360
@@ -572,12 +668,93 @@ class Color:
 
         return Color.fromHsv(
             hue_end * position + hue_start * rev_pos,
-            end.saturation * position + start.saturation * rev_pos,
-            end.value * position + start.value * rev_pos,
+            sat_end * position + sat_start * rev_pos,
+            val_end * position + val_start * rev_pos,
             start.grayscale * position + end.grayscale * rev_pos,
             enabled,
         )
 
+    @staticmethod
+    def fadeMany(
+        start: Union['Color', Sequence['Color']],
+        end: Union['Color', Sequence['Color']],
+        positions: Sequence[float],
+        enabled: Optional[bool] = None,
+    ) -> list['Color']:
+        """
+        Fade between many pairs of colors at once, giving the same results as
+        calling `Color.fade()` for each of them.
+
+        This is much faster than fading colors individually when many of the
+        fades are identical (for example when fading many controls between
+        the same two colors), since each unique fade is only calculated once.
+        If NumPy is available, large batches are also calculated using it.
+
+        ### Args:
+        * `start` (`Color | Sequence[Color]`): color(s) to fade from. If a
+          single color is given, it is used for all the fades.
+        * `end` (`Color | Sequence[Color]`): color(s) to fade to. If a single
+          color is given, it is used for all the fades.
+        * `positions` (`Sequence[float]`): positions of each fade (0-1.0).
+        * `enabled` (`bool`, optional): whether the colors should be
+          considered enabled. Defaults to `None` to determine based on each
+          result.
+
+        ### Raises:
+        * `ValueError`: the number of colors doesn't match the number of
+          positions
+
+        ### Returns:
+        * `list[Color]`: faded colors
+        """
+        n = len(positions)
+        starts = [start] * n if isinstance(start, Color) else start
+        ends = [end] * n if isinstance(end, Color) else end
+        if len(starts) != n or len(ends) != n:
+            raise ValueError(
+                "Number of colors must match the number of positions")
+
+        # Index of each unique fade, and the components of those fades
+        unique: dict[tuple[int, int, float], int] = {}
+        indexes = array('l')
+        hues = array('d')
+        sats = array('d')
+        vals = array('d')
+        grays = array('d')
+
+        for s, e, position in zip(starts, ends, positions):
+            key = (id(s), id(e), position)
+            index = unique.get(key)
+            if index is None:
+                index = len(hues)
+                unique[key] = index
+                hue_start, sat_start, val_start = s.hsv
+                hue_end, sat_end, val_end = e.hsv
+                # Ensure hues are within 180 deg
+                if hue_start - hue_end > 180:
+                    hue_start -= 360
+                elif hue_end - hue_start > 180:
+                    hue_end -= 360
+                rev_pos = 1 - position
+                hues.append(hue_end * position + hue_start * rev_pos)
+                sats.append(sat_end * position + sat_start * rev_pos)
+                vals.append(val_end * position + val_start * rev_pos)
+                grays.append(s.grayscale * position + e.grayscale * rev_pos)
+            indexes.append(index)
+
+        if numpy is not None and len(hues) >= NUMPY_BATCH_THRESHOLD:
+            faded = [
+                Color.__create(rgb, gray, enabled)
+                for rgb, gray in zip(hsvArraysToRgb(hues, sats, vals), grays)
+            ]
+        else:
+            faded = [
+                Color.fromHsv(h, s, v, gray, enabled)
+                for h, s, v, gray in zip(hues, sats, vals, grays)
+            ]
+
+        return [faded[i] for i in indexes]
+
     def fadeBlack(
         self: 'Color',
         position: float = 0.5,
@@ -598,8 +775,7 @@ class Color:
         ### Returns:
         * `Color`: Faded color
         """
-        black = Color()
-        return Color.fade(self, black, position, enabled)
+        return Color.fade(self, Color.BLACK, position, enabled)
 
     def fadeGray(
         self: 'Color',
@@ -621,11 +797,8 @@ class Color:
         ### Returns:
         * `Color`: Faded color
         """
-        gray = Color.fromHsv(
-            self.hue,
-            0.0,
-            self.value
-        )
+        hue, _, value = self.hsv
+        gray = Color.fromHsv(hue, 0.0, value)
         return Color.fade(self, gray, position, enabled)
 
     @staticmethod
@@ -641,22 +814,7 @@ class Color:
         ### Returns:
         * `float`: distance
         """
-        h1, s1, v1 = start.hsv
-        h2, s2, v2 = end.hsv
-
-        # Ensure hues are within 180 deg
-        if h1 - h2 > 180:
-            h1 -= 360
-        elif h2 - h1 > 180:
-            h2 -= 360
-
-        # Get scaled deltas
-        delta_h = abs(h2 - h1) / 360 * HUE_SCALE
-        delta_s = abs(s2 - s1) * SAT_SCALE
-        delta_v = abs(v2 - v1) * VAL_SCALE
-
-        # Don't bother doing square root since it's arbitrary anyway
-        return delta_h**2 + delta_s**2 + delta_v**2
+        return hsvDistance(*start.hsv, *end.hsv)
 
     def closest(self, others: list['Color']) -> 'Color':
         """
@@ -758,16 +916,11 @@ class Color:
             return NotImplemented
 
     def __eq__(self, other: object) -> bool:
+        # Grayscale and enabled values aren't considered in comparisons
         if isinstance(other, Color):
-            return all([
-                self.red == other.red,
-                self.green == other.green,
-                self.blue == other.blue,
-                # self.grayscale == other.grayscale,
-                # self.enabled == other.enabled,
-            ])
+            return self.__integer == other.__integer
         elif isinstance(other, int):
-            return self == Color.fromInteger(other)
+            return self.__integer == other & 0xFFFFFF
         else:
             return NotImplemented
 
@@ -792,19 +945,22 @@ class Color:
     FL_STOP: 'Color'
 
 
-Color.RED = Color.fromRgb(255, 0, 0)
-Color.GREEN = Color.fromRgb(0, 255, 0)
-Color.BLUE = Color.fromRgb(0, 0, 255)
-Color.WHITE = Color.fromGrayscale(1)
-Color.GRAY = Color.fromGrayscale(0.5, enabled=False)
-Color.BLACK = Color()
+# Colors which are shared when an identical color is created
+_INTERNED: dict[tuple[int, float, bool], Color] = {}
+
+Color.RED = Color.intern(Color.fromRgb(255, 0, 0))
+Color.GREEN = Color.intern(Color.fromRgb(0, 255, 0))
+Color.BLUE = Color.intern(Color.fromRgb(0, 0, 255))
+Color.WHITE = Color.intern(Color.fromGrayscale(1))
+Color.GRAY = Color.intern(Color.fromGrayscale(0.5, enabled=False))
+Color.BLACK = Color.intern(Color())
 
-Color.ENABLED = Color.fromGrayscale(0.7)
-Color.DISABLED = Color.fromGrayscale(0.3, enabled=False)
+Color.ENABLED = Color.intern(Color.fromGrayscale(0.7))
+Color.DISABLED = Color.intern(Color.fromGrayscale(0.3, enabled=False))
 
-Color.FL_SONG = Color.fromInteger(0x45F147, 0.6, True)
-Color.FL_SONG_ALT = Color.fromInteger(0x00A0F0, 1.0, True)
-Color.FL_PATTERN = Color.fromInteger(0xF78F41, 0.6, True)
-Color.FL_PATTERN_ALT = Color.fromInteger(0xA43A37, 1.0, True)
-Color.FL_RECORD = Color.fromInteger(0xAF0000, 1.0, True)
-Color.FL_STOP = Color.fromInteger(0xB9413E, 1.0, True)
+Color.FL_SONG = Color.intern(Color.fromInteger(0x45F147, 0.6, True))
+Color.FL_SONG_ALT = Color.intern(Color.fromInteger(0x00A0F0, 1.0, True))
+Color.FL_PATTERN = Color.intern(Color.fromInteger(0xF78F41, 0.6, True))
+Color.FL_PATTERN_ALT = Color.intern(Color.fromInteger(0xA43A37, 1.0, True))
+Color.FL_RECORD = Color.intern(Color.fromInteger(0xAF0000, 1.0, True))
+Color.FL_STOP = Color.intern(Color.fromInteger(0xB9413E, 1.0, True))
@@ -0,0 +1,216 @@
+"""
+common > types > palette
+
+Contains definitions for color palettes, which map colors onto the limited set
+of values supported by devices with a fixed LED palette.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from array import array
+from .color import Color, rgbToHsv, hsvDistance
+
+__all__ = [
+    'ColorPalette',
+    'GrayscalePalette',
+]
+
+# Number of bits of each RGB component to use when quantizing colors for the
+# lookup table
+DEFAULT_PALETTE_BITS = 5
+
+# Value stored in the lookup table for cells which haven't been calculated yet
+UNCALCULATED = -1
+
+
+class ColorPalette:
+    """
+    A palette of colors supported by a device, mapping each color to the value
+    that should be sent to the device to display it.
+
+    Finding the closest palette entry to a color is expensive, since it
+    requires calculating the distance to every color in the palette. To avoid
+    this, RGB colors are quantized into a lookup table, such that after the
+    first lookup in each cell, finding the closest value is a single table
+    read. Colors that are exactly in the palette skip the table entirely.
+
+    Palettes should be created once per set of colors (usually at module
+    level) so that the table is shared between all the controls using it.
+    """
+
+    def __init__(
+        self,
+        colors: dict[Color, int],
+        bits: int = DEFAULT_PALETTE_BITS,
+    ) -> None:
+        """
+        Create a color palette
+
+        ### Args:
+        * `colors` (`dict[Color, int]`): mapping of colors to the values used
+          to display them. When multiple colors are equally close to a target
+          color, the one that appears first is chosen.
+        * `bits` (`int`, optional): number of bits of each RGB component to
+          use when quantizing colors for the lookup table. Defaults to `5`.
+        """
+        if len(colors) == 0:
+            raise ValueError("Palette cannot be empty")
+        if not 1 <= bits <= 8:
+            raise ValueError("Palette bits must be between 1 and 8")
+        # Palette colors are interned, since they are likely to be used often
+        self.__colors = {Color.intern(c): v for c, v in colors.items()}
+        self.__options = [(c.hsv, v) for c, v in colors.items()]
+        self.__exact = {c.integer: v for c, v in colors.items()}
+        self.__bits = bits
+        self.__shift = 8 - bits
+        # Offset to use the center of each cell when calculating its value
+        self.__half = (1 << self.__shift) >> 1
+        self.__table = array('h', [UNCALCULATED]) * (1 << (3 * bits))
+
+    def __repr__(self) -> str:
+        return f"ColorPalette({len(self.__exact)} colors, {self.__bits} bits)"
+
+    def __len__(self) -> int:
+        return len(self.__exact)
+
+    @property
+    def colors(self) -> dict[Color, int]:
+        """
+        The mapping of colors to values that this palette was created from.
+        """
+        return self.__colors
+
+    @property
+    def bits(self) -> int:
+        """
+        The number of bits of each RGB component used to quantize colors for
+        the lookup table.
+        """
+        return self.__bits
+
+    def quantize(self, color: Color) -> Color:
+        """
+        Returns the color representing the lookup table cell that the given
+        color falls into. The closest palette value to this color is the value
+        used for every color in the cell.
+
+        ### Args:
+        * `color` (`Color`): color to quantize
+
+        ### Returns:
+        * `Color`: color at the center of the cell
+        """
+        shift = self.__shift
+        half = self.__half
+        return Color.fromRgb(
+            ((color.red >> shift) << shift) + half,
+            ((color.green >> shift) << shift) + half,
+            ((color.blue >> shift) << shift) + half,
+        )
+
+    def __calculate(self, r: int, g: int, b: int) -> int:
+        """
+        Find the value of the closest color in the palette to the given RGB
+        color, using the same rules as `Color.closest()`
+        """
+        h, s, v = rgbToHsv(r, g, b)
+        options = iter(self.__options)
+        (h2, s2, v2), closest = next(options)
+        closest_dist = hsvDistance(h, s, v, h2, s2, v2)
+        for (h2, s2, v2), value in options:
+            dist = hsvDistance(h, s, v, h2, s2, v2)
+            if dist < closest_dist:
+                closest = value
+                closest_dist = dist
+        return closest
+
+    def closestValue(self, color: Color) -> int:
+        """
+        Returns the value of the palette color that is closest to the given
+        color.
+
+        ### Args:
+        * `color` (`Color`): color to match
+
+        ### Returns:
+        * `int`: value of the closest palette color
+        """
+        exact = self.__exact.get(color.integer)
+        if exact is not None:
+            return exact
+        shift = self.__shift
+        bits = self.__bits
+        r = color.red >> shift
+        g = color.green >> shift
+        b = color.blue >> shift
+        index = (((r << bits) | g) << bits) | b
+        value = self.__table[index]
+        if value == UNCALCULATED:
+            half = self.__half
+            value = self.__calculate(
+                (r << shift) + half,
+                (g << shift) + half,
+                (b << shift) + half,
+            )
+            self.__table[index] = value
+        return value
+
+
+class GrayscalePalette:
+    """
+    A palette of grayscale brightnesses supported by a device, mapping each
+    brightness to the value that should be sent to the device to display it.
+
+    Grayscale values are quantized into 256 levels, with the closest value for
+    each level calculated when the palette is created, so that lookups are a
+    single table read.
+    """
+
+    def __init__(self, colors: dict[float, int]) -> None:
+        """
+        Create a grayscale palette
+
+        ### Args:
+        * `colors` (`dict[float, int]`): mapping of grayscale brightnesses
+          (0-1.0) to the values used to display them.
+        """
+        if len(colors) == 0:
+            raise ValueError("Palette cannot be empty")
+        self.__colors = dict(colors)
+        options = list(colors.keys())
+        self.__table = array('h', [
+            colors[Color.fromGrayscale(level / 255).closestGrayscale(options)]
+            for level in range(256)
+        ])
+
+    def __repr__(self) -> str:
+        return f"GrayscalePalette({len(self.__colors)} colors)"
+
+    @property
+    def colors(self) -> dict[float, int]:
+        """
+        The mapping of grayscale brightnesses to values that this palette was
+        created from.
+        """
+        return self.__colors
+
+    def closestValue(self, color: Color) -> int:
+        """
+        Returns the value of the palette brightness that is closest to the
+        grayscale value of the given color.
+
+        ### Args:
+        * `color` (`Color`): color to match
+
+        ### Returns:
+        * `int`: value of the closest palette brightness
+        """
+        level = int(color.grayscale * 255 + 0.5)
+        if level < 0:
+            level = 0
+        elif level > 255:
+            level = 255
+        return self.__table[level]
@@ -17,6 +17,7 @@ import channels
 import mixer
 import playlist
 
+from functools import wraps
 from common.profiler import profilerDecoration
 from typing import Optional, TYPE_CHECKING
 
@@ -90,6 +91,7 @@ def catchUnsafeOperation(func):
     ### Args:
     * `func` (`Callable`): function to decorate
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
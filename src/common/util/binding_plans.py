@@ -0,0 +1,202 @@
+"""
+common > util > binding_plans
+
+Contains functions for storing binding plans, which record the controls that
+a plugin class matched when it was bound to a device, so that the controls
+don't need to be searched for again the next time the script starts.
+
+The plans are stored in a text file in the script's directory, with one plan
+per line, in the form `key<TAB>plan`. The key contains the script version,
+the device ID and number and the plugin class, so that plans are never
+replayed for a different device or version of the script. Each plan is a
+list of steps separated by `;`, where each step contains the arguments used
+to match controls and the indexes of the controls that were matched, in the
+form `type,substitution,target,trim,exact,raise,one_type=index index ...`.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import TYPE_CHECKING, Optional
+from consts import getVersionString
+from common.logger import log, verbosity
+
+if TYPE_CHECKING:
+    from devices import Device
+    from devices.shadow_template import BindingPlan
+
+__all__ = [
+    'getPlanKey',
+    'getBindingPlan',
+    'saveBindingPlan',
+]
+
+LOG_CAT = "extensions.plugins.plans"
+
+BINDING_PLAN_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-3]) \
+    + '/binding_plans.txt'
+
+FILE_HEADER = (
+    "# Controls bound by each plugin in the Universal Controller Script.\n"
+    "# This file is generated automatically, and can be safely deleted.\n"
+)
+
+# Plans loaded from the file, along with the path they were loaded from
+_cache: Optional[tuple[str, dict[str, str]]] = None
+
+
+def getPlanKey(device: 'Device', plug: type) -> str:
+    """
+    Returns the key used to store the binding plan of a plugin class on a
+    device
+
+    ### Args:
+    * `device` (`Device`): device
+    * `plug` (`type`): plugin class
+
+    ### Returns:
+    * `str`: key
+    """
+    return (
+        f"{getVersionString()}|{device.getId()}|{device.getDeviceNumber()}|"
+        f"{plug.__module__}.{plug.__qualname__}"
+    )
+
+
+def _encodeStep(step: tuple[tuple, Optional[tuple[int, ...]]]) -> str:
+    (name, substitution, target, trim, exact, raise_, one_type), indexes = step
+    args = ','.join([
+        name,
+        str(int(substitution)),
+        '-' if target is None else str(target),
+        str(int(trim)),
+        str(int(exact)),
+        str(int(raise_)),
+        str(int(one_type)),
+    ])
+    if indexes is None:
+        return f"{args}=!"
+    return f"{args}={' '.join(str(i) for i in indexes)}"
+
+
+def _decodeStep(step: str) -> tuple[tuple, Optional[tuple[int, ...]]]:
+    """
+    Decode a step of a binding plan
+
+    ### Raises:
+    * `ValueError`: step is invalid
+    """
+    args, indexes = step.split('=')
+    name, substitution, target, trim, exact, raise_, one_type \
+        = args.split(',')
+    key = (
+        name,
+        substitution == '1',
+        None if target == '-' else int(target),
+        trim == '1',
+        exact == '1',
+        raise_ == '1',
+        one_type == '1',
+    )
+    if indexes == '!':
+        return key, None
+    return key, tuple(int(i) for i in indexes.split())
+
+
+def _load() -> dict[str, str]:
+    """
+    Load all the encoded plans from the binding plan file
+
+    ### Returns:
+    * `dict[str, str]`: mapping of keys to encoded plans
+    """
+    global _cache
+    if _cache is not None and _cache[0] == BINDING_PLAN_FILE:
+        return _cache[1]
+    plans: dict[str, str] = {}
+    try:
+        with open(BINDING_PLAN_FILE, encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        lines = []
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        parts = line.rstrip('\n').split('\t')
+        if len(parts) != 2:
+            continue
+        plans[parts[0]] = parts[1]
+    _cache = (BINDING_PLAN_FILE, plans)
+    return plans
+
+
+def _save(plans: dict[str, str]) -> None:
+    """
+    Save plans to the binding plan file, replacing its contents. Plans for
+    other versions of the script are discarded.
+
+    ### Args:
+    * `plans` (`dict[str, str]`): mapping of keys to encoded plans
+    """
+    version = f"{getVersionString()}|"
+    try:
+        with open(BINDING_PLAN_FILE, 'w', encoding='utf-8') as f:
+            f.write(FILE_HEADER)
+            for key, plan in sorted(plans.items()):
+                if key.startswith(version):
+                    f.write(f"{key}\t{plan}\n")
+    except OSError as e:
+        log(
+            LOG_CAT,
+            f"Failed to save binding plans: {e}",
+            verbosity.WARNING,
+        )
+
+
+def getBindingPlan(key: str) -> Optional['BindingPlan']:
+    """
+    Returns the binding plan saved with the given key
+
+    ### Args:
+    * `key` (`str`): key, from `getPlanKey()`
+
+    ### Returns:
+    * `Optional[BindingPlan]`: binding plan, or `None` if there is no valid
+      plan saved with the key
+    """
+    encoded = _load().get(key)
+    if encoded is None:
+        return None
+    if encoded == '':
+        return []
+    try:
+        return [_decodeStep(step) for step in encoded.split(';')]
+    except ValueError:
+        log(
+            LOG_CAT,
+            f"Ignoring invalid binding plan for {key}",
+            verbosity.WARNING,
+        )
+        return None
+
+
+def saveBindingPlan(key: str, plan: 'BindingPlan') -> None:
+    """
+    Save a binding plan with the given key, replacing any existing plan with
+    that key
+
+    ### Args:
+    * `key` (`str`): key, from `getPlanKey()`
+    * `plan` (`BindingPlan`): binding plan
+    """
+    if '\t' in key or '\n' in key:
+        return
+    encoded = ';'.join(_encodeStep(step) for step in plan)
+    plans = _load()
+    if plans.get(key) == encoded:
+        return
+    plans[key] = encoded
+    _save(plans)
@@ -5,7 +5,7 @@ Contains `catchExceptionDecorator` which can be used
 """
 from typing import Callable, Optional, TypeVar
 from typing_extensions import ParamSpec
-# from functools import wraps
+from functools import wraps
 
 
 P = ParamSpec("P")
@@ -49,7 +49,7 @@ def catchExceptionDecorator(
     ```
     """
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        # @wraps(func)
+        @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
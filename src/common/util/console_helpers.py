@@ -14,7 +14,10 @@ more details.
 
 __all__ = [
     'help',
-    'credits'
+    'credits',
+    'latency',
+    'traffic',
+    'exportTraffic',
 ]
 
 import consts
@@ -74,6 +77,12 @@ help = ConsoleCommand(
     f" * log(): log a message\n"
     f"    * log.recall([opt] category): recall log entries from a category\n"
     f"    * log.inspect(entry_number): print info about a log entry\n"
+    f"    * log.sinkInfo(): print statistics about the log file\n"
+    f" * latency([opt] number): print the profiles with the worst tail\n"
+    f"   latency, then reset the latency windows\n"
+    f" * traffic([opt] number, [opt] reset): print the number of events\n"
+    f"   and feedback messages for the busiest controls\n"
+    f" * exportTraffic(): save the traffic of each control to traffic.json\n"
     f" * credits(): print credits for the script\n"
     f" * reset(): reset the script and reload modular components\n"
     f" * pluginParamCheck(): launch the plugin parameter checker interface\n"
@@ -93,3 +102,71 @@ credits = ConsoleCommand(
     f"This project is free and open source, under the GNU GPL v3 License.\n"
     f"A copy of this is available in the file 'LICENSE'.\n"
 )
+
+
+def latency(number: int = 10) -> _NoneNoPrintout:
+    """
+    Print the latency percentiles of the profiles with the worst tail latency,
+    then reset the latency windows, so that the next printout only includes
+    times recorded after this one. Requires profiling to be enabled.
+
+    ### Args:
+    * `number` (`int`, optional): number of profiles to print. Defaults to
+      `10`.
+    """
+    import common
+    profiler = common.getContext().profiler
+    if profiler is None:
+        print("Profiling is disabled. Enable it using `debug.profiling`.")
+    else:
+        profiler.inspectLatency(number)
+    return NoneNoPrintout
+
+
+def traffic(number: int = 10, reset: bool = False) -> _NoneNoPrintout:
+    """
+    Print the number of events matched and feedback messages sent by the
+    busiest controls on the device, followed by a heatmap of the traffic of
+    each type of control.
+
+    ### Args:
+    * `number` (`int`, optional): number of controls to print. Defaults to
+      `10`.
+    * `reset` (`bool`, optional): whether to reset the counts afterwards, so
+      that the next printout only includes traffic after this one. Defaults
+      to `False`.
+    """
+    import common
+    from common.profiler.traffic import TrafficReport
+    try:
+        controls = common.getContext().getDevice().getControls()
+    except ValueError:
+        print("Device not recognized")
+        return NoneNoPrintout
+    TrafficReport(controls).print(number)
+    if reset:
+        for control in controls:
+            control.resetTraffic()
+    return NoneNoPrintout
+
+
+def exportTraffic(path: str = '') -> _NoneNoPrintout:
+    """
+    Save the number of events matched and feedback messages sent by each
+    control on the device to a JSON file.
+
+    ### Args:
+    * `path` (`str`, optional): file to write to. Defaults to `traffic.json`
+      in the script's directory.
+    """
+    import common
+    from common.profiler.traffic import TRAFFIC_FILE, TrafficReport
+    try:
+        controls = common.getContext().getDevice().getControls()
+    except ValueError:
+        print("Device not recognized")
+        return NoneNoPrintout
+    path = path or TRAFFIC_FILE
+    TrafficReport(controls).export(path)
+    print(f"Exported traffic to {path}")
+    return NoneNoPrintout
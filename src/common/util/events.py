@@ -261,7 +261,22 @@ def forwardEvent(event: FlMidiMsg, device_num: int = -1):
             raise EventEncodeError(
                 "No target device specified from main script"
             )
-    output = encodeForwardedEvent(event, device_num)
+    forwardEncodedEvent(encodeForwardedEvent(event, device_num), device_num)
+
+
+def forwardEncodedEvent(output: bytes, device_num: int):
+    """
+    Send an event that has already been encoded using `encodeForwardedEvent()`
+    to all available devices.
+
+    This can be used to avoid encoding the same event data repeatedly when
+    events are sent frequently.
+
+    ### Args:
+    * `output` (`bytes`): encoded event data
+    * `device_num` (`int`): device number that the event was encoded for, used
+      when reporting errors
+    """
     # Dispatch to all available devices
     if device.dispatchReceiverCount() == 0:
         raise EventDispatchError(
@@ -324,3 +339,30 @@ def eventToString(event: FlMidiMsg) -> str:
         num = getEventDeviceNum(event)
         decoded = eventToString(decodeForwardedEvent(event))
         return f"{dev}@{num} => {decoded})"
+
+
+class EventString:
+    """
+    Stores the values of an event, which are only converted to a string
+    (using `eventToString()`) when it is formatted. This allows events to be
+    passed as arguments to the logger, so that they are only formatted if the
+    log entry is printed.
+
+    The values are copied when the `EventString` is created, since FL Studio
+    may reuse or modify the event after it is processed.
+    """
+
+    __slots__ = ('__values',)
+
+    def __init__(self, event: FlMidiMsg) -> None:
+        self.__values: 'tuple[int, int, int] | bytes'
+        if isMidiMsgStandard(event):
+            self.__values = (event.status, event.data1, event.data2)
+        else:
+            assert isMidiMsgSysex(event)
+            self.__values = bytes(event.sysex)
+
+    def __str__(self) -> str:
+        if isinstance(self.__values, bytes):
+            return eventToString(FlMidiMsg(self.__values))
+        return eventToString(FlMidiMsg(*self.__values))
@@ -0,0 +1,139 @@
+"""
+common > util > fingerprint
+
+Contains functions for storing device fingerprints, which record the device
+that was last recognized on each MIDI port, so that the script can skip
+device detection when it is loaded again.
+
+The fingerprints are stored in a small text file in the script's directory,
+with one fingerprint per line, in the form `port<TAB>name<TAB>device ID`.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import Optional
+from common.logger import log, verbosity
+
+__all__ = [
+    'getFingerprint',
+    'saveFingerprint',
+    'clearFingerprint',
+]
+
+LOG_CAT = "bootstrap.device.fingerprint"
+
+FINGERPRINT_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-3]) \
+    + '/device_fingerprints.txt'
+
+FILE_HEADER = (
+    "# Devices last recognized by the Universal Controller Script on each "
+    "port.\n"
+    "# This file is generated automatically, and can be safely deleted.\n"
+)
+
+
+def _load() -> dict[int, tuple[str, str]]:
+    """
+    Load all the fingerprints from the fingerprint file
+
+    ### Returns:
+    * `dict[int, tuple[str, str]]`: mapping of port numbers to the device
+      name and device ID last recognized on that port
+    """
+    fingerprints: dict[int, tuple[str, str]] = {}
+    try:
+        with open(FINGERPRINT_FILE, encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return fingerprints
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        parts = line.rstrip('\n').split('\t')
+        if len(parts) != 3:
+            continue
+        try:
+            port = int(parts[0])
+        except ValueError:
+            continue
+        fingerprints[port] = (parts[1], parts[2])
+    return fingerprints
+
+
+def _save(fingerprints: dict[int, tuple[str, str]]) -> None:
+    """
+    Save fingerprints to the fingerprint file, replacing its contents
+
+    ### Args:
+    * `fingerprints` (`dict[int, tuple[str, str]]`): fingerprints to save
+    """
+    try:
+        with open(FINGERPRINT_FILE, 'w', encoding='utf-8') as f:
+            f.write(FILE_HEADER)
+            for port, (name, id) in sorted(fingerprints.items()):
+                f.write(f"{port}\t{name}\t{id}\n")
+    except OSError as e:
+        log(
+            LOG_CAT,
+            f"Failed to save device fingerprints: {e}",
+            verbosity.WARNING,
+        )
+
+
+def getFingerprint(port: int, name: str) -> Optional[str]:
+    """
+    Returns the ID of the device last recognized on the given port, if the
+    name of the device on that port hasn't changed since then.
+
+    ### Args:
+    * `port` (`int`): port number of the device
+    * `name` (`str`): name of the device, as given by `device.getName()`
+
+    ### Returns:
+    * `Optional[str]`: device ID, or `None` if there is no matching
+      fingerprint
+    """
+    fingerprint = _load().get(port)
+    if fingerprint is None:
+        return None
+    saved_name, id = fingerprint
+    if saved_name != name:
+        return None
+    return id
+
+
+def saveFingerprint(port: int, name: str, id: str) -> None:
+    """
+    Save a fingerprint for the device recognized on the given port, replacing
+    any existing fingerprint for that port.
+
+    ### Args:
+    * `port` (`int`): port number of the device
+    * `name` (`str`): name of the device, as given by `device.getName()`
+    * `id` (`str`): ID of the recognized device
+    """
+    # Names can't contain the characters used to separate the fields
+    if '\t' in name or '\n' in name:
+        return
+    fingerprints = _load()
+    if fingerprints.get(port) == (name, id):
+        return
+    fingerprints[port] = (name, id)
+    _save(fingerprints)
+
+
+def clearFingerprint(port: int) -> None:
+    """
+    Remove the fingerprint for the given port, if there is one
+
+    ### Args:
+    * `port` (`int`): port number of the device
+    """
+    fingerprints = _load()
+    if port in fingerprints:
+        del fingerprints[port]
+        _save(fingerprints)
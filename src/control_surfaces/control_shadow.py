@@ -82,7 +82,7 @@ class IControlShadow:
         Represents the color that will be applied to the control after the
         event has been processed.
         """
-        return Color()
+        return Color.BLACK
 
     @color.setter
     def color(self, newColor: Color) -> None:
@@ -122,7 +122,7 @@ class IControlShadow:
         ```py
         # Bind to a play button, set its color to black, and label it "control"
         shadow.bindControl(PlayButton, ...) \\
-            .colorize(Color()) \\
+            .colorize(Color.BLACK) \\
             .annotate("Control")
         ```
         """
@@ -177,7 +177,7 @@ class ControlShadow(IControlShadow):
         """
         self._control = control
         self._value = 0.0
-        self._color = Color()
+        self._color = Color.BLACK
         self._annotation = ""
         self._changed = False
         self._connected = True
@@ -296,7 +296,7 @@ class ControlShadow(IControlShadow):
         ```py
         # Bind to a play button, set its color to black, and label it "control"
         shadow.bindControl(PlayButton, ...) \\
-            .colorize(Color()) \\
+            .colorize(Color.BLACK) \\
             .annotate("Control")
         ```
         """
@@ -376,7 +376,7 @@ class NullControlShadow(IControlShadow):
         Represents the color that will be applied to the control after the
         event has been processed.
         """
-        return Color()
+        return Color.BLACK
 
     @color.setter
     def color(self, newColor: Color) -> None:
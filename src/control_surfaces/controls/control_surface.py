@@ -113,8 +113,8 @@ class ControlSurface:
         if event_pattern is None:
             event_pattern = NullPattern()
         self.__pattern = event_pattern
-        self.__color = Color()
-        self.__prev_color = Color()
+        self.__color = Color.BLACK
+        self.__prev_color = Color.BLACK
         self.__annotation = ""
         self.__prev_annotation = ""
         self.__value = 0.0
@@ -141,12 +141,30 @@ class ControlSurface:
             self.__value_manager = value_manager
         else:
             self.__value_manager = DummyValueManager()
+        # Whether each manager sends feedback to the device
+        self.__color_feedback = \
+            not isinstance(self.__color_manager, DummyColorManager)
+        self.__annotation_feedback = \
+            not isinstance(self.__annotation_manager, DummyAnnotationManager)
+        self.__value_feedback = \
+            not isinstance(self.__value_manager, DummyValueManager)
 
         # The time that this control was pressed last
         self.__last_press_time = 0.0
         # The time that this control was tweaked last
         self.__last_tweak_time = 0.0
 
+        # Correlation ID and start time of the last event that touched this
+        # control, while waiting to send feedback for it. This is only used
+        # when profiling.
+        self.__correlation: Optional[tuple[int, int]] = None
+
+        # Number of events matched and feedback messages sent by this
+        # control, and the time they were last reset
+        self.__matches = 0
+        self.__sent = 0
+        self.__traffic_since = time()
+
     def __repr__(self) -> str:
         """
         String representation of the control surface
@@ -199,6 +217,7 @@ class ControlSurface:
             channel = self.__value_strategy.getChannelFromEvent(event)
             self.__needs_update = True
             self.__got_update = False
+            self.__matches += 1
             t = time()
             self.__last_tweak_time = t
             if self.isPress(self.value):
@@ -347,6 +366,85 @@ class ControlSurface:
             return time() - self.__last_press_time
         return 0.0
 
+    def hasFeedback(self) -> bool:
+        """
+        Returns whether this control can send feedback to the device (its
+        color, annotation or value)
+
+        ### Returns:
+        * `bool`: whether the control has any managers
+        """
+        return self.__color_feedback or self.__annotation_feedback \
+            or self.__value_feedback
+
+    def getCorrelation(self) -> Optional[tuple[int, int]]:
+        """
+        Returns the correlation ID and start time (in ns) of the last event
+        that touched this control, if it is waiting to send feedback for it.
+        This is used by the profiler to measure the latency from events to
+        their feedback.
+
+        ### Returns:
+        * `Optional[tuple[int, int]]`: correlation, or `None` if not waiting
+          for feedback
+        """
+        return self.__correlation
+
+    def setCorrelation(self, correlation: Optional[tuple[int, int]]) -> None:
+        """
+        Set the correlation ID and start time (in ns) of an event that touched
+        this control, so that the latency until this control sends feedback
+        can be measured by the profiler.
+
+        ### Args:
+        * `correlation` (`Optional[tuple[int, int]]`): correlation, or `None`
+          to stop waiting for feedback
+        """
+        self.__correlation = correlation
+
+    def __updateFeedback(self, correlation: tuple[int, int]):
+        """
+        Check whether feedback was sent for the event with the given
+        correlation
+
+        Properties that are only sent again because of a thorough tick don't
+        count, since they weren't caused by the event.
+        """
+        profiler = getContext().profiler
+        if profiler is None:
+            self.__correlation = None
+            return
+        sent = (
+            self.__color != self.__prev_color and self.__color_feedback
+        ) or (
+            self.__annotation != self.__prev_annotation
+            and self.__annotation_feedback
+        ) or (
+            self.__value != self.__prev_value and self.__value_feedback
+        )
+        if profiler.updateFeedback(self, correlation, sent):
+            self.__correlation = None
+
+    def getTraffic(self) -> tuple[int, int, float]:
+        """
+        Returns the number of events matched by this control and the number
+        of feedback messages (color, annotation or value) it sent to the
+        device, since they were last reset.
+
+        ### Returns:
+        * `tuple[int, int, float]`: number of events matched, number of
+          messages sent, and the unix time that the counts were last reset
+        """
+        return self.__matches, self.__sent, self.__traffic_since
+
+    def resetTraffic(self) -> None:
+        """
+        Reset the counts of events matched and messages sent by this control
+        """
+        self.__matches = 0
+        self.__sent = 0
+        self.__traffic_since = time()
+
     ###########################################################################
     # Events
 
@@ -366,21 +464,29 @@ class ControlSurface:
         # Otherwise, only update them if they need it (ie the property changed)
         if thorough or self.__color != self.__prev_color:
             self.__color_manager.onColorChange(self.color)
+            if self.__color_feedback:
+                self.__sent += 1
         if thorough or self.__annotation != self.__prev_annotation:
             self.__annotation_manager.onAnnotationChange(self.annotation)
+            if self.__annotation_feedback:
+                self.__sent += 1
         if thorough or self.__value != self.__prev_value:
             self.__value_manager.onValueChange(self.value)
+            if self.__value_feedback:
+                self.__sent += 1
         self.tick()
         self.__color_manager.tick()
         self.__annotation_manager.tick()
         self.__value_manager.tick()
+        if self.__correlation is not None:
+            self.__updateFeedback(self.__correlation)
         if self.__got_update:
             self.__needs_update = False
             self.__got_update = False
         self.__prev_color = self.__color
         # Set color back to off, so that we don't have to worry about things
         # not getting updated correctly
-        self.__color = Color()
+        self.__color = Color.BLACK
         self.__prev_annotation = self.__annotation
         self.__prev_value = self.__value
 
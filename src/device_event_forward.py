@@ -18,6 +18,11 @@ more details.
 """
 # flake8: noqa
 
+# Profile the startup of the script, including all imports
+import startup_profiler
+startup_profiler.begin()
+startup_profiler.beginPhase("imports")
+
 import version_check
 
 # Add our additional includes to the Python environment
@@ -38,6 +43,8 @@ from common import getContext
 # Import console helpers
 from common.util.console_helpers import *
 
+startup_profiler.endPhase()
+
 
 class OverallDevice:
     @catchContextResetException
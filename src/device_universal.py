@@ -19,6 +19,11 @@ more details.
 # Disable flake8 on this file: it gets too mad at us
 # flake8: noqa
 
+# Profile the startup of the script, including all imports
+import startup_profiler
+startup_profiler.begin()
+startup_profiler.beginPhase("imports")
+
 import version_check
 
 # Add our additional includes to the Python environment
@@ -45,6 +50,8 @@ from common.states import WaitingForDevice, MainState
 # Import console helpers
 from common.util.console_helpers import *
 
+startup_profiler.endPhase()
+
 
 class OverallDevice:
     @catchContextResetException
@@ -54,6 +61,7 @@ class OverallDevice:
     @catchContextResetException
     def onDeinit(self) -> None:
         getContext().deinitialize()
+        log.close()
 
     @catchContextResetException
     def onMidiIn(self, event) -> None:
@@ -14,21 +14,12 @@ __all__ = [
     'Device',
     'DeviceShadow',
     'EventCallback',
+    'ShadowTemplate',
 ]
 
 from .device import Device
 from .device_shadow import DeviceShadow, EventCallback
+from .shadow_template import ShadowTemplate
 
-# Device manufacturers
-from . import (
-    akai,
-    novation,
-    maudio,
-    korg,
-)
-del (
-    akai,
-    novation,
-    maudio,
-    korg,
-)
+# Device definitions are imported when they are first required, using the
+# extension manifest. Refer to `common.extension_manager.loader`.
@@ -10,6 +10,4 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
-from . import mpk_mini_mk3
-
 __all__ = ['mpk_mini_mk3']
@@ -0,0 +1,241 @@
+"""
+devices > control_index
+
+Contains the FreeControlIndex class, which indexes the free controls of a
+device shadow by their type, so that matching controls can be found without
+checking every control on the device.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import sys
+from typing import TYPE_CHECKING, Optional
+from weakref import WeakKeyDictionary
+from control_surfaces import ControlShadow, ControlSurface
+
+if TYPE_CHECKING:
+    from . import Device
+
+__all__ = [
+    'FreeControlIndex',
+]
+
+
+class _ControlLayout:
+    """
+    The layout of the controls on a device, which is shared by the indexes of
+    every device shadow of the device.
+    """
+
+    def __init__(self, controls: list[ControlShadow]) -> None:
+        # Position of each control on the device
+        self.positions: dict[ControlSurface, int] = {}
+        # Controls of each type, in the order of their positions
+        self.order: dict[type[ControlSurface], list[ControlSurface]] = {}
+        for i, c in enumerate(controls):
+            control = c.getControl()
+            self.positions[control] = i
+            self.order.setdefault(type(control), []).append(control)
+        # Positions of the controls of each type, in the order of their
+        # coordinates
+        self.sorted: dict[type[ControlSurface], list[int]] = {
+            t: sorted(
+                (self.positions[c] for c in order),
+                key=lambda i: (controls[i].coordinate, i),
+            )
+            for t, order in self.order.items()
+        }
+        # Concrete types that are subclasses of each requested type
+        self.subtypes: dict[
+            type[ControlSurface],
+            tuple[type[ControlSurface], ...],
+        ] = {}
+
+    def getSubtypes(
+        self,
+        control: type[ControlSurface],
+    ) -> tuple[type[ControlSurface], ...]:
+        subtypes = self.subtypes.get(control)
+        if subtypes is None:
+            subtypes = tuple(t for t in self.order if issubclass(t, control))
+            self.subtypes[control] = subtypes
+        return subtypes
+
+
+# Layouts of each device, so that they are only calculated once
+_layouts: 'WeakKeyDictionary[Device, _ControlLayout]' = WeakKeyDictionary()
+
+
+class FreeControlIndex:
+    """
+    The free controls of a device shadow, indexed by the concrete type of each
+    control.
+
+    Controls of each type are kept in the order of their coordinates (and
+    then in the order they were added to the device), so that matches don't
+    need to be sorted. Claiming a control takes constant time.
+    """
+
+    def __init__(
+        self,
+        device: 'Device',
+        controls: list[ControlShadow],
+    ) -> None:
+        """
+        Create a FreeControlIndex
+
+        ### Args:
+        * `device` (`Device`): device that the controls belong to
+        * `controls` (`list[ControlShadow]`): all the controls of the device,
+          in the order given by `Device.getControlShadows()`. These are
+          initially free.
+        """
+        layout = _layouts.get(device)
+        if layout is None:
+            layout = _ControlLayout(controls)
+            _layouts[device] = layout
+        self.__layout = layout
+        # Free controls of each type, in the order of their coordinates
+        self.__types: dict[
+            type[ControlSurface],
+            dict[ControlSurface, ControlShadow],
+        ] = {
+            t: {controls[i].getControl(): controls[i] for i in order}
+            for t, order in layout.sorted.items()
+        }
+        # Free controls of each type, in the order of their positions
+        self.__order: dict[type[ControlSurface], dict[ControlSurface, None]] \
+            = {t: dict.fromkeys(order) for t, order in layout.order.items()}
+        self.__len = len(controls)
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __contains__(self, control: ControlShadow) -> bool:
+        c = control.getControl()
+        bucket = self.__types.get(type(c))
+        return bucket is not None and bucket.get(c) is control
+
+    def copy(self) -> 'FreeControlIndex':
+        """
+        Returns a copy of the index, which can be claimed from independently
+
+        ### Returns:
+        * `FreeControlIndex`: copy
+        """
+        new = FreeControlIndex.__new__(FreeControlIndex)
+        new.__layout = self.__layout
+        new.__types = {t: b.copy() for t, b in self.__types.items()}
+        new.__order = {t: o.copy() for t, o in self.__order.items()}
+        new.__len = self.__len
+        return new
+
+    def estimateMemory(self) -> int:
+        """
+        Returns an estimate of the memory used by this index, excluding the
+        layout of the device, which is shared with other indexes
+
+        ### Returns:
+        * `int`: estimated memory usage, in bytes
+        """
+        return sys.getsizeof(self) + sys.getsizeof(vars(self)) \
+            + sys.getsizeof(self.__types) + sys.getsizeof(self.__order) \
+            + sum(sys.getsizeof(b) for b in self.__types.values()) \
+            + sum(sys.getsizeof(o) for o in self.__order.values())
+
+    def getPosition(self, control: ControlShadow) -> int:
+        """
+        Returns the position of the given control on the device
+
+        ### Args:
+        * `control` (`ControlShadow`): control
+
+        ### Returns:
+        * `int`: index of the control
+        """
+        return self.__layout.positions[control.getControl()]
+
+    def claim(self, control: ControlShadow) -> None:
+        """
+        Mark a control as no longer free
+
+        ### Args:
+        * `control` (`ControlShadow`): control to claim
+
+        ### Raises:
+        * `KeyError`: control isn't free
+        """
+        c = control.getControl()
+        del self.__types[type(c)][c]
+        del self.__order[type(c)][c]
+        self.__len -= 1
+
+    def replace(self, old: ControlShadow, new: ControlShadow) -> None:
+        """
+        Replace a free control shadow with another shadow of the same control,
+        keeping its position
+
+        ### Args:
+        * `old` (`ControlShadow`): control shadow to replace
+        * `new` (`ControlShadow`): replacement
+        """
+        c = old.getControl()
+        assert new.getControl() is c
+        self.__types[type(c)][c] = new
+
+    def getTypes(
+        self,
+        control: type[ControlSurface],
+    ) -> list[tuple[type[ControlSurface], int]]:
+        """
+        Returns the concrete types of the free controls matching the given
+        type, along with the number of free controls of each type.
+
+        Types are ordered by the position of their first free control.
+
+        ### Args:
+        * `control` (`type[ControlSurface]`): type to match
+
+        ### Returns:
+        * `list[tuple[type[ControlSurface], int]]`: types and number of
+          controls
+        """
+        positions = self.__layout.positions
+        firsts: list[tuple[int, type[ControlSurface], int]] = []
+        for t in self.__layout.getSubtypes(control):
+            order = self.__order[t]
+            if len(order):
+                firsts.append((positions[next(iter(order))], t, len(order)))
+        firsts.sort(key=lambda f: f[0])
+        return [(t, n) for _, t, n in firsts]
+
+    def getControls(
+        self,
+        control: type[ControlSurface],
+        concrete: Optional[type[ControlSurface]] = None,
+    ) -> list[ControlShadow]:
+        """
+        Returns the free controls matching the given type, in the order of
+        their coordinates
+
+        ### Args:
+        * `control` (`type[ControlSurface]`): type to match
+        * `concrete` (`type[ControlSurface]`, optional): only return controls
+          of this exact type. Defaults to `None` (return all matches).
+
+        ### Returns:
+        * `list[ControlShadow]`: free controls
+        """
+        if concrete is not None:
+            return list(self.__types[concrete].values())
+        subtypes = self.__layout.getSubtypes(control)
+        if len(subtypes) == 1:
+            return list(self.__types[subtypes[0]].values())
+        positions = self.__layout.positions
+        return sorted(
+            (c for t in subtypes for c in self.__types[t].values()),
+            key=lambda c: (c.coordinate, positions[c.getControl()]),
+        )
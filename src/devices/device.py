@@ -17,7 +17,7 @@ from common.profiler import profilerDecoration, ProfilerContext
 from common.util.abstract_method_error import AbstractMethodError
 from control_surfaces.event_patterns import IEventPattern
 from fl_classes import FlMidiMsg
-from control_surfaces import ControlShadow
+from control_surfaces import ControlShadow, ControlSurface
 
 from control_surfaces import ControlEvent
 from control_surfaces.matchers import IControlMatcher
@@ -79,6 +79,10 @@ class Device:
         * `control_matcher` (`IControlMatcher`): Control matching strategy.
         """
         self._matcher = control_matcher
+        # Controls that have been tweaked since they were last collected. A
+        # dict is used as an ordered set, so this is bounded by the number of
+        # controls on the device.
+        self.__tweaked: dict[ControlSurface, None] = {}
 
     @classmethod
     @abstractmethod
@@ -159,6 +163,24 @@ class Device:
         """
         return None
 
+    @classmethod
+    def getDeviceNames(cls) -> tuple[str, ...]:
+        """
+        Returns the names of devices that this device definition should match,
+        where the name is the return value of `device.getName()`.
+
+        This is used as a fallback for matching the device if no universal
+        device enquiry response is given. Unlike `matchDeviceName()`, these
+        names are indexed when the device is registered, so this should be
+        preferred where possible.
+
+        By default this returns no names
+
+        ### Returns:
+        * `tuple[str, ...]`: names of devices
+        """
+        return ()
+
     @classmethod
     def matchDeviceName(cls, name: str) -> bool:
         """
@@ -166,9 +188,10 @@ class Device:
         the return value of `device.getName()`.
 
         This is used as a fallback for  matching the device if no universal
-        device enquiry response is given.
+        device enquiry response is given. It is only checked if no device
+        matches the name from `getDeviceNames()`.
 
-        By default, this won't match anything
+        By default, this matches the names from `getDeviceNames()`
 
         ### Args:
         * `name` (`str`): name of the device
@@ -176,7 +199,7 @@ class Device:
         ### Returns:
         * `bool`: whether there was a match
         """
-        return False
+        return name in cls.getDeviceNames()
 
     @classmethod
     def getDrumPadSize(cls) -> tuple[int, int]:
@@ -240,7 +263,31 @@ class Device:
         ### Returns:
         * `MatchedEvent`: event data
         """
-        return self._matcher.matchEvent(event)
+        mapping = self._matcher.matchEvent(event)
+        if mapping is not None:
+            self.__tweaked[mapping.getControl()] = None
+        return mapping
+
+    @final
+    def popTweakedControls(self) -> list[ControlSurface]:
+        """
+        Returns the controls that have been tweaked since the last time this
+        function was called, in the order that they were first tweaked, and
+        forget about them.
+
+        This allows plugins that react to controls being tweaked to do so
+        without checking every control on the device each tick. Note that
+        calling this clears the collection, so it should only be used by one
+        consumer.
+
+        This shouldn't be overridden by child classes.
+
+        ### Returns:
+        * `list[ControlSurface]`: controls tweaked since the last call
+        """
+        tweaked = list(self.__tweaked)
+        self.__tweaked.clear()
+        return tweaked
 
     @final
     def getControlShadows(self) -> list[ControlShadow]:
@@ -254,3 +301,15 @@ class Device:
         * `list[ControlSurface]`: Control shadows
         """
         return [ControlShadow(c) for c in self._matcher.getControls()]
+
+    @final
+    def getControls(self) -> list[ControlSurface]:
+        """
+        Returns a list of all the controls available on the device.
+
+        This shouldn't be overridden by child classes.
+
+        ### Returns:
+        * `list[ControlSurface]`: controls
+        """
+        return list(self._matcher.getControls())
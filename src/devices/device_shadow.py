@@ -11,13 +11,17 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+import sys
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 from typing_extensions import TypeAlias
+import common
 from common.plug_indexes import FlIndex
 
 from common.util.dict_tools import lowestValueGrEqTarget, greatestKey
 from control_surfaces import ControlSurface
 from . import Device
+from .control_index import FreeControlIndex
+from .shadow_template import ShadowTemplate, BindingPlan
 
 from control_surfaces import (
     IControlShadow,
@@ -87,20 +91,46 @@ class DeviceShadow:
     the device's control surfaces independently of other plugins, and without
     affecting the actual device unless the script chooses to apply this shadow.
     """
-    def __init__(self, device: Device) -> None:
+    def __init__(
+        self,
+        device: Device,
+        template: Optional[ShadowTemplate] = None,
+    ) -> None:
         """
         Create a device shadow
 
         ### Args:
         * `device` (`Device`): device to shadow
+        * `template` (`ShadowTemplate`, optional): template to share control
+          shadows and binding plans with. When this is given, control shadows
+          are only allocated for controls that are matched. Defaults to
+          `None`.
         """
         self._device = device
-        self._all_controls = device.getControlShadows()
-        self._free_controls = self._all_controls.copy()
+        self._template = template
+        if template is None:
+            self._all_controls = device.getControlShadows()
+            self._free_controls = FreeControlIndex(device, self._all_controls)
+            self._own_controls = self._all_controls
+        else:
+            # Shared with the template until a control is matched
+            self._all_controls = template.getControls()
+            self._free_controls = template.getFreeControls()
+            self._own_controls = []
+        # Arguments and results of each control match, so that they can be
+        # replayed by other shadows using the same template
+        self._plan: BindingPlan = []
+        self._replaying = template is not None \
+            and template.getPlan() is not None
         self._assigned_controls: dict[
             IControlHash,
             tuple[ControlShadow, Optional[EventCallback], TickCallback, tuple]
         ] = {}
+        # Assigned controls that have a tick callback, so that we don't need
+        # to check every assigned control when ticking
+        self._tick_controls: list[
+            tuple[ControlShadow, TickCallback, tuple]
+        ] = []
         self._minimal = False
         self._debug: Optional[str] = None
 
@@ -162,6 +192,34 @@ class DeviceShadow:
         """
         return DeviceShadow(self.getDevice())
 
+    def estimateMemory(self) -> int:
+        """
+        Returns an estimate of the memory used by this device shadow, including
+        the shadows of each control and the assignments made to them.
+
+        Objects that are shared with other device shadows (such as the
+        controls themselves, callback functions and the control shadows of a
+        template) aren't included.
+
+        ### Returns:
+        * `int`: estimated memory usage, in bytes
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(vars(self))
+        size += self._free_controls.estimateMemory()
+        size += sys.getsizeof(self._assigned_controls)
+        size += sys.getsizeof(self._tick_controls)
+        size += sys.getsizeof(self._plan)
+        if self._template is None \
+                or self._all_controls is not self._template.getControls():
+            size += sys.getsizeof(self._all_controls)
+        for c in self._own_controls:
+            size += sys.getsizeof(c) + sys.getsizeof(vars(c))
+        for entry in self._assigned_controls.values():
+            size += sys.getsizeof(entry) + sys.getsizeof(entry[3])
+        for tick_entry in self._tick_controls:
+            size += sys.getsizeof(tick_entry)
+        return size
+
     def setMinimal(self, value: bool) -> None:
         """
         Control whether this device shadow is "minimal"
@@ -189,19 +247,18 @@ class DeviceShadow:
 
     def _getMatches(
         self,
-        expr: Callable[[ControlSurface], bool],
+        control: type[ControlSurface],
         target_num: Optional[int] = None,
         one_type: bool = True,
     ) -> list[ControlShadow]:
         """
-        Returns a list of control matches for a give condition lambda
+        Returns a list of free controls matching the given type
 
         This function is called by getControlMatches to reduce complexity.
         Calling this function from outside this class is not recommended.
 
         ### Args:
-        * `expr` (`Callable[[ControlSurface], bool]`): Expression to check
-          types
+        * `control` (`type[ControlSurface]`): Type of control to match
         * `target_num` (`int`, optional): Target number to get, so that we
           don't use more space than necessary. Defaults to `None`.
         * `one_type` (`bool`, optional): Whether controls should be separated
@@ -210,21 +267,13 @@ class DeviceShadow:
         ### Returns:
         * `list[ControlShadow]`: List of available controls
         """
-        type_matches: dict[type[ControlSurface], list[ControlShadow]] = {}
-        num_type_matches: dict[type[ControlSurface], int] = {}
-        for c in self._free_controls:
-            if one_type:
-                t = type(c.getControl())
-            else:
-                t = ControlSurface  # type: ignore
-            # If we want to assign this control
-            if expr(c.getControl()):
-                num_type_matches[t] = \
-                    num_type_matches.get(t, 0) + 1
-                if t in type_matches:
-                    type_matches[t].append(c)
-                else:
-                    type_matches[t] = [c]
+        types = self._free_controls.getTypes(control)
+        if one_type:
+            num_type_matches = dict(types)
+        else:
+            total = sum(n for _, n in types)
+            num_type_matches = \
+                {ControlSurface: total} if total else {}  # type: ignore
 
         try:
             if target_num is None:
@@ -242,7 +291,9 @@ class DeviceShadow:
         except ValueError:
             # No matches causes greatestKey() to fail since there's no keys
             return []
-        return type_matches[highest]
+        if one_type:
+            return self._free_controls.getControls(control, highest)
+        return self._free_controls.getControls(control)
 
     def getControlMatches(
         self,
@@ -298,6 +349,45 @@ class DeviceShadow:
         ### Returns:
         * `ControlShadowList`: List of matches
         """
+        # Types are identified by name, so that plans can be saved
+        key = (
+            f"{control.__module__}.{control.__qualname__}",
+            allow_substitution,
+            target_num,
+            trim,
+            exact,
+            raise_on_zero,
+            one_type,
+        )
+        matches = self._replayMatches(key)
+        if matches is None:
+            try:
+                matches = self._findMatches(control, *key[1:])
+            except ValueError:
+                if self._template is not None:
+                    self._plan.append((key, None))
+                raise
+        if self._template is not None:
+            self._plan.append(
+                (key, tuple(self._template.getIndex(c) for c in matches))
+            )
+            matches = [self._claim(c) for c in matches]
+        return ControlShadowList(matches)
+
+    def _findMatches(
+        self,
+        control: type[ControlSurface],
+        allow_substitution: bool,
+        target_num: Optional[int],
+        trim: bool,
+        exact: bool,
+        raise_on_zero: bool,
+        one_type: bool,
+    ) -> list[ControlShadow]:
+        """
+        Search the free controls for matches. Refer to `getControlMatches()`
+        for a description of the arguments.
+        """
         # If we allow substitution, then search through all available types in
         # order
         if allow_substitution:
@@ -310,7 +400,7 @@ class DeviceShadow:
         # Final all the matches for each type one by one
         for t in sub_types:
             matches = self._getMatches(
-                lambda x: isinstance(x, t),
+                t,
                 target_num,
                 one_type,
             )
@@ -321,9 +411,7 @@ class DeviceShadow:
             if target_num is not None and len(matches) >= target_num:
                 break
 
-        # Sort the matches based on coordinate
-        def sort_key(c): return c.coordinate
-        ret.sort(key=sort_key)
+        # Matches are already sorted based on coordinate
 
         # Make sure we have results
         if raise_on_zero and len(ret) == 0:
@@ -331,21 +419,98 @@ class DeviceShadow:
 
         # If we have no target, ignore exact and trim parameters
         if target_num is None:
-            return ControlShadowList(ret)
+            return ret
 
         if exact:
             if len(ret) < target_num:
                 raise ValueError("Not enough matching controls found")
             elif trim:
-                return ControlShadowList(ret[:target_num])
+                return ret[:target_num]
             else:
                 if len(ret) > target_num:
                     raise ValueError("Too many matching controls found. "
                                      "Ensure you are using the trim flag "
                                      "correctly.")
-                return ControlShadowList(ret)
+                return ret
         else:
-            return ControlShadowList(ret)
+            return ret
+
+    def _replayMatches(self, key: tuple) -> Optional[list[ControlShadow]]:
+        """
+        Returns the controls matched by the template's binding plan for this
+        step, or `None` if they need to be found by searching.
+
+        If the plugin requests different controls to the plan, the plan is
+        abandoned for the rest of the binding.
+
+        ### Args:
+        * `key` (`tuple`): arguments to `getControlMatches()`
+        """
+        if not self._replaying:
+            return None
+        assert self._template is not None
+        plan = self._template.getPlan()
+        assert plan is not None
+        step = len(self._plan)
+        if step >= len(plan) or plan[step][0] != key:
+            self._abandonPlan()
+            return None
+        indexes = plan[step][1]
+        if indexes is None:
+            # Matching failed when the plan was recorded
+            return None
+        if any(i >= len(self._all_controls) for i in indexes):
+            self._abandonPlan()
+            return None
+        matches = [self._all_controls[i] for i in indexes]
+        if not all(c in self._free_controls for c in matches):
+            self._abandonPlan()
+            return None
+        self._count("shadows.plan.replayed")
+        return matches
+
+    def _abandonPlan(self) -> None:
+        self._replaying = False
+        self._count("shadows.plan.diverged")
+
+    @staticmethod
+    def _count(counter: str) -> None:
+        profiler = common.getContext().profiler
+        if profiler is not None:
+            profiler.incrementCounter(counter)
+
+    def _claim(self, control: ControlShadow) -> ControlShadow:
+        """
+        Returns a control shadow that belongs to this device shadow for the
+        given control, replacing the template's shared shadow if necessary, so
+        that the plugin can modify it.
+
+        ### Args:
+        * `control` (`ControlShadow`): free control shadow
+
+        ### Returns:
+        * `ControlShadow`: control shadow belonging to this device shadow
+        """
+        assert self._template is not None
+        if not self._template.isShared(control):
+            return control
+        own = ControlShadow(control.getControl())
+        if self._all_controls is self._template.getControls():
+            self._all_controls = self._all_controls.copy()
+        self._all_controls[self._template.getIndex(control)] = own
+        self._free_controls.replace(control, own)
+        self._own_controls.append(own)
+        return own
+
+    def getBindingPlan(self) -> BindingPlan:
+        """
+        Returns the arguments and results of each control match made by this
+        device shadow, so that it can be recorded by a `ShadowTemplate`.
+
+        ### Returns:
+        * `BindingPlan`: binding plan
+        """
+        return self._plan
 
     def getNumControlMatches(
         self,
@@ -415,11 +580,13 @@ class DeviceShadow:
             args_ = args
 
         # Remove from free controls
-        self._free_controls.remove(control)
+        self._free_controls.claim(control)
 
         # Bind to callable
         self._assigned_controls[control.getMapping()] = \
             (control, on_event, on_tick, args_)
+        if on_tick is not None:
+            self._tick_controls.append((control, on_tick, args_))
 
     def bindControls(
         self,
@@ -723,12 +890,9 @@ class DeviceShadow:
         * `index` (`PluginIndex`): Index of channel or track/slot of the
           selected plugin
         """
-        # Get control's mapping if it's assigned
-        for control_shadow, _, fn, args in self._assigned_controls.values():
-            # If a callback is defined
-            if fn is not None:
-                # Call the bound function with any extra required args
-                fn(control_shadow, index, *args)
+        for control_shadow, fn, args in self._tick_controls:
+            # Call the bound function with any extra required args
+            fn(control_shadow, index, *args)  # type: ignore
 
     def apply(self, thorough: bool) -> None:
         """
@@ -12,5 +12,3 @@ more details.
 __all__ = [
     'hammer88pro'
 ]
-
-from . import hammer88pro
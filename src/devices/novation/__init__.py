@@ -13,6 +13,3 @@ __all__ = [
     'launchkey',
     'sl',
 ]
-
-from . import launchkey
-from . import sl
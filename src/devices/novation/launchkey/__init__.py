@@ -13,8 +13,3 @@ __all__ = [
     'mk3',
     'mk3_mini',
 ]
-
-from . import incontrol
-from . import mk2
-from . import mk3
-from . import mk3_mini
@@ -10,13 +10,14 @@ Authors:
 This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
+from common.types import GrayscalePalette
 
 
-COLORS = {
+COLORS = GrayscalePalette({
     0.0: 0,  # Off
     1.0: 3,  # Max?
     0.8: 4,
     0.6: 5,
     0.4: 6,
     0.2: 7,
-}
+})
@@ -10,10 +10,10 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
-from common.types.color import Color
+from common.types import Color, ColorPalette
 
 
-COLORS = {
+COLORS = ColorPalette({
     #                 0xRRGGBB
     Color.fromInteger(0x000000):   0,  # Off
     Color.fromInteger(0x5C656A):   1,  # Grey (default FL Color)
@@ -143,4 +143,4 @@ COLORS = {
     Color.fromInteger(0x4E3E00): 125,
     Color.fromInteger(0xC37100): 126,  # Dull orange
     Color.fromInteger(0x5D1C00): 127,
-}
+})
@@ -15,7 +15,7 @@ from control_surfaces.event_patterns import (
     IEventPattern,
     ForwardedPattern
 )
-from common.types import Color
+from common.types import ColorPalette
 from control_surfaces.value_strategies import NoteStrategy, ForwardedStrategy
 from control_surfaces import ControlSwitchButton
 from ..incontrol_surface import ColorInControlSurface
@@ -26,7 +26,7 @@ class LkControlSwitchButton(ControlSwitchButton):
         self,
         channel: int,
         note_num: int,
-        colors: dict[Color, int],
+        colors: ColorPalette,
         event_num: int,
     ) -> None:
         status = (event_num << 4) + channel
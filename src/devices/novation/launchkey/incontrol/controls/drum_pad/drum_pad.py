@@ -12,7 +12,7 @@ more details.
 
 from typing import TYPE_CHECKING, Optional
 from control_surfaces.event_patterns import ForwardedPattern,  NotePattern
-from common.types import Color
+from common.types import ColorPalette
 from control_surfaces.value_strategies import NoteStrategy, ForwardedStrategy
 from control_surfaces import (
     ControlSurface,
@@ -41,7 +41,7 @@ class ILkDrumPad(ControlSurface):  # pragma: no cover
         coordinate: tuple[int, int],
         channel: int,
         note_num: int,
-        colors: dict[Color, int],
+        colors: ColorPalette,
         debug: Optional[str] = None,
     ) -> None:
         raise NotImplementedError("ILkDrumPad")
@@ -79,7 +79,7 @@ def createLkDrumPadBase(
         coordinate: tuple[int, int],
         channel: int,
         note_num: int,
-        colors: dict[Color, int],
+        colors: ColorPalette,
         debug: Optional[str] = None,
     ) -> None:
         extends.__init__(
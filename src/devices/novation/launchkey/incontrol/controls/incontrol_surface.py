@@ -12,7 +12,7 @@ more details.
 from typing import Optional
 from common import profilerDecoration
 from fl_classes import FlMidiMsg
-from common.types import Color
+from common.types import Color, ColorPalette, GrayscalePalette
 from common.util.events import forwardEvent
 from control_surfaces.managers import IColorManager
 from ..consts import REFRESH_INTERVAL
@@ -61,7 +61,7 @@ class ColorInControlSurface(InControlSurface):
         self,
         channel: int,
         note_num: int,
-        colors: dict[Color, int],
+        colors: ColorPalette,
         event_num: int = 0x9,
         debug: Optional[str] = None,
     ) -> None:
@@ -75,7 +75,7 @@ class ColorInControlSurface(InControlSurface):
         """Called when the color changes"""
         if self.__debug is not None:
             print(self.__debug, new)
-        self.setColor(self.__colors[new.closest(list(self.__colors.keys()))])
+        self.setColor(self.__colors.closestValue(new))
         self.updateColor()
 
 
@@ -87,7 +87,7 @@ class GrayscaleInControlSurface(InControlSurface):
         self,
         channel: int,
         note_num: int,
-        colors: dict[float, int],
+        colors: GrayscalePalette,
         event_num: int = 0x9,
     ) -> None:
         status = (event_num << 4) + channel
@@ -97,7 +97,5 @@ class GrayscaleInControlSurface(InControlSurface):
     @profilerDecoration("lk-grayscale-change")
     def onColorChange(self, new: Color) -> None:
         """Called when the color changes"""
-        self.setColor(self.__colors[new.closestGrayscale(
-            list(self.__colors.keys())
-        )])
+        self.setColor(self.__colors.closestValue(new))
         self.updateColor()
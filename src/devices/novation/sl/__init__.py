@@ -10,5 +10,3 @@ more details.
 __all__ = [
     'mk3',
 ]
-
-from . import mk3
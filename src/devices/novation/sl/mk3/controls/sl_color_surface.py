@@ -10,10 +10,39 @@ Authors:
 This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
+from functools import lru_cache
+from typing import Optional
 from fl_classes import FlMidiMsg
 from control_surfaces.managers import IColorManager
 from common.types import Color
-from common.util.events import forwardEvent
+from common.util.events import encodeForwardedEvent, forwardEncodedEvent
+
+# Start of the sysex message used to set the color of an LED
+SET_LED_HEADER = [0xF0, 0x00, 0x20, 0x29, 0x02, 0x0A, 0x01, 0x03]
+
+
+@lru_cache(maxsize=512)
+def encodeColor(rgb: int, enabled: bool, contrast_fix: bool) -> bytes:
+    """
+    Returns the red, green and blue bytes used to display a color on an SL
+    Mk3 LED.
+
+    This is cached, since calculating the faded color is expensive, and most
+    colors are shown repeatedly.
+
+    ### Args:
+    * `rgb` (`int`): color, as a 0xRRGGBB integer
+    * `enabled` (`bool`): whether the color is enabled
+    * `contrast_fix` (`bool`): whether disabled colors should be shown as off
+
+    ### Returns:
+    * `bytes`: scaled red, green and blue components
+    """
+    # Ignore whenever the light isn't enabled, as a fix for bad contrast
+    if not enabled and contrast_fix:
+        return bytes([0, 0, 0])
+    new = Color.fromInteger(rgb, enabled=enabled).fadeGray(-0.5, enabled)
+    return bytes([new.red // 2, new.green // 2, new.blue // 2])
 
 
 class SlColorSurface(IColorManager):
@@ -27,30 +56,21 @@ class SlColorSurface(IColorManager):
     ) -> None:
         self.__index = note_num
         self.__contrast_fix = contrast_fix
+        # Encoded start of the forwarded event for this LED. This depends on
+        # the device ID, so is created when the first color is sent
+        self.__header: Optional[bytes] = None
 
     def onColorChange(self, new: Color) -> None:
         """Called when the color changes"""
-        new = new.fadeGray(-0.5, enabled=new.enabled)
-        # Ignore whenever the light isn't enabled, as a fix for bad contrast
-        if not new.enabled and self.__contrast_fix:
-            new = Color()
-        forwardEvent(
-            FlMidiMsg([
-                0xF0,
-                0x00,
-                0x20,
-                0x29,
-                0x02,
-                0x0A,
-                0x01,
-                0x03,
-                self.__index,
-                0x01,
-                new.red // 2,
-                new.green // 2,
-                new.blue // 2,
-                0xF7,
-            ]),
+        if self.__header is None:
+            self.__header = encodeForwardedEvent(
+                FlMidiMsg(SET_LED_HEADER + [self.__index, 0x01]),
+                2,
+            )
+        forwardEncodedEvent(
+            self.__header
+            + encodeColor(new.integer, new.enabled, self.__contrast_fix)
+            + b'\xF7',
             2,
         )
 
@@ -0,0 +1,154 @@
+"""
+devices > shadow_template
+
+Contains the ShadowTemplate class, which allows device shadows for plugins of
+the same class to share their unassigned controls and to reuse the controls
+chosen when binding the first instance of the class.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import TYPE_CHECKING, Optional
+from control_surfaces import ControlShadow
+from .control_index import FreeControlIndex
+
+if TYPE_CHECKING:
+    from . import Device
+
+__all__ = [
+    'ShadowTemplate',
+    'BindingPlan',
+]
+
+# The arguments given to each call of `DeviceShadow.getControlMatches()` (with
+# the type of control given by its name), along with the indexes of the
+# controls that were matched (or `None` if matching failed)
+BindingPlan = list[tuple[tuple, Optional[tuple[int, ...]]]]
+
+
+class ShadowTemplate:
+    """
+    A frozen device shadow, shared between the device shadows of every
+    instance of a plugin class.
+
+    Device shadows created from a template share its control shadows until a
+    control is matched (at which point the plugin could modify it), so the
+    shadows of controls that a plugin doesn't use are only allocated once.
+
+    The controls matched by the first device shadow are recorded as a binding
+    plan. Device shadows created later replay the plan instead of searching
+    for matching controls, for as long as the plugin requests the same
+    controls in the same order.
+
+    The control shadows of a template must never be modified.
+    """
+
+    def __init__(
+        self,
+        device: 'Device',
+        base: Optional['ShadowTemplate'] = None,
+    ) -> None:
+        """
+        Create a ShadowTemplate
+
+        ### Args:
+        * `device` (`Device`): device to shadow
+        * `base` (`ShadowTemplate`, optional): template to share control
+          shadows with, so that templates for different plugin classes don't
+          each need to allocate them. Its binding plan isn't used. Defaults to
+          `None`.
+        """
+        self.__device = device
+        if base is None:
+            self.__controls = device.getControlShadows()
+            self.__free = FreeControlIndex(device, self.__controls)
+        else:
+            assert base.getDevice() is device
+            self.__controls = base.__controls
+            self.__free = base.__free
+        self.__plan: Optional[BindingPlan] = None
+
+    def __repr__(self) -> str:
+        steps = "no" if self.__plan is None else len(self.__plan)
+        return (
+            f"ShadowTemplate({len(self.__controls)} controls, "
+            f"{steps} planned matches)"
+        )
+
+    def getDevice(self) -> 'Device':
+        """
+        Returns the device that this template shadows
+
+        ### Returns:
+        * `Device`: device
+        """
+        return self.__device
+
+    def getControls(self) -> list[ControlShadow]:
+        """
+        Returns the shared control shadows of the template. These must not be
+        modified.
+
+        ### Returns:
+        * `list[ControlShadow]`: control shadows
+        """
+        return self.__controls
+
+    def getFreeControls(self) -> FreeControlIndex:
+        """
+        Returns a new index of the free controls, where every control is free
+
+        ### Returns:
+        * `FreeControlIndex`: free controls
+        """
+        return self.__free.copy()
+
+    def isShared(self, control: ControlShadow) -> bool:
+        """
+        Returns whether the given control shadow belongs to this template
+
+        ### Args:
+        * `control` (`ControlShadow`): control shadow
+
+        ### Returns:
+        * `bool`: whether it is shared
+        """
+        return self.__controls[self.__free.getPosition(control)] is control
+
+    def getIndex(self, control: ControlShadow) -> int:
+        """
+        Returns the index of the control shadowed by the given control shadow
+
+        ### Args:
+        * `control` (`ControlShadow`): control shadow
+
+        ### Returns:
+        * `int`: index of the control
+        """
+        return self.__free.getPosition(control)
+
+    def getPlan(self) -> Optional[BindingPlan]:
+        """
+        Returns the binding plan recorded by the first instance of the plugin,
+        or `None` if it hasn't been recorded yet
+
+        ### Returns:
+        * `Optional[BindingPlan]`: binding plan
+        """
+        return self.__plan
+
+    def recordPlan(self, plan: BindingPlan, replace: bool = False) -> None:
+        """
+        Record the binding plan of a device shadow, if a plan hasn't already
+        been recorded
+
+        ### Args:
+        * `plan` (`BindingPlan`): binding plan
+        * `replace` (`bool`, optional): whether to replace an existing plan.
+          Defaults to `False`.
+        """
+        if self.__plan is None or replace:
+            self.__plan = list(plan)
@@ -26,14 +26,12 @@ from .mapping_strategies import (
 from .plugin import Plugin, SpecialPlugin, StandardPlugin, WindowPlugin
 from .pager import PluginPager
 
-# Register plugins
-from . import (
-    special,
-    windows,
-    standard
-)
+# Register plugins that are always required. Standard and window plugins are
+# imported when they are first required, using the extension manifest. Refer
+# to `common.extension_manager.loader`.
+from . import special
+from .standard import fallback
 del (
     special,
-    windows,
-    standard
+    fallback,
 )
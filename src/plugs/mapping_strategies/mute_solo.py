@@ -117,7 +117,7 @@ class MuteSoloStrategy(IMappingStrategy):
             track = self.selected(number)
         except IndexError:
             # Out of range tracks should be disabled
-            control.color = Color()
+            control.color = Color.BLACK
             return
         if track.mute:
             control.color = COLOR_DISABLED
@@ -151,7 +151,7 @@ class MuteSoloStrategy(IMappingStrategy):
             track = self.selected(number)
         except IndexError:
             # Out of range tracks should be disabled
-            control.color = Color()
+            control.color = Color.BLACK
             return
         if track.mute:
             control.color = track.color
@@ -188,7 +188,7 @@ class MuteSoloStrategy(IMappingStrategy):
             track = self.selected(number)
         except IndexError:
             # Out of range tracks should be disabled
-            control.color = Color()
+            control.color = Color.BLACK
             return
         if track.mute:
             control.color = COLOR_DISABLED
@@ -11,6 +11,7 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+import sys
 from typing import final
 from common import log, verbosity
 from common.util.abstract_method_error import AbstractMethodError
@@ -85,6 +86,34 @@ class Plugin:
         """
         self._shadow.apply(thorough)
 
+    def estimateMemory(self) -> int:
+        """
+        Returns an estimate of the memory used by this plugin, which is used
+        to decide when plugins should be evicted from memory.
+
+        By default, this includes the plugin's attributes and its device
+        shadow. Plugins that store large amounts of data should override this
+        to include it.
+
+        ### Returns:
+        * `int`: estimated memory usage, in bytes
+        """
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(vars(self))
+            + self._shadow.estimateMemory()
+        )
+
+    def onEvict(self) -> None:
+        """
+        Called when the plugin is evicted from memory because too many plugins
+        are instantiated. The plugin won't be used after this, and a new
+        instance will be created if it is required again.
+
+        Plugins that hold onto resources outside of their device shadow should
+        override this to release them.
+        """
+
     @classmethod
     @abstractmethod
     def create(cls, shadow: DeviceShadow) -> 'Plugin':
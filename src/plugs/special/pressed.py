@@ -11,6 +11,7 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 
+from heapq import heappush, heappop
 from typing import Any
 from time import time
 from common.types import Color
@@ -45,38 +46,60 @@ class Press(SpecialPlugin):
     """
     Used to add colors to each control surface when it is pressed or recently
     tweaked.
-    """
 
-    def bind_all(
-        self,
-        shadow: DeviceShadow,
-        t: type[ControlSurface]
-    ) -> list[ControlShadow]:
-        """Continually bind all the controls"""
-        ret: list[ControlShadow] = []
-        while True:
-            len_ret = len(ret)
-            ret += shadow.bindMatches(t, self.any)
-            if len_ret == len(ret):
-                break
-        return ret
+    Rather than checking every control each tick, only controls that have
+    been tweaked recently are kept active. Velocity-sensitive controls and
+    buttons stay active while they are held, and other controls stay active
+    in a heap ordered by when their fade finishes.
+    """
 
     def __init__(self, shadow: DeviceShadow) -> None:
         shadow.setMinimal(True)
-        self._velocities = (
+        self._device = shadow.getDevice()
+        velocities = (
             self.bind_all(shadow, DrumPad)
             + self.bind_all(shadow, Note)
         )
-        self._buttons = self.bind_all(shadow, Button)
-        self._others = (
+        buttons = self.bind_all(shadow, Button)
+        others = (
             self.bind_all(shadow, Knob)
             + self.bind_all(shadow, Fader)
             + self.bind_all(shadow, Encoder)
             + self.bind_all(shadow, ModWheel)
             + self.bind_all(shadow, PitchWheel)
         )
+        # Map controls to their shadows, so that tweaked controls can be looked
+        # up quickly
+        self._velocities = {c.getControl(): c for c in velocities}
+        self._buttons = {c.getControl(): c for c in buttons}
+        self._others = {c.getControl(): c for c in others}
+        # Controls that are currently lit
+        self._held_velocities: dict[ControlShadow, None] = {}
+        self._held_buttons: dict[ControlShadow, None] = {}
+        # Heap of (fade end time, order, control) for fading controls, and the
+        # most recent fade end time for each of them, so that outdated heap
+        # entries can be skipped
+        self._fading: list[tuple[float, int, ControlShadow]] = []
+        self._fade_ends: dict[ControlShadow, float] = {}
+        self._fade_count = 0
+        # Nothing is lit to start with
+        for c in velocities + buttons + others:
+            c.connected = False
         super().__init__(shadow, [])
 
+    def bind_all(
+        self,
+        shadow: DeviceShadow,
+        t: type[ControlSurface]
+    ) -> list[ControlShadow]:
+        """Bind all the controls of the given type"""
+        return list(shadow.bindMatches(
+            t,
+            self.any,
+            allow_substitution=False,
+            one_type=False,
+        ))
+
     @classmethod
     def shouldBeActive(cls) -> bool:
         return True
@@ -85,31 +108,63 @@ class Press(SpecialPlugin):
     def create(cls, shadow: DeviceShadow) -> 'SpecialPlugin':
         return cls(shadow)
 
-    def any(
-        self,
-        *args: Any
-    ) -> bool:
+    def any(self, *args: Any) -> bool:
+        """Filter callback that ignores all events"""
         return False
 
     def tick(self, *args):
+        self.collectTweaked()
         self.tickVelocities()
         self.tickButtons()
         self.tickOthers()
 
+    def collectTweaked(self):
+        """Add controls tweaked since the last tick to the active controls"""
+        for control in self._device.popTweakedControls():
+            if control in self._velocities:
+                self._held_velocities[self._velocities[control]] = None
+            elif control in self._buttons:
+                self._held_buttons[self._buttons[control]] = None
+            elif control in self._others:
+                c = self._others[control]
+                end = control.last_tweaked + FADE_TIME
+                self._fade_ends[c] = end
+                self._fade_count += 1
+                heappush(self._fading, (end, self._fade_count, c))
+
+    def apply(self, thorough: bool) -> None:
+        # Only the active controls need to be applied
+        for c in self._held_velocities:
+            c.apply()
+        for c in self._held_buttons:
+            c.apply()
+        for c in self._fade_ends:
+            c.apply()
+
     def tickVelocities(self):
-        for c in self._velocities:
-            control = c.getControl()
+        pressed: list[ControlShadow] = []
+        velocities: list[float] = []
+        released: list[ControlShadow] = []
+        for c in self._held_velocities:
             if c.value:
                 c.connected = True
-                c.color = Color.fade(
-                    Color.BLACK, Color.WHITE, control.value
-                    # * fadeOverTime(control)
-                )
+                pressed.append(c)
+                velocities.append(c.getControl().value)
+                # * fadeOverTime(control)
             else:
                 c.connected = False
+                released.append(c)
+        for c, color in zip(
+            pressed,
+            Color.fadeMany(Color.BLACK, Color.WHITE, velocities),
+        ):
+            c.color = color
+        for c in released:
+            del self._held_velocities[c]
 
     def tickButtons(self):
-        for c in self._buttons:
+        released: list[ControlShadow] = []
+        for c in self._held_buttons:
             control = c.getControl()
             if control.value:
                 c.connected = True
@@ -117,16 +172,35 @@ class Press(SpecialPlugin):
                 # Color.fade(Color.BLACK, Color.WHITE, fadeOverTime(control))
             else:
                 c.connected = False
+                released.append(c)
+        for c in released:
+            del self._held_buttons[c]
 
     def tickOthers(self):
-        for c in self._others:
-            control = c.getControl()
-            fade = fadeOverTime(control)
+        # Remove controls whose fade has finished
+        now = time()
+        while len(self._fading) and self._fading[0][0] <= now:
+            end, _, c = heappop(self._fading)
+            # Skip entries that were replaced by a more recent tweak
+            if self._fade_ends.get(c) == end:
+                del self._fade_ends[c]
+                c.connected = False
+
+        tweaked: list[ControlShadow] = []
+        fades: list[float] = []
+        for c in self._fade_ends:
+            fade = fadeOverTime(c.getControl())
             if fade:
                 c.connected = True
-                c.color = Color.fade(Color.BLACK, Color.WHITE, fade)
+                tweaked.append(c)
+                fades.append(fade)
             else:
                 c.connected = False
+        for c, color in zip(
+            tweaked,
+            Color.fadeMany(Color.BLACK, Color.WHITE, fades),
+        ):
+            c.color = color
 
 
 ExtensionManager.super_special.register(Press)
@@ -18,11 +18,3 @@ __all__ = [
 ]
 
 from .basic_faders import basicPluginBuilder
-from . import (
-    fallback,
-    fl,
-    klevgrand,
-    matt_tytel,
-    spitfire,
-    xfer,
-)
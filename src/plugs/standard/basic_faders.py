@@ -26,6 +26,8 @@ def basicPluginBuilder(
     params: list[int],
     color: Union[Color, list[Color]],
     uses_presets: bool = False,
+    *,
+    module: str,
 ):
     """
     Build and register a basic fader plugin
@@ -40,6 +42,10 @@ def basicPluginBuilder(
 
     * `uses_presets` (`bool`, optional): whether the plugin uses presets
       (displayed in the top right of the plugin window). Defaults to `False`.
+
+    * `module` (`str`): name of the module that builds the plugin (usually
+      `__name__`), so that the extension manifest imports that module to load
+      the plugin.
     """
     class BuiltPlugin(StandardPlugin):
         """
@@ -62,4 +68,8 @@ def basicPluginBuilder(
         def getPlugIds(cls) -> tuple[str, ...]:
             return plugin_names
 
+    # Associate the plugin with the module that built it, rather than this one,
+    # so that the extension manifest imports the correct module to load it
+    BuiltPlugin.__module__ = module
+
     ExtensionManager.plugins.register(BuiltPlugin)
@@ -17,12 +17,3 @@ __all__ = [
     'harmless',
     'slicers',
 ]
-
-from . import (
-    fpc,
-    flex,
-    parametric_eq,
-    transistor_bass,
-    harmless,
-    slicers
-)
@@ -43,7 +43,7 @@ def colorPad(
     Determine the color to use for a particular drum pad
     """
     if not isinstance(ch_idx, GeneratorIndex):
-        return Color()
+        return Color.BLACK
     return ch_idx.fpcGetPadColor(calculate_overall_index(pad_idx))
 
 
@@ -102,7 +102,7 @@ class FPC(StandardPlugin):
         # Set colors and annotations for the others to be blank
         for i in range(128):
             if i not in notes:
-                self._notes[i].color = Color()
+                self._notes[i].color = Color.BLACK
                 self._notes[i].annotation = ""
 
     @event_filters.toGeneratorIndex()
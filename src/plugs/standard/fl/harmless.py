@@ -23,4 +23,8 @@ PARAMS = [
 
 COLOR = Color.fromInteger(0x47353f)
 
-basicPluginBuilder(("Harmless",), PARAMS, COLOR, uses_presets=True)
+basicPluginBuilder(
+    ("Harmless",), PARAMS, COLOR,
+    uses_presets=True,
+    module=__name__,
+)
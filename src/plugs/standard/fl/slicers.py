@@ -81,7 +81,7 @@ class Slicers(StandardPlugin):
                 pad_idx,
             )
         else:
-            return Color()
+            return Color.BLACK
 
     @tick_filters.toGeneratorIndex()
     def tick(self, index: GeneratorIndex) -> None:
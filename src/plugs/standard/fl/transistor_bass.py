@@ -23,4 +23,8 @@ PARAMS = [
 
 COLOR = Color.fromInteger(0x455765)
 
-basicPluginBuilder(("Transistor Bass",), PARAMS, COLOR, uses_presets=True)
+basicPluginBuilder(
+    ("Transistor Bass",), PARAMS, COLOR,
+    uses_presets=True,
+    module=__name__,
+)
@@ -21,6 +21,7 @@ basicPluginBuilder(
     ('Serum',),
     [218, 219, 220, 221],
     Color.fromInteger(0x206cc8),
+    module=__name__,
 )
 
 
@@ -29,4 +30,5 @@ basicPluginBuilder(
     ('OTT',),
     list(range(4)),
     Color.fromInteger(0xb1c1cf),
+    module=__name__,
 )
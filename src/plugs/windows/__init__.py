@@ -10,15 +10,9 @@ This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
 __all__ = [
-    'Mixer',
-    'ChannelRack',
-    'Playlist',
-    'PianoRoll',
-    'Browser',
+    'mixer',
+    'channel_rack',
+    'playlist',
+    'piano_roll',
+    'browser',
 ]
-
-from .mixer import Mixer
-from .channel_rack import ChannelRack
-from .playlist import Playlist
-from .piano_roll import PianoRoll
-from .browser import Browser
@@ -66,7 +66,7 @@ class OmniPreview(WindowPlugin):
         for drum in self._drums:
             index = coordToIndex(drum)
             if index == -1:
-                drum.color = Color()
+                drum.color = Color.BLACK
                 drum.annotation = ""
             else:
                 drum.color = Color.fromInteger(channels.getChannelColor(index))
@@ -0,0 +1,367 @@
+"""
+startup_profiler
+
+Contains the startup profiler, which records a timeline of each phase of the
+script's startup, including the time taken to import each module, so that
+slow startups can be diagnosed from a single run.
+
+This module is imported before anything else in the script (including the
+`common` module), so that the time taken by every import can be recorded. As
+such, it must only depend on the standard library.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from typing import Any, Iterator, Optional, Sequence
+
+__all__ = [
+    'StartupProfiler',
+    'begin',
+    'phase',
+    'beginPhase',
+    'endPhase',
+    'mark',
+    'isActive',
+    'finish',
+    'getProfiler',
+    'PROFILE_FILE',
+]
+
+PROFILE_FILE = \
+    '/'.join(__file__.replace('\\', '/').split('/')[:-1]) \
+    + '/startup_profile.txt'
+
+
+class _TimedLoader(Loader):
+    """
+    Wraps the loader of a module, so that the time taken to execute the module
+    is recorded by the startup profiler.
+    """
+    def __init__(self, loader: Any, profiler: 'StartupProfiler') -> None:
+        self.__loader = loader
+        self.__profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Any:
+        return self.__loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self.__profiler._enterImport(module.__name__)
+        try:
+            self.__loader.exec_module(module)
+        finally:
+            self.__profiler._exitImport()
+
+
+class _ImportHook(MetaPathFinder):
+    """
+    Import hook which finds modules using the other finders, then wraps their
+    loaders so that their import time is recorded.
+    """
+    def __init__(self, profiler: 'StartupProfiler') -> None:
+        self.__profiler = profiler
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Any = None,
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, self.__profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records a timeline of the phases of the script's startup, as well as the
+    time taken to import each module.
+
+    Phases can be nested. Imports are recorded with their self time (the time
+    spent executing the module itself) as well as their total time (including
+    the modules it imports).
+    """
+    def __init__(self) -> None:
+        self.__start = time.perf_counter_ns()
+        self.__end: Optional[int] = None
+        self.__hook: Optional[_ImportHook] = None
+        # Phases: name, start time, end time, depth
+        self.__phases: list[list[Any]] = []
+        self.__open_phases: list[list[Any]] = []
+        # Imports: name, self time, total time
+        self.__imports: list[tuple[str, int, int]] = []
+        # Imports in progress: name, start time, time spent in children
+        self.__import_stack: list[list[Any]] = []
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the profiler is still recording
+        """
+        return self.__end is None
+
+    def installImportHook(self) -> None:
+        """
+        Install the import hook, so that the time taken to import each module
+        is recorded
+        """
+        if self.__hook is None:
+            self.__hook = _ImportHook(self)
+            sys.meta_path.insert(0, self.__hook)
+
+    def removeImportHook(self) -> None:
+        """
+        Remove the import hook
+        """
+        if self.__hook is not None:
+            if self.__hook in sys.meta_path:
+                sys.meta_path.remove(self.__hook)
+            self.__hook = None
+
+    def _enterImport(self, name: str) -> None:
+        self.__import_stack.append([name, time.perf_counter_ns(), 0])
+
+    def _exitImport(self) -> None:
+        name, start, children = self.__import_stack.pop()
+        total = time.perf_counter_ns() - start
+        self.__imports.append((name, total - children, total))
+        if len(self.__import_stack):
+            self.__import_stack[-1][2] += total
+
+    def beginPhase(self, name: str) -> None:
+        """
+        Begin a phase of the startup
+
+        ### Args:
+        * `name` (`str`): name of the phase
+        """
+        if not self.active:
+            return
+        p = [name, time.perf_counter_ns(), None, len(self.__open_phases)]
+        self.__phases.append(p)
+        self.__open_phases.append(p)
+
+    def endPhase(self) -> None:
+        """
+        End the most recently started phase of the startup
+        """
+        if not self.active or not len(self.__open_phases):
+            return
+        self.__open_phases.pop()[2] = time.perf_counter_ns()
+
+    def mark(self, name: str) -> None:
+        """
+        Record an event during the startup, which takes no time
+
+        ### Args:
+        * `name` (`str`): name of the event
+        """
+        if not self.active:
+            return
+        now = time.perf_counter_ns()
+        self.__phases.append([name, now, now, len(self.__open_phases)])
+
+    def finish(self) -> None:
+        """
+        Finish recording, closing any phases that are still open and removing
+        the import hook
+        """
+        if not self.active:
+            return
+        while len(self.__open_phases):
+            self.endPhase()
+        self.__end = time.perf_counter_ns()
+        self.removeImportHook()
+
+    def getTotalTime(self) -> float:
+        """
+        Returns the total time taken by the startup so far
+
+        ### Returns:
+        * `float`: time in ms
+        """
+        end = self.__end if self.__end is not None else time.perf_counter_ns()
+        return (end - self.__start) / 1_000_000
+
+    def getPhases(self) -> list[tuple[str, float, float, int]]:
+        """
+        Returns the phases of the startup, in the order they started
+
+        ### Returns:
+        * `list[tuple[str, float, float, int]]`: name, start time (ms since
+          the profiler was created), duration (ms) and depth of each phase
+        """
+        now = time.perf_counter_ns()
+        return [
+            (
+                name,
+                (start - self.__start) / 1_000_000,
+                ((end if end is not None else now) - start) / 1_000_000,
+                depth,
+            )
+            for name, start, end, depth in self.__phases
+        ]
+
+    def getImports(self) -> list[tuple[str, float, float]]:
+        """
+        Returns the modules that were imported, sorted by their self time
+
+        ### Returns:
+        * `list[tuple[str, float, float]]`: name, self time (ms) and total
+          time (ms) of each module
+        """
+        return [
+            (name, self_time / 1_000_000, total / 1_000_000)
+            for name, self_time, total in sorted(
+                self.__imports, key=lambda i: i[1], reverse=True
+            )
+        ]
+
+    def format(self) -> str:
+        """
+        Format the profile as a human-readable report
+
+        ### Returns:
+        * `str`: report
+        """
+        lines = [
+            "Universal Controller Script startup profile",
+            f"Total startup time: {self.getTotalTime():.3f} ms",
+            "",
+        ]
+        header = f" {'Start (ms)':>12} | {'Time (ms)':>12} | Phase"
+        lines += [header, '=' * len(header)]
+        for name, start, duration, depth in self.getPhases():
+            lines.append(
+                f" {start:12.3f} | {duration:12.3f} | {'  ' * depth}{name}"
+            )
+        lines.append("")
+        header = f" {'Self (ms)':>12} | {'Total (ms)':>12} | Module"
+        lines += [header, '=' * len(header)]
+        for name, self_time, total in self.getImports():
+            lines.append(f" {self_time:12.3f} | {total:12.3f} | {name}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str = PROFILE_FILE) -> None:
+        """
+        Write the profile to a file
+
+        ### Args:
+        * `path` (`str`, optional): path to write to. Defaults to
+          `startup_profile.txt` in the script's directory.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.format())
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def begin() -> None:
+    """
+    Begin profiling the script's startup. This should be called before any
+    other modules in the script are imported.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        _profiler.installImportHook()
+
+
+def getProfiler() -> Optional[StartupProfiler]:
+    """
+    Returns the startup profiler, or `None` if startup profiling was never
+    started (for example, when running tests)
+    """
+    return _profiler
+
+
+def isActive() -> bool:
+    """
+    Returns whether the startup is currently being profiled
+    """
+    return _profiler is not None and _profiler.active
+
+
+def beginPhase(name: str) -> None:
+    """
+    Begin a phase of the startup, if the startup is being profiled
+
+    ### Args:
+    * `name` (`str`): name of the phase
+    """
+    if _profiler is not None:
+        _profiler.beginPhase(name)
+
+
+def endPhase() -> None:
+    """
+    End the most recently started phase of the startup, if the startup is
+    being profiled
+    """
+    if _profiler is not None:
+        _profiler.endPhase()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Context manager for recording a phase of the startup
+
+    ### Args:
+    * `name` (`str`): name of the phase
+    """
+    beginPhase(name)
+    try:
+        yield
+    finally:
+        endPhase()
+
+
+def mark(name: str) -> None:
+    """
+    Record an event during the startup, if the startup is being profiled
+
+    ### Args:
+    * `name` (`str`): name of the event
+    """
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def finish(path: Optional[str] = None) -> Optional[StartupProfiler]:
+    """
+    Finish profiling the startup, removing the import hook
+
+    ### Args:
+    * `path` (`Optional[str]`, optional): path to write the profile to, or
+      `None` to not write it. Defaults to `None`.
+
+    ### Returns:
+    * `Optional[StartupProfiler]`: the profiler, if startup was profiled and
+      this is the first time it was finished
+    """
+    if not isActive():
+        return None
+    assert _profiler is not None
+    _profiler.finish()
+    if path is not None:
+        _profiler.write(path)
+    return _profiler
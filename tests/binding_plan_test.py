@@ -0,0 +1,139 @@
+"""
+tests > binding_plan_test
+
+Tests for saving binding plans, which allow plugins to be bound without
+searching for matching controls when the script is next started
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.profiler import ProfilerManager
+from common.util.binding_plans import (
+    getPlanKey,
+    getBindingPlan,
+    saveBindingPlan,
+)
+from control_surfaces import Fader
+from devices import DeviceShadow, ShadowTemplate
+from plugs.standard.spitfire.spitfire_generic import SUPPORTED_PLUGINS
+
+PLAN = [
+    (("control_surfaces.Fader", True, 2, True, False, False, True), (3, 4)),
+    (("control_surfaces.PlayButton", True, 1, True, False, False, True), (9,)),
+    (("control_surfaces.Knob", False, None, False, True, True, False), None),
+]
+
+DEVICE = "Akai.Mpk.Mini.Mk3"
+
+
+def test_round_trip():
+    saveBindingPlan("key", PLAN)
+    assert getBindingPlan("key") == PLAN
+    saveBindingPlan("empty", [])
+    assert getBindingPlan("empty") == []
+
+
+def test_missing():
+    assert getBindingPlan("key") is None
+
+
+def test_invalid_ignored(binding_plan_file):
+    binding_plan_file.write_text(
+        "# Header\n"
+        "not a plan\n"
+        "key\tnot,a=valid plan\n"
+    )
+    assert getBindingPlan("not a plan") is None
+    assert getBindingPlan("key") is None
+
+
+def test_other_versions_discarded(binding_plan_file):
+    binding_plan_file.write_text("0.0.0|Old.Device|1|plug\t\n")
+    saveBindingPlan("key", PLAN)
+    assert "Old.Device" not in binding_plan_file.read_text()
+
+
+def setEnabled(enabled: bool) -> None:
+    getContext().settings.set("advanced.binding_plan_cache", enabled)
+
+
+def createPlugin():
+    """Create the first Spitfire plugin, returning its device shadow"""
+    device = ExtensionManager.devices.getById(DEVICE)
+    getContext().registerDevice(device)
+    ExtensionManager.resetPlugins()
+    plug = ExtensionManager.plugins.get(SUPPORTED_PLUGINS[0], device)
+    assert plug is not None
+    return device, type(plug), plug._shadow
+
+
+def test_plan_saved_and_replayed():
+    """Plans are saved after a plugin is created, and are replayed after the
+    plugins are reset
+    """
+    setEnabled(True)
+    profiler = ProfilerManager(False)
+    try:
+        with FlContext():
+            device, plug, shadow = createPlugin()
+            plan = getBindingPlan(getPlanKey(device, plug))
+            assert plan == shadow.getBindingPlan()
+            getContext().profiler = profiler
+            _, _, replayed = createPlugin()
+            assert replayed.getBindingPlan() == shadow.getBindingPlan()
+            counters = profiler.getCounters()
+            assert counters["shadows.plan.replayed"] > 0
+            assert "shadows.plan.diverged" not in counters
+    finally:
+        ExtensionManager.resetPlugins()
+        getContext().profiler = None
+        # Settings can be shared between contexts
+        setEnabled(False)
+    unsafeResetContext()
+
+
+def test_stale_plan_replaced():
+    """If a saved plan doesn't match what the plugin binds, it is replaced"""
+    setEnabled(True)
+    try:
+        with FlContext():
+            device, plug, shadow = createPlugin()
+            key = getPlanKey(device, plug)
+            saveBindingPlan(key, PLAN)
+            ExtensionManager.resetPlugins()
+            _, _, replayed = createPlugin()
+            assert replayed.getBindingPlan() == shadow.getBindingPlan()
+            assert getBindingPlan(key) == shadow.getBindingPlan()
+    finally:
+        ExtensionManager.resetPlugins()
+        setEnabled(False)
+    unsafeResetContext()
+
+
+def test_out_of_range_plan_abandoned():
+    """Plans referring to controls the device doesn't have are abandoned"""
+    with FlContext():
+        device = ExtensionManager.devices.getById(DEVICE)
+        t = ShadowTemplate(device)
+        live = DeviceShadow(device, t)
+        live.getControlMatches(Fader, target_num=2)
+        (key, indexes), = live.getBindingPlan()
+        t.recordPlan([(key, (1000, 1001))])
+        s = DeviceShadow(device, t)
+        s.getControlMatches(Fader, target_num=2)
+        assert s.getBindingPlan() == [(key, indexes)]
+    unsafeResetContext()
+
+
+def test_disabled(binding_plan_file):
+    """When the setting is disabled, no plans are saved"""
+    with FlContext():
+        createPlugin()
+        ExtensionManager.resetPlugins()
+    unsafeResetContext()
+    assert not binding_plan_file.exists()
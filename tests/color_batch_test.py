@@ -0,0 +1,129 @@
+"""
+tests > color_batch_test
+
+Tests for batch color operations, ensuring that they give the same results as
+operating on colors individually.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+import pytest
+import random
+import time
+from common.types import Color
+from common.types import color as color_module
+from tests.helpers.performance import perfTestsSkipped
+
+# Number of controls for a device with 128 notes and 16 drum pads
+NUM_CONTROLS = 128 + 16
+
+COLORS = [
+    Color.BLACK,
+    Color.WHITE,
+    Color.fromHsv(10, 1, 1),
+    Color.fromHsv(230, 0.5, 0.6),
+    Color.fromHsv(345, 0.7, 0.8),
+    Color.fromRgb(12, 200, 90, 0.3, True),
+]
+
+
+def randomFades(num: int, seed: int = 0):
+    rand = random.Random(seed)
+    starts = [rand.choice(COLORS) for _ in range(num)]
+    ends = [rand.choice(COLORS) for _ in range(num)]
+    positions = [rand.random() for _ in range(num)]
+    return starts, ends, positions
+
+
+def assertSameColors(expected: list[Color], actual: list[Color]):
+    assert len(expected) == len(actual)
+    for e, a in zip(expected, actual):
+        assert e == a
+        assert e.grayscale == a.grayscale
+        assert e.enabled == a.enabled
+
+
+@pytest.fixture(params=['array', 'numpy'])
+def batch_path(request, monkeypatch):
+    """Run tests using both the array and NumPy implementations"""
+    if request.param == 'numpy':
+        if color_module.numpy is None:
+            pytest.skip("NumPy not installed")
+        monkeypatch.setattr(color_module, 'NUMPY_BATCH_THRESHOLD', 0)
+    else:
+        monkeypatch.setattr(color_module, 'numpy', None)
+
+
+def test_fade_many(batch_path):
+    starts, ends, positions = randomFades(200)
+    assertSameColors(
+        [Color.fade(s, e, p) for s, e, p in zip(starts, ends, positions)],
+        Color.fadeMany(starts, ends, positions),
+    )
+
+
+def test_fade_many_single_colors(batch_path):
+    positions = [i / 127 for i in range(128)] * 2
+    assertSameColors(
+        [Color.fade(Color.BLACK, Color.WHITE, p) for p in positions],
+        Color.fadeMany(Color.BLACK, Color.WHITE, positions),
+    )
+
+
+def test_fade_many_wrap_hue(batch_path):
+    """Hues should wrap in the same way as when fading individually"""
+    start = Color.fromHsv(10, 1, 1)
+    end = Color.fromHsv(350, 1, 1)
+    positions = [0.0, 0.1, 0.4, 0.5, 0.6, 0.9, 1.0]
+    assertSameColors(
+        [Color.fade(start, end, p) for p in positions],
+        Color.fadeMany(start, end, positions),
+    )
+    assertSameColors(
+        [Color.fade(end, start, p) for p in positions],
+        Color.fadeMany(end, start, positions),
+    )
+
+
+def test_fade_many_enabled(batch_path):
+    faded = Color.fadeMany(Color.BLACK, Color.BLACK, [0.5, 0.7], True)
+    assert all(c.enabled for c in faded)
+
+
+def test_fade_many_empty():
+    assert Color.fadeMany(Color.BLACK, Color.WHITE, []) == []
+
+
+def test_fade_many_length_mismatch():
+    with pytest.raises(ValueError):
+        Color.fadeMany([Color.BLACK], Color.WHITE, [0.1, 0.2])
+
+
+@pytest.mark.skipif(**perfTestsSkipped())
+def test_fade_many_performance():
+    """Fading colors for a device with 128 notes and 16 drum pads should be
+    faster in a batch than individually
+    """
+    rand = random.Random(0)
+    ticks = 100
+    # Notes are faded by their velocity, which is one of 128 values
+    positions = [
+        [rand.randrange(128) / 127 for _ in range(NUM_CONTROLS)]
+        for _ in range(ticks)
+    ]
+
+    start = time.perf_counter()
+    for tick in positions:
+        [Color.fade(Color.BLACK, Color.WHITE, p) for p in tick]
+    individual = (time.perf_counter() - start) / ticks
+
+    start = time.perf_counter()
+    for tick in positions:
+        Color.fadeMany(Color.BLACK, Color.WHITE, tick)
+    batch = (time.perf_counter() - start) / ticks
+
+    assert batch < individual
@@ -232,3 +232,39 @@ def test_grayscale_int():
 def test_closest_grayscale():
     c = Color.fromGrayscale(0.7)
     assert c.closestGrayscale([0.0, 0.2, 0.3, 0.6, 0.9]) == 0.6
+
+
+def test_hsv_cached():
+    """HSV values should only be calculated once"""
+    c = Color.fromRgb(10, 15, 20)
+    assert c.hsv is c.hsv
+
+
+def test_interned_constants():
+    """Creating a color identical to a constant should give the constant"""
+    assert Color.fromGrayscale(0.7) is Color.ENABLED
+    assert Color.fromInteger(0x45F147, 0.6, True) is Color.FL_SONG
+    assert Color.fromRgb(255, 0, 0) is Color.RED
+
+
+def test_interned_requires_identical():
+    """Colors with different grayscale or enabled values shouldn't be
+    interned
+    """
+    c = Color.fromInteger(0x45F147)
+    assert c is not Color.FL_SONG
+    assert c == Color.FL_SONG
+
+
+def test_intern():
+    c = Color.fromRgb(1, 2, 3, 0.25, True)
+    assert Color.intern(c) is c
+    assert Color.fromRgb(1, 2, 3, 0.25, True) is c
+    # Interning an identical color gives the original object
+    assert Color.intern(Color.fromInteger(0x010203, 0.25, True)) is c
+
+
+def test_grayscale_out_of_range():
+    """Out of range grayscale values give a valid RGB color"""
+    assert Color.fromGrayscale(1.5) == 0xFFFFFF
+    assert Color.fromGrayscale(-0.5) == 0
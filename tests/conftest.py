@@ -0,0 +1,23 @@
+"""
+tests > conftest
+
+Configuration shared by all tests
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from common.util import binding_plans
+
+
+@pytest.fixture(autouse=True)
+def binding_plan_file(tmp_path, monkeypatch):
+    """Store binding plans in a temporary file, so that tests don't share
+    plans with each other or with the script
+    """
+    path = tmp_path.joinpath("binding_plans.txt")
+    monkeypatch.setattr(binding_plans, "BINDING_PLAN_FILE", str(path))
+    yield path
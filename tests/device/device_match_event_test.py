@@ -43,3 +43,14 @@ def test_match_faders():
         assert match is not None
         assert isinstance(match.getControl(), Fader)
         assert match.getControl() == d.faders[i]
+
+
+def test_pop_tweaked_controls():
+    """Tweaked controls are remembered until they are collected"""
+    d = DummyDeviceBasic()
+    d.matchEvent(FlMidiMsg(1, 2, 0))
+    d.matchEvent(FlMidiMsg(0, 0, 0))
+    # Repeated tweaks are only included once
+    d.matchEvent(FlMidiMsg(1, 2, 5))
+    assert d.popTweakedControls() == [d.faders[2], d.play_button]
+    assert d.popTweakedControls() == []
@@ -0,0 +1,127 @@
+"""
+tests > device > device_recognition_test
+
+Tests for recognizing devices using the device recognition index
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from typing import Optional
+from fl_classes import FlMidiMsg
+from common import ExtensionManager
+from common.exceptions import DeviceRecognizeError
+from common.extension_manager.devices import DeviceCollection
+from control_surfaces.event_patterns import BasicPattern, ByteMatch
+from devices import Device
+from tests.helpers.devices import DummyDeviceBasic
+
+# Make sure that all devices are registered
+ExtensionManager.loadAll()
+
+# Manufacturer ID reserved for non-commercial use
+MANUFACTURER = 0x7D
+
+
+class CountingPattern(BasicPattern):
+    """Pattern that counts the number of times it is matched"""
+    matches = 0
+
+    def matchEvent(self, event: FlMidiMsg) -> bool:
+        CountingPattern.matches += 1
+        return super().matchEvent(event)
+
+
+def makeDevice(family: ByteMatch, names: tuple[str, ...] = ()):
+    """Create a dummy device with the given family code and names"""
+    class Dev(DummyDeviceBasic):
+        @classmethod
+        def getUniversalEnquiryResponsePattern(cls):
+            return CountingPattern(
+                [0xF0, 0x7E, ..., 0x06, 0x02, MANUFACTURER, family]
+            )
+
+        @classmethod
+        def getDeviceNames(cls) -> tuple[str, ...]:
+            return names
+
+        @classmethod
+        def create(
+            cls,
+            event: Optional[FlMidiMsg] = None,
+            id: Optional[str] = None,
+        ) -> Device:
+            return cls()
+
+    return Dev
+
+
+def response(family: int) -> FlMidiMsg:
+    return FlMidiMsg([0xF0, 0x7E, 0x00, 0x06, 0x02, MANUFACTURER, family])
+
+
+@pytest.mark.parametrize('dev', ExtensionManager.devices.all())
+def test_recognize_registered(dev: type[Device]):
+    """Registered devices should be recognized from their response"""
+    pattern = dev.getUniversalEnquiryResponsePattern()
+    if pattern is None:
+        pytest.skip("Device has no enquiry response pattern")
+    recognized = ExtensionManager.devices.get(pattern.fulfil())
+    assert type(recognized) is dev
+
+
+def test_candidates_independent_of_device_count():
+    """Only the devices with a matching family code should be checked"""
+    collection = DeviceCollection()
+    devs = [makeDevice(i) for i in range(100)]
+    for d in devs:
+        collection.register(d)
+    CountingPattern.matches = 0
+    assert type(collection.get(response(42))) is devs[42]
+    assert CountingPattern.matches == 1
+
+
+def test_family_code_options():
+    collection = DeviceCollection()
+    tup = makeDevice((1, 2))
+    rng = makeDevice(range(10, 20))
+    collection.register(tup)
+    collection.register(rng)
+    assert type(collection.get(response(2))) is tup
+    assert type(collection.get(response(15))) is rng
+    with pytest.raises(DeviceRecognizeError):
+        collection.get(response(5))
+
+
+def test_registration_order_respected():
+    """When multiple devices match, the first registered should be used,
+    including when it has a wildcard family code
+    """
+    collection = DeviceCollection()
+    wildcard = makeDevice(...)
+    exact = makeDevice(3)
+    collection.register(wildcard)
+    collection.register(exact)
+    assert type(collection.get(response(3))) is wildcard
+
+
+def test_unrecognized_manufacturer():
+    collection = DeviceCollection()
+    collection.register(makeDevice(1))
+    with pytest.raises(DeviceRecognizeError):
+        collection.get(
+            FlMidiMsg([0xF0, 0x7E, 0x00, 0x06, 0x02, 0x7C, 0x01])
+        )
+
+
+def test_recognize_by_name():
+    collection = DeviceCollection()
+    devs = [makeDevice(i, (f"Controller {i}",)) for i in range(10)]
+    for d in devs:
+        collection.register(d)
+    assert type(collection.get("Controller 7")) is devs[7]
+    with pytest.raises(DeviceRecognizeError):
+        collection.get("Controller 10")
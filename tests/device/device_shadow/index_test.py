@@ -0,0 +1,129 @@
+"""
+tests > device > device_shadow > index_test
+
+Tests for the index of free controls in device shadows, including a benchmark
+for binding every control of a large device
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import time
+import pytest
+from control_surfaces import (
+    ControlShadow,
+    ControlSurface,
+    Fader,
+    FaderButton,
+    GenericFaderButton,
+    MuteButton,
+)
+from devices import DeviceShadow
+from tests.helpers.devices import DummyDeviceLarge
+from tests.helpers.performance import perfTestsSkipped
+
+
+def _dummy(*args, **kwargs) -> bool:
+    return True
+
+
+def controlTypes(s: DeviceShadow) -> list[type[ControlSurface]]:
+    """Returns the type of every control on the device, in order"""
+    return [type(c.getControl()) for c in s.getDevice().getControlShadows()]
+
+
+def bindEveryControl(s: DeviceShadow) -> None:
+    """Bind every control on the device, one at a time"""
+    for t in controlTypes(s):
+        s.bindMatch(t, _dummy, allow_substitution=False)
+
+
+def referenceBindEveryControl(s: DeviceShadow) -> None:
+    """Bind every control on the device, one at a time, by searching every
+    free control for each binding, as was done before the controls were
+    indexed
+    """
+    free = s.getDevice().getControlShadows()
+    for t in controlTypes(s):
+        type_matches: dict[type, list[ControlShadow]] = {}
+        for c in free:
+            if isinstance(c.getControl(), t):
+                type_matches.setdefault(type(c.getControl()), []).append(c)
+        largest: list[ControlShadow] = []
+        for m in type_matches.values():
+            if len(m) > len(largest):
+                largest = m
+        match = sorted(largest, key=lambda c: c.coordinate)[0]
+        free.remove(match)
+
+
+def test_bind_every_control():
+    s = DeviceShadow(DummyDeviceLarge())
+    bindEveryControl(s)
+    assert len(s._free_controls) == 0
+    assert len(s._assigned_controls) == len(controlTypes(s))
+    assert len(s.getControlMatches(Fader)) == 0
+
+
+def test_coordinate_order():
+    """Matches are given in the order of their coordinates"""
+    s = DeviceShadow(DummyDeviceLarge())
+    faders = s.getControlMatches(Fader)
+    assert [f.coordinate for f in faders] == [(0, i) for i in range(16)]
+    # Claimed controls are removed without affecting the order
+    s.bindControl(faders[3], _dummy)
+    remaining = s.getControlMatches(Fader, allow_substitution=False)
+    assert [f.coordinate for f in remaining] \
+        == [(0, i) for i in range(16) if i != 3]
+
+
+def test_type_order():
+    """When multiple types have the same number of free controls, the type
+    with the first free control on the device is used
+    """
+    s = DeviceShadow(DummyDeviceLarge())
+    assert all(
+        isinstance(c.getControl(), GenericFaderButton)
+        for c in s.getControlMatches(FaderButton)
+    )
+    # Once one of the generic fader buttons is claimed, there are more mute
+    # buttons available
+    s.bindMatch(GenericFaderButton, _dummy)
+    assert all(
+        isinstance(c.getControl(), MuteButton)
+        for c in s.getControlMatches(FaderButton)
+    )
+
+
+def test_mixed_types():
+    """When types don't need to be separated, all matches are given in the
+    order of their coordinates
+    """
+    s = DeviceShadow(DummyDeviceLarge())
+    matches = s.getControlMatches(FaderButton, one_type=False)
+    assert len(matches) == 16 * 5
+    coords = [c.coordinate for c in matches]
+    assert coords == sorted(coords)
+
+
+@pytest.mark.skipif(**perfTestsSkipped())
+def test_bind_every_control_performance():
+    """Binding every control of a large device should be faster than
+    searching all the free controls for each binding
+    """
+    device = DummyDeviceLarge()
+    repeats = 20
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        referenceBindEveryControl(DeviceShadow(device))
+    reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        bindEveryControl(DeviceShadow(device))
+    indexed = time.perf_counter() - start
+
+    assert indexed < reference
@@ -0,0 +1,145 @@
+"""
+tests > device > device_shadow > template_test
+
+Tests for device shadow templates, which allow device shadows for plugins of
+the same class to share unassigned controls and binding plans
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.profiler import ProfilerManager
+from control_surfaces import Fader, PlayButton, LoopButton, ControlShadow
+from devices import DeviceShadow, ShadowTemplate
+from plugs.standard.spitfire.spitfire_generic import SUPPORTED_PLUGINS
+from tests.helpers.devices import DummyDeviceBasic
+
+
+def _dummy(*args, **kwargs) -> bool:
+    return True
+
+
+def bindAll(s: DeviceShadow) -> None:
+    """Bind controls in the same way a plugin would"""
+    s.bindMatches(Fader, _dummy, target_num=2)
+    s.bindMatch(PlayButton, _dummy)
+
+
+def test_unassigned_controls_shared():
+    """Only matched controls are allocated for each shadow"""
+    t = ShadowTemplate(DummyDeviceBasic())
+    a = DeviceShadow(t.getDevice(), t)
+    b = DeviceShadow(t.getDevice(), t)
+    bindAll(a)
+    bindAll(b)
+    shared = [c for c in t.getControls() if c in a._all_controls]
+    assert len(shared) == len(t.getControls()) - 3
+    assert all(c in b._all_controls for c in shared)
+    assert all(not t.isShared(c) for c in a.getControlMatches(LoopButton))
+
+
+def test_changes_not_shared():
+    """Modifying a control of one shadow doesn't affect other shadows"""
+    t = ShadowTemplate(DummyDeviceBasic())
+    a = DeviceShadow(t.getDevice(), t)
+    b = DeviceShadow(t.getDevice(), t)
+    fa = a.bindMatch(Fader, _dummy)
+    fb = b.bindMatch(Fader, _dummy)
+    assert isinstance(fa, ControlShadow)
+    assert isinstance(fb, ControlShadow)
+    assert fa is not fb
+    assert fa.getControl() is fb.getControl()
+    fa.value = 1.0
+    fa.annotation = "Changed"
+    assert fb.value == 0.0
+    assert fb.annotation == ""
+    assert all(c.value == 0.0 for c in t.getControls())
+
+
+def test_plan_replayed():
+    """Shadows after the first reuse the recorded binding plan, getting the
+    same controls
+    """
+    profiler = ProfilerManager(False)
+    getContext().profiler = profiler
+    try:
+        t = ShadowTemplate(DummyDeviceBasic())
+        a = DeviceShadow(t.getDevice(), t)
+        bindAll(a)
+        t.recordPlan(a.getBindingPlan())
+        b = DeviceShadow(t.getDevice(), t)
+        bindAll(b)
+        assert [c.getControl() for c in a._all_controls] \
+            == [c.getControl() for c in b._all_controls]
+        assert {c.getControl() for c, *_ in a._assigned_controls.values()} \
+            == {c.getControl() for c, *_ in b._assigned_controls.values()}
+        counters = profiler.getCounters()
+        assert counters["shadows.plan.replayed"] == 2
+        assert "shadows.plan.diverged" not in counters
+    finally:
+        getContext().profiler = None
+
+
+def test_plan_diverged():
+    """If a plugin binds different controls, the plan is abandoned"""
+    profiler = ProfilerManager(False)
+    getContext().profiler = profiler
+    try:
+        t = ShadowTemplate(DummyDeviceBasic())
+        a = DeviceShadow(t.getDevice(), t)
+        bindAll(a)
+        t.recordPlan(a.getBindingPlan())
+        b = DeviceShadow(t.getDevice(), t)
+        b.bindMatch(PlayButton, _dummy)
+        b.bindMatches(Fader, _dummy, target_num=2)
+        assert len(b._assigned_controls) == 3
+        assert profiler.getCounters()["shadows.plan.diverged"] == 1
+    finally:
+        getContext().profiler = None
+
+
+def test_plan_not_replayed_when_taken():
+    """Planned controls that have already been bound aren't reused"""
+    t = ShadowTemplate(DummyDeviceBasic())
+    a = DeviceShadow(t.getDevice(), t)
+    # Without binding, the same fader is matched twice
+    fader = a.getControlMatches(Fader, target_num=1)[0]
+    assert a.getControlMatches(Fader, target_num=1)[0] is fader
+    t.recordPlan(a.getBindingPlan())
+    b = DeviceShadow(t.getDevice(), t)
+    b.bindMatch(Fader, _dummy)
+    # The planned fader is taken, so another one is found instead
+    assert b.getControlMatches(Fader, target_num=1)[0].getControl() \
+        is not fader.getControl()
+
+
+def test_plugin_ids_share_template():
+    """Standard plugins associated with many IDs use the same template, and
+    use less memory than the first instance
+    """
+    with FlContext():
+        device = ExtensionManager.devices.getById("Akai.Mpk.Mini.Mk3")
+        getContext().registerDevice(device)
+        ExtensionManager.resetPlugins()
+        try:
+            first = ExtensionManager.plugins.get(SUPPORTED_PLUGINS[0], device)
+            second = ExtensionManager.plugins.get(
+                SUPPORTED_PLUGINS[1],
+                device,
+            )
+            assert first is not None and second is not None
+            assert first is not second
+            assert type(first) is type(second)
+            # Both are much smaller than a shadow with all its controls
+            full = DeviceShadow(device)
+            assert first._shadow.estimateMemory() \
+                < full.estimateMemory() / 2
+            assert second._shadow.estimateMemory() \
+                < full.estimateMemory() / 2
+        finally:
+            ExtensionManager.resetPlugins()
+    unsafeResetContext()
@@ -14,6 +14,9 @@ import pytest
 from common import ExtensionManager
 from devices import Device
 
+# Make sure that all devices are registered
+ExtensionManager.loadAll()
+
 
 @pytest.mark.parametrize(
     'dev',
@@ -17,6 +17,9 @@ from common.states import WaitingForDevice, DeviceState
 from fl_classes import FlMidiMsg
 from devices import Device
 
+# Make sure that all devices are registered
+ExtensionManager.loadAll()
+
 
 class DummyState(DeviceState):
     @classmethod
@@ -0,0 +1,114 @@
+"""
+tests > device > sl_color_surface_test
+
+Tests for sending colors to the Novation SL Mk3
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+import pytest
+import time
+from fl_model import FlContext
+from fl_classes import FlMidiMsg
+from common.types import Color
+from common.util import events
+from common.util.events import encodeForwardedEvent
+from devices.novation.sl.mk3.controls import SlColorSurface
+from tests.helpers.devices import DummyDeviceContext
+from tests.helpers.performance import perfTestsSkipped
+
+COLORS = [
+    Color.BLACK,
+    Color.WHITE,
+    Color.ENABLED,
+    Color.DISABLED,
+    Color.FL_SONG,
+    Color.fromHsv(230, 0.5, 0.6),
+    Color.fromHsv(345, 0.7, 0.8, enabled=False),
+    Color.fromInteger(0x5C656A),
+]
+
+# LED indexes of all the RGB lights on the device
+LEDS = list(range(0x00, 0x02)) + list(range(0x1E, 0x26)) \
+    + list(range(0x26, 0x36)) + list(range(0x36, 0x42))
+
+
+def referenceEncode(index: int, new: Color, contrast_fix: bool) -> bytes:
+    """Encode a color in the same way as the original implementation"""
+    new = new.fadeGray(-0.5, enabled=new.enabled)
+    if not new.enabled and contrast_fix:
+        new = Color()
+    return encodeForwardedEvent(FlMidiMsg([
+        0xF0, 0x00, 0x20, 0x29, 0x02, 0x0A, 0x01, 0x03,
+        index,
+        0x01,
+        new.red // 2,
+        new.green // 2,
+        new.blue // 2,
+        0xF7,
+    ]), 2)
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Capture the events sent to the device"""
+    sent: list[bytes] = []
+    monkeypatch.setattr(
+        events.device,
+        'dispatch',
+        lambda i, status, sysex: sent.append(sysex),
+    )
+    with DummyDeviceContext():
+        with FlContext() as fl:
+            fl.device.dispatch_targets = [1]
+            yield sent
+
+
+@pytest.mark.parametrize('contrast_fix', [True, False])
+def test_encoding_unchanged(dispatched, contrast_fix):
+    """Colors should be encoded the same as the original implementation"""
+    for index in [0x00, 0x3F]:
+        surface = SlColorSurface(index, contrast_fix)
+        for c in COLORS:
+            surface.onColorChange(c)
+            assert dispatched.pop() == referenceEncode(index, c, contrast_fix)
+
+
+def test_enabled_not_conflated(dispatched):
+    """Colors with the same RGB but different enabled values shouldn't share a
+    cached encoding
+    """
+    surface = SlColorSurface(0x00)
+    surface.onColorChange(Color.fromInteger(0x5C656A, enabled=True))
+    surface.onColorChange(Color.fromInteger(0x5C656A, enabled=False))
+    enabled, disabled = dispatched
+    assert enabled != disabled
+
+
+@pytest.mark.skipif(**perfTestsSkipped())
+def test_refresh_performance(dispatched):
+    """Refreshing all the LEDs should be faster than the original
+    implementation
+    """
+    surfaces = [SlColorSurface(i) for i in LEDS]
+    repeats = 20
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for i in LEDS:
+            for c in COLORS:
+                events.forwardEncodedEvent(referenceEncode(i, c, True), 2)
+    reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for s in surfaces:
+            for c in COLORS:
+                s.onColorChange(c)
+    cached = time.perf_counter() - start
+
+    assert cached < reference
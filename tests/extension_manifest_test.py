@@ -0,0 +1,99 @@
+"""
+tests > extension_manifest_test
+
+Tests for the extension manifest, ensuring that it matches the extensions
+that are registered, and that extensions are only loaded when required.
+
+If these tests fail after adding or removing an extension, regenerate the
+manifest by running `python -m common.extension_manager.manifest_generator`
+from the `src` directory.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import sys
+import subprocess
+from pathlib import Path
+from common.extension_manager import manifest
+from common.extension_manager.loader import getManufacturerId
+from common.extension_manager.manifest_generator import (
+    importAllExtensions,
+    buildManifest,
+)
+
+
+def test_manifest_matches_registered():
+    importAllExtensions()
+    assert buildManifest() == {
+        'DEVICE_IDS': manifest.DEVICE_IDS,
+        'DEVICE_NAMES': manifest.DEVICE_NAMES,
+        'DEVICE_MANUFACTURERS': manifest.DEVICE_MANUFACTURERS,
+        'PLUGINS': manifest.PLUGINS,
+        'WINDOWS': manifest.WINDOWS,
+    }
+
+
+def test_manufacturer_id():
+    # Novation (3 byte ID)
+    assert getManufacturerId(
+        [0xF0, 0x7E, 0x00, 0x06, 0x02, 0x00, 0x20, 0x29, 0x7B]
+    ) == (0x00, 0x20, 0x29)
+    # Akai (1 byte ID)
+    assert getManufacturerId(
+        [0xF0, 0x7E, 0x7F, 0x06, 0x02, 0x47, 0x49, 0x00]
+    ) == (0x47,)
+    # Too short
+    assert getManufacturerId([0xF0, 0x7E, 0x7F, 0x06, 0x02]) is None
+    # Pattern with wildcard manufacturer
+    assert getManufacturerId(
+        [0xF0, 0x7E, ..., 0x06, 0x02, ...]
+    ) is None
+
+
+def runFresh(code: str) -> str:
+    """Run the given code in a new interpreter, returning its output"""
+    src = Path(__file__).parent.parent.joinpath('src')
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=src,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_info_includes_unloaded():
+    """
+    Info about the extensions includes extensions that haven't been loaded
+    yet
+    """
+    out = runFresh(
+        'from common import ExtensionManager as E\n'
+        'print(E.getInfo())\n'
+        'print(E.plugins.inspect("FPC"))'
+    )
+    assert out.startswith(f"{len(manifest.DEVICE_IDS)} devices, "
+                          f"{len(manifest.PLUGINS)} plugins")
+    assert "not associated" not in out
+    assert "FPC associated with" in out
+
+
+def test_extensions_not_loaded_on_start():
+    """
+    Only the extensions that are always required should be loaded when the
+    script starts. This is checked in a new interpreter, since other tests
+    load every extension.
+    """
+    modules = set(runFresh(
+        'import sys; import common; print("\\n".join(sys.modules))'
+    ).splitlines())
+    for module in (
+        list(manifest.DEVICE_IDS.values())
+        + list(manifest.PLUGINS.values())
+        + list(manifest.WINDOWS.values())
+    ):
+        assert module not in modules
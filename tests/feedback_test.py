@@ -0,0 +1,134 @@
+"""
+tests > feedback_test
+
+Tests for measuring the latency from events to the feedback sent to the
+device in response
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from time import time_ns
+from common import getContext
+from common.profiler import ProfilerManager
+from common.profiler.feedback import FEEDBACK_TIMEOUT
+from common.types import Color
+from tests.helpers.controls import ColorControl, SimpleControl
+
+
+@pytest.fixture
+def profiler():
+    """Enable the profiler during the test"""
+    profiler = ProfilerManager(False)
+    getContext().profiler = profiler
+    try:
+        yield profiler
+    finally:
+        getContext().profiler = None
+
+
+def test_feedback_recorded(profiler: ProfilerManager):
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns())
+    assert control.getCorrelation() is not None
+    # Nothing changed, so no feedback was sent
+    control.doTick(False)
+    assert control.getCorrelation() is not None
+    control.color = Color.WHITE
+    control.doTick(False)
+    assert control.manager.sent == [Color.WHITE]
+    assert control.getCorrelation() is None
+    histograms = profiler._feedback.getHistograms()
+    assert len(histograms["ColorControl"]) == 1
+    assert profiler._feedback.getMissed() == 0
+
+
+def test_no_feedback_possible(profiler: ProfilerManager):
+    """Controls that can't send feedback aren't waited for"""
+    control = SimpleControl(0)
+    profiler.correlateEvent(control, time_ns())
+    assert control.getCorrelation() is None
+    assert profiler._feedback.getEvents() == 0
+
+
+def test_thorough_tick_not_feedback(profiler: ProfilerManager):
+    """Properties that are sent again by a thorough tick, without changing,
+    aren't counted as feedback
+    """
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns())
+    control.doTick(True)
+    assert control.getCorrelation() is not None
+    control.color = Color.WHITE
+    control.doTick(True)
+    assert control.getCorrelation() is None
+    assert len(profiler._feedback.getHistograms()["ColorControl"]) == 1
+
+
+def test_feedback_timeout(profiler: ProfilerManager):
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns() - 2 * FEEDBACK_TIMEOUT)
+    control.doTick(False)
+    assert control.getCorrelation() is None
+    assert profiler._feedback.getMissed() == 1
+    assert len(profiler._feedback.getHistograms()) == 0
+
+
+def test_feedback_replaced(profiler: ProfilerManager):
+    """If another event touches a control before it sends feedback, the
+    first event is counted as having no feedback
+    """
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns())
+    profiler.correlateEvent(control, time_ns())
+    assert profiler._feedback.getEvents() == 2
+    assert profiler._feedback.getMissed() == 1
+    correlation = control.getCorrelation()
+    assert correlation is not None and correlation[0] == 2
+
+
+def test_feedback_traced(profiler: ProfilerManager):
+    profiler.startTrace()
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns())
+    control.color = Color.WHITE
+    control.doTick(False)
+    assert profiler._trace is not None
+    [event] = profiler._trace.getEvents()
+    assert event["name"] == "feedback-ColorControl"
+    assert event["args"]["id"] == "feedback#1"
+
+
+def test_feedback_inspected(
+    profiler: ProfilerManager,
+    capsys: pytest.CaptureFixture,
+):
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns())
+    control.color = Color.WHITE
+    control.doTick(False)
+    profiler.inspectLatency()
+    out = capsys.readouterr().out
+    assert "ColorControl" in out
+    assert "0 of 1 events got no feedback" in out
+    assert len(profiler._feedback.getHistograms()["ColorControl"]) == 0
+
+
+def test_feedback_reset(profiler: ProfilerManager):
+    """Resetting the latency also resets the counts of events, and events
+    from before the reset aren't counted as missed afterwards
+    """
+    control = ColorControl()
+    profiler.correlateEvent(control, time_ns() - 2 * FEEDBACK_TIMEOUT)
+    profiler.resetLatency()
+    assert profiler._feedback.getEvents() == 0
+    control.doTick(False)
+    assert control.getCorrelation() is None
+    assert profiler._feedback.getMissed() == 0
+    profiler.correlateEvent(control, time_ns() - 2 * FEEDBACK_TIMEOUT)
+    control.doTick(False)
+    assert profiler._feedback.getEvents() == 1
+    assert profiler._feedback.getMissed() == 1
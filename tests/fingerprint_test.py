@@ -0,0 +1,197 @@
+"""
+tests > fingerprint_test
+
+Tests for device fingerprints, which are used to skip device detection when
+the script starts
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.states import WaitingForDevice, VerifyingFingerprint, DeviceState
+from common.states.fingerprint_verify import isEnquiryResponse
+from common.util import fingerprint
+from common.util.fingerprint import (
+    getFingerprint,
+    saveFingerprint,
+    clearFingerprint,
+)
+from fl_classes import FlMidiMsg
+from devices import Device
+
+# Make sure that all devices are registered
+ExtensionManager.loadAll()
+
+NAME = "My Controller"
+
+
+class DummyState(DeviceState):
+    @classmethod
+    def create(cls, device: 'Device') -> 'DeviceState':
+        getContext().registerDevice(device)
+        return cls()
+
+    def initialize(self) -> None:
+        pass
+
+    def deinitialize(self) -> None:
+        pass
+
+    def tick(self) -> None:
+        pass
+
+    def processEvent(self, event: FlMidiMsg) -> None:
+        pass
+
+
+def enquiryResponse(dev: type[Device]) -> FlMidiMsg:
+    """Returns a universal device enquiry response for the given device"""
+    pattern = dev.getUniversalEnquiryResponsePattern()
+    assert pattern is not None
+    return pattern.fulfil()
+
+
+# Two devices that can be recognized using an enquiry response
+DEV_A, DEV_B = [
+    d for d in ExtensionManager.devices.all()
+    if d.getUniversalEnquiryResponsePattern() is not None
+    and isEnquiryResponse(enquiryResponse(d))
+][:2]
+
+
+@pytest.fixture(autouse=True)
+def fingerprint_file(tmp_path, monkeypatch):
+    """Store fingerprints in a temporary file"""
+    path = tmp_path.joinpath("device_fingerprints.txt")
+    monkeypatch.setattr(fingerprint, "FINGERPRINT_FILE", str(path))
+    unsafeResetContext()
+    yield path
+    unsafeResetContext()
+
+
+def recognize(dev: type[Device]) -> str:
+    """Recognize the given device, returning the ID of the device"""
+    return ExtensionManager.devices.get(enquiryResponse(dev)).getId()
+
+
+def test_missing_file():
+    """If no fingerprints have been saved, none should be found"""
+    assert getFingerprint(1, NAME) is None
+
+
+def test_save_and_load():
+    saveFingerprint(1, NAME, "Foo.Bar")
+    saveFingerprint(2, "Other", "Baz.Qux")
+    assert getFingerprint(1, NAME) == "Foo.Bar"
+    assert getFingerprint(2, "Other") == "Baz.Qux"
+    # Saving again replaces the existing fingerprint
+    saveFingerprint(1, NAME, "Baz.Qux")
+    assert getFingerprint(1, NAME) == "Baz.Qux"
+
+
+def test_name_changed():
+    """If a different device is on the port, the fingerprint is ignored"""
+    saveFingerprint(1, NAME, "Foo.Bar")
+    assert getFingerprint(1, "Other") is None
+
+
+def test_clear():
+    saveFingerprint(1, NAME, "Foo.Bar")
+    saveFingerprint(2, NAME, "Foo.Bar")
+    clearFingerprint(1)
+    assert getFingerprint(1, NAME) is None
+    assert getFingerprint(2, NAME) == "Foo.Bar"
+
+
+def test_invalid_lines_ignored(fingerprint_file):
+    """Lines that can't be parsed shouldn't stop fingerprints being loaded"""
+    fingerprint_file.write_text(
+        "# comment\n"
+        "garbage\n"
+        "x\tname\tid\n"
+        f"1\t{NAME}\tFoo.Bar\n"
+    )
+    assert getFingerprint(1, NAME) == "Foo.Bar"
+
+
+def test_saved_on_recognition():
+    """When a device is recognized via sysex, its fingerprint is saved"""
+    with FlContext() as fl:
+        fl.device.name = NAME
+        fl.device.port = 3
+        getContext().initialize(WaitingForDevice(DummyState))
+        getContext().processEvent(enquiryResponse(DEV_A))
+        assert getFingerprint(3, NAME) == recognize(DEV_A)
+
+
+def test_skip_detection():
+    """When there is a matching fingerprint, detection is skipped"""
+    saveFingerprint(3, NAME, recognize(DEV_A))
+    with FlContext() as fl:
+        fl.device.name = NAME
+        fl.device.port = 3
+        getContext().initialize(WaitingForDevice(DummyState))
+        assert isinstance(getContext().state, VerifyingFingerprint)
+        assert getContext().getDeviceId() == recognize(DEV_A)
+
+
+def test_fingerprint_disabled():
+    saveFingerprint(3, NAME, recognize(DEV_A))
+    getContext().settings.set("bootstrap.fingerprint_cache", False)
+    try:
+        with FlContext() as fl:
+            fl.device.name = NAME
+            fl.device.port = 3
+            getContext().initialize(WaitingForDevice(DummyState))
+            assert isinstance(getContext().state, WaitingForDevice)
+    finally:
+        # Settings can be shared between contexts
+        getContext().settings.set("bootstrap.fingerprint_cache", True)
+
+
+def test_unknown_device_cleared():
+    """Fingerprints for devices that don't exist are removed"""
+    saveFingerprint(3, NAME, "Not.A.Real.Device")
+    with FlContext() as fl:
+        fl.device.name = NAME
+        fl.device.port = 3
+        getContext().initialize(WaitingForDevice(DummyState))
+        assert isinstance(getContext().state, WaitingForDevice)
+    assert getFingerprint(3, NAME) is None
+
+
+def test_verified():
+    """When the enquiry response matches, the device is kept"""
+    saveFingerprint(3, NAME, recognize(DEV_A))
+    with FlContext() as fl:
+        fl.device.name = NAME
+        fl.device.port = 3
+        getContext().initialize(WaitingForDevice(DummyState))
+        state = getContext().state
+        assert isinstance(state, VerifyingFingerprint)
+        getContext().tick()
+        getContext().processEvent(enquiryResponse(DEV_A))
+        assert getContext().state is state
+        assert state.verified
+        assert getContext().getDeviceId() == recognize(DEV_A)
+
+
+def test_incorrect_fingerprint():
+    """When the enquiry response doesn't match, the script switches to the
+    correct device and updates the fingerprint
+    """
+    saveFingerprint(3, NAME, recognize(DEV_A))
+    with FlContext() as fl:
+        fl.device.name = NAME
+        fl.device.port = 3
+        getContext().initialize(WaitingForDevice(DummyState))
+        getContext().tick()
+        getContext().processEvent(enquiryResponse(DEV_B))
+        assert isinstance(getContext().state, DummyState)
+        assert getContext().getDeviceId() == recognize(DEV_B)
+    assert getFingerprint(3, NAME) == recognize(DEV_B)
@@ -32,6 +32,7 @@ from common.util.events import (
     isEventForwardedHere,
     isEventForwardedHereFrom,
     forwardEvent,
+    EventString,
 )
 
 
@@ -110,3 +111,21 @@ def testForwardChecking():
         with FlContext() as fl:
             fl.device.dispatch_targets = [1]
             forwardEvent(FlMidiMsg(7, 8, 9))
+
+
+def test_event_string_copies_event():
+    """Event strings keep the values of the event when they were created,
+    even if the event is modified afterwards
+    """
+    event = FlMidiMsg(0x90, 0x3C, 0x7F)
+    string = EventString(event)
+    event.data2 = 0
+    assert str(string) == "(0x90, 0x3C, 0x7F)"
+
+
+def test_event_string_forwarded():
+    with DummyDeviceContext():
+        event = FlMidiMsg(encodeForwardedEvent(FlMidiMsg(0x90, 0x3C, 0x7F), 1))
+        string = EventString(event)
+        event.sysex = bytes([0xF0, 0xF7])
+        assert str(string).endswith("=> (0x90, 0x3C, 0x7F))")
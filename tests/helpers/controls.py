@@ -9,7 +9,9 @@ Authors:
 This code is licensed under the GPL v3 license. Refer to the LICENSE file for
 more details.
 """
+from common.types import Color
 from control_surfaces.event_patterns import BasicPattern, ForwardedPattern
+from control_surfaces.managers import IColorManager
 from control_surfaces.value_strategies import Data2Strategy, ForwardedStrategy
 
 from control_surfaces import ControlSurface
@@ -62,3 +64,34 @@ class SimpleForwardedControl(ControlSurface):
     @staticmethod
     def getControlAssignmentPriorities() -> 'tuple[type[ControlSurface], ...]':
         return tuple()
+
+
+class RecordingColorManager(IColorManager):
+    """Records the colors sent to the device"""
+    def __init__(self) -> None:
+        self.sent: list[Color] = []
+
+    def onColorChange(self, new_color: Color) -> None:
+        self.sent.append(new_color)
+
+    def tick(self) -> None:
+        pass
+
+
+class ColorControl(ControlSurface):
+    """A control with an LED, which records the colors sent to the device
+
+    It matches any event with a status of 0 and a data1 of i
+    """
+    def __init__(self, i: int = 0, coordinate: tuple[int, int] = (0, 0)):
+        self.manager = RecordingColorManager()
+        super().__init__(
+            BasicPattern(0, i, ...),
+            Data2Strategy(),
+            coordinate,
+            color_manager=self.manager,
+        )
+
+    @staticmethod
+    def getControlAssignmentPriorities() -> 'tuple[type[ControlSurface], ...]':
+        return tuple()
@@ -5,8 +5,10 @@ __all__ = [
     'DummyDeviceBasic2',
     'DummyDeviceContext',
     'DummyDeviceDrumPads',
+    'DummyDeviceLarge',
 ]
 
 from .basic import DummyDeviceAbstract, DummyDeviceBasic, DummyDeviceBasic2
 from .context import DummyDeviceContext
 from .drum_pad import DummyDeviceDrumPads
+from .large import DummyDeviceLarge
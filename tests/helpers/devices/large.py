@@ -0,0 +1,100 @@
+"""
+tests > helpers > devices > large
+
+A large dummy device, with many controls of many types, used for benchmarking
+the binding of controls
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+from typing import Optional
+from fl_classes import FlMidiMsg
+from control_surfaces.event_patterns import BasicPattern
+from control_surfaces.matchers import BasicControlMatcher, NoteMatcher
+from control_surfaces.value_strategies import Data2Strategy
+from control_surfaces import (
+    ControlSurface,
+    DrumPad,
+    Fader,
+    MasterFader,
+    Knob,
+    Encoder,
+    GenericFaderButton,
+    MuteButton,
+    SoloButton,
+    ArmButton,
+    SelectButton,
+    PlayButton,
+    StopButton,
+    LoopButton,
+    RecordButton,
+)
+from .basic import DummyDeviceAbstract
+
+__all__ = [
+    'DummyDeviceLarge',
+    'LARGE_DEVICE_TYPES',
+]
+
+# Types of controls on the large device, and the number of each
+LARGE_DEVICE_TYPES: list[tuple[type[ControlSurface], int]] = [
+    (Fader, 16),
+    (Knob, 16),
+    (Encoder, 16),
+    (GenericFaderButton, 16),
+    (MuteButton, 16),
+    (SoloButton, 16),
+    (ArmButton, 16),
+    (SelectButton, 16),
+    (MasterFader, 1),
+    (PlayButton, 1),
+    (StopButton, 1),
+    (LoopButton, 1),
+    (RecordButton, 1),
+]
+
+
+class DummyDeviceLarge(DummyDeviceAbstract):
+    """
+    A dummy device with 8x8 drum pads, as well as the controls given by
+    `LARGE_DEVICE_TYPES`, which are added in an interleaved order, similar to
+    a device with a control strip for each channel.
+    """
+
+    def __init__(self) -> None:
+        matcher = BasicControlMatcher()
+        matcher.addSubMatcher(NoteMatcher())
+        controls: list[ControlSurface] = [
+            DrumPad(
+                BasicPattern(0x10, r * 8 + c, ...),
+                Data2Strategy(),
+                (r, c),
+            )
+            for r in range(8)
+            for c in range(8)
+        ]
+        for i in range(max(n for _, n in LARGE_DEVICE_TYPES)):
+            for t_index, (t, n) in enumerate(LARGE_DEVICE_TYPES):
+                if i < n:
+                    controls.append(t(
+                        BasicPattern(0x20 + t_index, i, ...),
+                        Data2Strategy(),
+                        (0, i),
+                    ))
+        matcher.addControls(controls)
+        super().__init__(matcher)
+
+    @staticmethod
+    def getDrumPadSize() -> tuple[int, int]:
+        return (8, 8)
+
+    @classmethod
+    def create(
+        cls,
+        event: Optional[FlMidiMsg] = None,
+        id: Optional[str] = None,
+    ) -> 'DummyDeviceLarge':
+        return cls()
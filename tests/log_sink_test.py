@@ -0,0 +1,157 @@
+"""
+tests > log_sink_test
+
+Tests for the log sink, which writes log items to a file from a background
+thread
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import json
+import threading
+import time
+from typing import Callable
+from common import getContext
+from common.logger import log, verbosity
+from common.logger import log_sink
+from common.logger.log_item import LogItem
+from common.logger.log_sink import LogSink
+
+
+def makeItem(index: int, message: str = "test", args: tuple = ()) -> LogItem:
+    return LogItem("general", message, "", verbosity.INFO, index, args)
+
+
+class Blocker:
+    """Blocks the thread that first formats it, until it is released"""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.threads: list[threading.Thread] = []
+
+    def __str__(self) -> str:
+        self.threads.append(threading.current_thread())
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        return "blocker"
+
+
+class BlockingEncoder:
+    """Blocks the writer thread while it encodes its first item"""
+
+    def __init__(self, encode: Callable[[LogItem], str]) -> None:
+        self.encode = encode
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, item: LogItem) -> str:
+        self.started.set()
+        self.release.wait(5)
+        return self.encode(item)
+
+
+def test_items_written(tmp_path):
+    path = tmp_path.joinpath("log.jsonl")
+    sink = LogSink(str(path), 100, 1024 * 1024, 1)
+    for i in range(5):
+        sink.put(makeItem(i, "Message {}", (i,)))
+    sink.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["message"] for r in records] \
+        == [f"Message {i}" for i in range(5)]
+    assert records[0]["category"] == "general"
+    assert records[0]["verbosity"] == verbosity.INFO
+    assert sink.getCounters()["written"] == 5
+
+
+def test_items_dropped_when_full(tmp_path, monkeypatch):
+    path = tmp_path.joinpath("log.jsonl")
+    blocker = BlockingEncoder(LogSink._LogSink__encode)  # type: ignore
+    monkeypatch.setattr(LogSink, "_LogSink__encode", staticmethod(blocker))
+    sink = LogSink(str(path), 2, 1024 * 1024, 1)
+    sink.put(makeItem(0))
+    assert blocker.started.wait(5)
+    # The writer is busy, so the queue fills up
+    assert sink.put(makeItem(1))
+    assert sink.put(makeItem(2))
+    start = time.perf_counter()
+    assert not sink.put(makeItem(3))
+    # Dropping an item doesn't block
+    assert time.perf_counter() - start < 0.1
+    blocker.release.set()
+    sink.close()
+    counters = sink.getCounters()
+    assert counters["queued"] == 3
+    assert counters["dropped"] == 1
+    assert counters["written"] == 3
+    assert counters["max_depth"] == 2
+
+
+def test_objects_formatted_before_queued(tmp_path):
+    """Objects (which could belong to FL Studio) are formatted by the thread
+    that logs them, rather than the writer thread
+    """
+    path = tmp_path.joinpath("log.jsonl")
+    sink = LogSink(str(path), 100, 1024 * 1024, 1)
+    blocker = Blocker()
+    blocker.release.set()
+    values = [1]
+    sink.put(makeItem(0, "{} {}", (blocker, values)))
+    values.append(2)
+    sink.close()
+    assert blocker.threads == [threading.current_thread()]
+    [record] = path.read_text().splitlines()
+    assert json.loads(record)["message"] == "blocker [1]"
+
+
+def test_format_is_atomic():
+    """An item being formatted by one thread can be read from another"""
+    blocker = Blocker()
+    item = makeItem(0, "{}", (blocker,))
+    thread = threading.Thread(target=lambda: item.message)
+    thread.start()
+    assert blocker.started.wait(5)
+    # The other thread is part-way through formatting the item
+    assert item.message == "blocker"
+    blocker.release.set()
+    thread.join(5)
+    assert item.message == "blocker"
+
+
+def test_file_rotated(tmp_path):
+    path = tmp_path.joinpath("log.jsonl")
+    sink = LogSink(str(path), 100, 1, 2)
+    for i in range(3):
+        sink.put(makeItem(i))
+        # Wait for each item to be written, so that they are written in
+        # separate batches
+        while sink.getCounters()["written"] <= i:
+            time.sleep(0.01)
+    sink.close()
+    assert sink.getCounters()["rotations"] == 3
+    assert not path.exists()
+    assert tmp_path.joinpath("log.jsonl.1").exists()
+    assert tmp_path.joinpath("log.jsonl.2").exists()
+    assert not tmp_path.joinpath("log.jsonl.3").exists()
+
+
+def test_log_uses_sink(tmp_path, monkeypatch):
+    path = tmp_path.joinpath("log.jsonl")
+    monkeypatch.setattr(log_sink, "LOG_FILE", str(path))
+    getContext().settings.set("logger.sink.enabled", True)
+    try:
+        log("general", "Written to {}", verbosity.INFO, args=("file",))
+        log("general", "Discarded", verbosity.EVENT)
+    finally:
+        # Settings can be shared between contexts
+        getContext().settings.set("logger.sink.enabled", False)
+        log.close()
+    messages = [
+        json.loads(line)["message"] for line in path.read_text().splitlines()
+    ]
+    assert messages == ["Written to file"]
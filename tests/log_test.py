@@ -15,8 +15,12 @@ more details.
 
 import pytest
 
+from common import getContext
 from common.logger import log
 from common.logger import verbosity
+from common.logger.category_filter import CategoryFilter
+from common.logger.log_history import LogHistory
+from common.logger.log_item import LogItem
 
 
 def test_log_too_verbose(capsys: pytest.CaptureFixture):
@@ -42,3 +46,149 @@ def test_log_verbosity(capsys: pytest.CaptureFixture):
 #
 #     out: str = captured.out
 #     assert out.find("test\n") != -1
+
+
+class CountedStr:
+    """Counts the number of times it is converted to a string"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __str__(self) -> str:
+        self.count += 1
+        return "counted"
+
+
+def test_history_bounded():
+    history = LogHistory(3)
+    for i in range(5):
+        history.append(LogItem("", str(i), "", verbosity.INFO, i))
+    assert len(history) == 3
+    assert [item.message for item in history] == ["2", "3", "4"]
+    assert [item.message for item in reversed(history)] == ["4", "3", "2"]
+    assert history[4].message == "4"
+    with pytest.raises(IndexError):
+        history[1]
+    with pytest.raises(IndexError):
+        history[5]
+
+
+def test_history_resized():
+    history = LogHistory(4)
+    for i in range(6):
+        history.append(LogItem("", str(i), "", verbosity.INFO, i))
+    history.setCapacity(2)
+    assert [item.message for item in history] == ["4", "5"]
+    history.setCapacity(3)
+    history.append(LogItem("", "6", "", verbosity.INFO, 6))
+    assert [item.message for item in history] == ["4", "5", "6"]
+
+
+def test_log_uses_max_history():
+    getContext().settings.set("logger.max_history", 5)
+    try:
+        for _ in range(10):
+            log("", "test", verbosity.INFO)
+        assert len(log) == 5
+    finally:
+        # Settings can be shared between contexts
+        getContext().settings.set("logger.max_history", 10000)
+
+
+def test_formatting_deferred(capsys: pytest.CaptureFixture):
+    arg = CountedStr()
+    log("", "Message: {}", verbosity.INFO, "Details: {}", args=(arg,))
+    assert capsys.readouterr().out == ""
+    assert arg.count == 0
+    log.recall(number=1)
+    assert "Message: counted" in capsys.readouterr().out
+    # The message and details are formatted together, and are kept
+    assert arg.count == 2
+    log.inspect(log._history.getTotal() - 1)
+    assert "Details: counted" in capsys.readouterr().out
+    assert arg.count == 2
+
+
+def test_inspect_newest(capsys: pytest.CaptureFixture):
+    log("", "older", verbosity.INFO)
+    log("", "newest", verbosity.INFO)
+    capsys.readouterr()
+    log.inspect(-1)
+    assert "newest" in capsys.readouterr().out
+
+
+def test_inspect_discarded(capsys: pytest.CaptureFixture):
+    log("", "test", verbosity.INFO)
+    capsys.readouterr()
+    log.inspect(-log._history.getTotal() - 1)
+    assert "isn't available" in capsys.readouterr().out
+
+
+def test_category_boundary():
+    f = CategoryFilter(
+        ["device.event"],
+        verbosity.WARNING,
+        verbosity.INFO,
+        verbosity.ERROR,
+        verbosity.NOTE,
+    )
+    assert f.getThreshold("device.event") == verbosity.INFO
+    assert f.getThreshold("device.event.in") == verbosity.INFO
+    assert f.getThreshold("device.eventful") == verbosity.WARNING
+    assert f.getThreshold("device") == verbosity.WARNING
+    # Categories outside the hierarchy are compiled when first used
+    assert f.getThreshold("device.event.custom") == verbosity.INFO
+
+
+def test_filter_updated_with_settings(capsys: pytest.CaptureFixture):
+    settings = getContext().settings
+    watched = settings.get("logger.watched_categories")
+    log("device.event.in", "before", verbosity.INFO)
+    assert capsys.readouterr().out == ""
+    settings.set("logger.watched_categories", ["device.event"])
+    try:
+        log("device.event.in", "after", verbosity.INFO)
+        assert "after" in capsys.readouterr().out
+        log("device.eventful", "boundary", verbosity.INFO)
+        assert capsys.readouterr().out == ""
+    finally:
+        # Settings can be shared between contexts
+        settings.set("logger.watched_categories", watched)
+
+
+def test_recall_category_boundary(capsys: pytest.CaptureFixture):
+    log("device.event.in", "inside", verbosity.INFO)
+    log("device.eventful", "outside", verbosity.INFO)
+    capsys.readouterr()
+    log.recall("device.event", number=2)
+    out = capsys.readouterr().out
+    assert "inside" in out
+    assert "outside" not in out
+
+
+def test_category_index():
+    history = LogHistory(4)
+    categories = ["a.b", "a.c", "a.b.d", "e", "a.b"]
+    for i, c in enumerate(categories):
+        history.append(LogItem(c, str(i), "", verbosity.INFO, i))
+    # The first item was discarded
+    assert [i.message for i in history.iterCategory("a")] == ["4", "2", "1"]
+    assert [i.message for i in history.iterCategory("a.b")] == ["4", "2"]
+    assert [i.message for i in history.iterCategory("a.b.d")] == ["2"]
+    assert [i.message for i in history.iterCategory("")] \
+        == ["4", "3", "2", "1"]
+    assert list(history.iterCategory("f")) == []
+    history.setCapacity(2)
+    assert [i.message for i in history.iterCategory("a")] == ["4"]
+
+
+def test_recall_newest(capsys: pytest.CaptureFixture):
+    for i in range(5):
+        log("device.event.in", f"recalled {i}", verbosity.INFO)
+        log("general", "other", verbosity.INFO)
+    capsys.readouterr()
+    log.recall("device.event", number=2)
+    out = capsys.readouterr().out
+    assert out.index("recalled 3") < out.index("recalled 4")
+    assert "recalled 2" not in out
+    assert "other" not in out
@@ -0,0 +1,92 @@
+"""
+tests > palette_test
+
+Tests for color palettes, ensuring that the lookup tables agree with the
+results of finding the closest color directly.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+import pytest
+from common.types import Color, ColorPalette, GrayscalePalette
+from devices.novation.launchkey.incontrol.colors import mk2, mk3, grayscale
+
+
+PALETTES = [mk2.COLORS, mk3.COLORS]
+
+
+def cellColors(bits: int, step: int = 1):
+    """Generate the center color of every cell for the given number of bits
+    """
+    shift = 8 - bits
+    half = (1 << shift) >> 1
+    for r in range(0, 1 << bits, step):
+        for g in range(0, 1 << bits, step):
+            for b in range(0, 1 << bits, step):
+                yield Color.fromRgb(
+                    (r << shift) + half,
+                    (g << shift) + half,
+                    (b << shift) + half,
+                )
+
+
+@pytest.mark.parametrize('palette', PALETTES)
+def test_exact_matches(palette: ColorPalette):
+    """Colors in the palette should map to their own values"""
+    for c in palette.colors:
+        assert palette.closestValue(c) == palette.colors[c]
+
+
+@pytest.mark.parametrize('palette', PALETTES)
+def test_table_matches_closest(palette: ColorPalette):
+    """Every cell in the table should agree with Color.closest()"""
+    coarse = ColorPalette(palette.colors, bits=3)
+    options = list(palette.colors.keys())
+    for c in cellColors(3):
+        assert coarse.closestValue(c) == palette.colors[c.closest(options)]
+
+
+@pytest.mark.parametrize('palette', PALETTES)
+def test_full_table_sample(palette: ColorPalette):
+    """A sample of cells in the full-sized table should agree with
+    Color.closest()
+    """
+    options = list(palette.colors.keys())
+    for c in cellColors(palette.bits, 5):
+        assert palette.closestValue(c) == palette.colors[c.closest(options)]
+
+
+@pytest.mark.parametrize('palette', PALETTES)
+def test_quantized_cell(palette: ColorPalette):
+    """All colors within a cell should give the value of its center"""
+    c = Color.fromRgb(100, 30, 200)
+    cell = palette.quantize(c)
+    assert palette.closestValue(c) == palette.closestValue(cell)
+
+
+def test_empty_palette():
+    with pytest.raises(ValueError):
+        ColorPalette({})
+    with pytest.raises(ValueError):
+        GrayscalePalette({})
+
+
+def test_grayscale_matches_closest():
+    palette = grayscale.COLORS
+    options = list(palette.colors.keys())
+    for level in range(256):
+        c = Color.fromGrayscale(level / 255)
+        assert palette.closestValue(c) \
+            == palette.colors[c.closestGrayscale(options)]
+
+
+def test_grayscale_out_of_range():
+    palette = grayscale.COLORS
+    assert palette.closestValue(Color.fromGrayscale(-0.5)) \
+        == palette.closestValue(Color.fromGrayscale(0.0))
+    assert palette.closestValue(Color.fromGrayscale(1.5)) \
+        == palette.closestValue(Color.fromGrayscale(1.0))
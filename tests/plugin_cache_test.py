@@ -0,0 +1,145 @@
+"""
+tests > plugin_cache_test
+
+Tests for the least-recently-used cache of instantiated plugins
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.extension_manager.plugin_cache import PluginCache
+from common.profiler import ProfilerManager
+
+
+class FakePlugin:
+    """Plugin with a fixed memory usage, which records whether it was
+    evicted
+    """
+    def __init__(self, size: int = 1024) -> None:
+        self.size = size
+        self.evicted = False
+
+    def estimateMemory(self) -> int:
+        return self.size
+
+    def onEvict(self) -> None:
+        self.evicted = True
+
+
+def setLimits(max_plugins: int, max_memory: int) -> None:
+    settings = getContext().settings
+    settings.set("advanced.plugin_cache.max_plugins", max_plugins)
+    settings.set("advanced.plugin_cache.max_memory", max_memory)
+
+
+@pytest.fixture(autouse=True)
+def restore_limits():
+    settings = getContext().settings
+    max_plugins = settings.get("advanced.plugin_cache.max_plugins")
+    max_memory = settings.get("advanced.plugin_cache.max_memory")
+    yield
+    # Settings can be shared between contexts
+    setLimits(max_plugins, max_memory)
+
+
+def test_evict_least_recently_used():
+    setLimits(2, 1000)
+    cache: PluginCache = PluginCache("test.cache")
+    a, b, c = FakePlugin(), FakePlugin(), FakePlugin()
+    cache.add("a", a)
+    cache.add("b", b)
+    # Use a, so that b is the least recently used
+    assert cache.get("a") is a
+    cache.add("c", c)
+    assert cache.keys() == ["a", "c"]
+    assert b.evicted
+    assert not a.evicted
+
+
+def test_memory_limit():
+    setLimits(100, 3)
+    cache: PluginCache = PluginCache("test.cache")
+    plugs = [FakePlugin(1024) for _ in range(5)]
+    for i, p in enumerate(plugs):
+        cache.add(i, p)
+    assert cache.keys() == [2, 3, 4]
+    assert cache.getMemory() == 3 * 1024
+    assert cache.getEvictions() == 2
+
+
+def test_newest_not_evicted():
+    """Even if a plugin is too large for the cache, it is kept, since it is
+    being used
+    """
+    setLimits(100, 1)
+    cache: PluginCache = PluginCache("test.cache")
+    a, b = FakePlugin(4096), FakePlugin(4096)
+    cache.add("a", a)
+    cache.add("b", b)
+    assert cache.keys() == ["b"]
+    assert cache.peek("b") is b
+
+
+def test_has_space():
+    setLimits(2, 1000)
+    cache: PluginCache = PluginCache("test.cache")
+    cache.add("a", FakePlugin())
+    assert cache.hasSpace()
+    cache.add("b", FakePlugin())
+    assert not cache.hasSpace()
+
+
+def test_peek_does_not_use():
+    setLimits(2, 1000)
+    cache: PluginCache = PluginCache("test.cache")
+    cache.add("a", FakePlugin())
+    cache.add("b", FakePlugin())
+    cache.peek("a")
+    cache.add("c", FakePlugin())
+    assert cache.keys() == ["b", "c"]
+
+
+def test_counters():
+    setLimits(1, 1000)
+    profiler = ProfilerManager(False)
+    getContext().profiler = profiler
+    try:
+        cache: PluginCache = PluginCache("test.cache")
+        cache.get("a")
+        cache.add("a", FakePlugin())
+        cache.get("a")
+        cache.add("b", FakePlugin())
+        counters = profiler.getCounters()
+        assert counters["test.cache.hits"] == 1
+        assert counters["test.cache.misses"] == 1
+        assert counters["test.cache.evictions"] == 1
+    finally:
+        getContext().profiler = None
+
+
+def test_standard_plugins_evicted():
+    """Standard plugins are evicted, and recreated when used again"""
+    setLimits(2, 100_000)
+    with FlContext():
+        device = ExtensionManager.devices.getById("Akai.Mpk.Mini.Mk3")
+        getContext().registerDevice(device)
+        ExtensionManager.resetPlugins()
+        try:
+            fpc = ExtensionManager.plugins.get("FPC", device)
+            ExtensionManager.plugins.get("Vital", device)
+            ExtensionManager.plugins.get("FLEX", device)
+            assert not ExtensionManager.plugins.isInstantiated("FPC")
+            assert len(ExtensionManager.plugins.instantiated()) == 2
+            # Preloading doesn't evict plugins that have been used
+            assert not ExtensionManager.plugins.preload("FPC", device)
+            assert ExtensionManager.plugins.isInstantiated("Vital")
+            # Using it again creates a new instance
+            assert ExtensionManager.plugins.get("FPC", device) is not fpc
+        finally:
+            ExtensionManager.resetPlugins()
+    unsafeResetContext()
@@ -0,0 +1,160 @@
+"""
+tests > plugin_prewarm_test
+
+Tests for preparing plugins ahead of time during idle ticks
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.extension_manager.prewarm import (
+    PluginPrewarmer,
+    OVER_BUDGET_TICKS,
+)
+from common.plug_indexes import FlIndex, GeneratorIndex, WindowIndex
+
+# Device with enough controls for all plugins to bind to
+DEVICE = "Akai.Mpk.Mini.Mk3"
+
+
+class NamedGenerator(GeneratorIndex):
+    """Generator index with a fixed plugin name"""
+    def __init__(self, name: str) -> None:
+        super().__init__(0)
+        self.__name = name
+
+    def isValid(self) -> bool:
+        return True
+
+    def getName(self) -> str:
+        return self.__name
+
+
+@pytest.fixture
+def prewarmer(monkeypatch):
+    """Create a prewarmer, with an empty activity history"""
+    history: list[FlIndex] = []
+    with FlContext():
+        device = ExtensionManager.devices.getById(DEVICE)
+        getContext().registerDevice(device)
+        ExtensionManager.resetPlugins()
+        monkeypatch.setattr(
+            getContext().activity, "getHistory", lambda: list(history)
+        )
+        p = PluginPrewarmer(device)
+        p.history = history  # type: ignore
+        yield p
+        ExtensionManager.resetPlugins()
+    unsafeResetContext()
+
+
+def setBudget(budget: float) -> None:
+    getContext().settings.set("advanced.prewarm_budget", budget)
+
+
+@pytest.fixture(autouse=True)
+def restore_budget():
+    budget = getContext().settings.get("advanced.prewarm_budget")
+    yield
+    # Settings can be shared between contexts
+    setBudget(budget)
+
+
+def test_history_plugins(prewarmer):
+    """Plugins in the activity history are instantiated"""
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    assert ExtensionManager.plugins.isInstantiated("FPC")
+
+
+def test_history_windows(prewarmer):
+    prewarmer.history.append(WindowIndex.CHANNEL_RACK)
+    setBudget(1000)
+    prewarmer.tick(False)
+    assert ExtensionManager.windows.isInstantiated(WindowIndex.CHANNEL_RACK)
+
+
+def test_not_when_changed(prewarmer):
+    """Plugins aren't instantiated on ticks where the active plugin changed"""
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(True)
+    assert not ExtensionManager.plugins.isInstantiated("FPC")
+
+
+def test_disabled(prewarmer):
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(0)
+    prewarmer.tick(False)
+    assert not ExtensionManager.plugins.isInstantiated("FPC")
+
+
+def test_unknown_plugin(prewarmer):
+    """Unknown plugins don't cause the fallback plugin to be instantiated"""
+    prewarmer.history.append(NamedGenerator("Not a real plugin"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    assert ExtensionManager.plugins.getFallback() is None
+
+
+def test_budget(prewarmer):
+    """Plugins that are expected to take longer than the remaining budget are
+    left until a later tick
+    """
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    prewarmer.history.append(NamedGenerator("Vital"))
+    # History changed
+    prewarmer.tick(True)
+    setBudget(prewarmer.getAverageCost() / 2)
+    prewarmer.tick(False)
+    assert not ExtensionManager.plugins.isInstantiated("Vital")
+    setBudget(1000)
+    prewarmer.tick(False)
+    assert ExtensionManager.plugins.isInstantiated("Vital")
+
+
+def test_over_budget(prewarmer):
+    """Plugins that are expected to take longer than the whole budget are
+    still instantiated occasionally
+    """
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    prewarmer.history.append(NamedGenerator("Vital"))
+    prewarmer.tick(True)
+    setBudget(prewarmer.getAverageCost() / 2)
+    for _ in range(OVER_BUDGET_TICKS):
+        prewarmer.tick(False)
+    assert not ExtensionManager.plugins.isInstantiated("Vital")
+    prewarmer.tick(False)
+    assert ExtensionManager.plugins.isInstantiated("Vital")
+
+
+def test_unknown_cost_after_failure(prewarmer):
+    """Candidates that don't instantiate a plugin don't use up the tick's
+    allowance for plugins with an unknown cost
+    """
+    prewarmer.history.append(NamedGenerator("Not a real plugin"))
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    assert ExtensionManager.plugins.isInstantiated("FPC")
+
+
+def test_prewarmed_plugin_used(prewarmer):
+    """When a prepared plugin is focused, the same instance is used"""
+    prewarmer.history.append(NamedGenerator("FPC"))
+    setBudget(1000)
+    prewarmer.tick(False)
+    [plug] = ExtensionManager.plugins.instantiated()
+    assert ExtensionManager.plugins.get(
+        "FPC", getContext().getDevice()
+    ) is plug
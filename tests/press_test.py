@@ -0,0 +1,124 @@
+"""
+tests > press_test
+
+Tests for the press plugin, which colors controls when they are tweaked
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+
+from fl_classes import FlMidiMsg
+from common.plug_indexes import WindowIndex
+from common.types import Color
+from control_surfaces import Button, Fader, Note
+from devices import DeviceShadow
+from plugs.special import pressed
+from plugs.special.pressed import Press, FADE_TIME
+from tests.helpers.devices import DummyDeviceBasic
+
+
+def processEvent(device: DummyDeviceBasic, press: Press, event: FlMidiMsg):
+    mapping = device.matchEvent(event)
+    assert mapping is not None
+    press.processEvent(mapping, WindowIndex.MIXER)
+
+
+def test_binds_all_controls():
+    """All matching controls are bound, including ones of different
+    subclasses
+    """
+    s = DeviceShadow(DummyDeviceBasic())
+    Press(s)
+    for t in [Note, Button, Fader]:
+        assert s.getNumControlMatches(
+            t,  # type: ignore
+            False,
+            one_type=False,
+        ) == 0
+
+
+def test_idle_controls_inactive():
+    d = DummyDeviceBasic()
+    p = Press(DeviceShadow(d))
+    p.tick()
+    assert p._fade_ends == {}
+    assert p._held_buttons == {}
+    assert p._held_velocities == {}
+
+
+def test_fader_fades(monkeypatch):
+    """Tweaked faders should light up, then stop being active once they fade
+    """
+    now = 1000.0
+    monkeypatch.setattr(pressed, 'time', lambda: now)
+    monkeypatch.setattr(
+        'control_surfaces.controls.control_surface.time', lambda: now)
+    d = DummyDeviceBasic()
+    p = Press(DeviceShadow(d))
+    processEvent(d, p, FlMidiMsg(1, 2, 64))
+    p.tick()
+    (shadow,) = p._fade_ends.keys()
+    assert shadow.getControl() is d.faders[2]
+    assert shadow.connected
+    assert shadow.color == Color.WHITE
+
+    now += FADE_TIME / 2
+    p.tick()
+    assert shadow.connected
+    assert shadow.color != Color.WHITE
+
+    now += FADE_TIME
+    p.tick()
+    assert p._fade_ends == {}
+    assert p._fading == []
+    assert not shadow.connected
+
+
+def test_retweaked_fader_stays_active(monkeypatch):
+    """Tweaking a fader again should extend its fade"""
+    now = 1000.0
+    monkeypatch.setattr(pressed, 'time', lambda: now)
+    monkeypatch.setattr(
+        'control_surfaces.controls.control_surface.time', lambda: now)
+    d = DummyDeviceBasic()
+    p = Press(DeviceShadow(d))
+    processEvent(d, p, FlMidiMsg(1, 0, 64))
+    p.tick()
+    now += FADE_TIME * 0.9
+    processEvent(d, p, FlMidiMsg(1, 0, 65))
+    p.tick()
+    now += FADE_TIME * 0.5
+    p.tick()
+    (shadow,) = p._fade_ends.keys()
+    assert shadow.connected
+
+
+def test_button_held():
+    d = DummyDeviceBasic()
+    p = Press(DeviceShadow(d))
+    processEvent(d, p, FlMidiMsg(0, 0, 127))
+    p.tick()
+    (shadow,) = p._held_buttons.keys()
+    assert shadow.connected
+    assert shadow.color == Color.WHITE
+    processEvent(d, p, FlMidiMsg(0, 0, 0))
+    p.tick()
+    assert p._held_buttons == {}
+    assert not shadow.connected
+
+
+def test_note_velocity():
+    d = DummyDeviceBasic()
+    p = Press(DeviceShadow(d))
+    processEvent(d, p, FlMidiMsg(0x90, 60, 127))
+    p.tick()
+    (shadow,) = p._held_velocities.keys()
+    assert shadow.connected
+    assert shadow.color == Color.WHITE
+    processEvent(d, p, FlMidiMsg(0x80, 60, 0))
+    p.tick()
+    assert p._held_velocities == {}
+    assert not shadow.connected
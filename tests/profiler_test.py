@@ -14,8 +14,16 @@ more details.
 """
 import pytest
 import time
-from common import getContext, unsafeResetContext
-from common.profiler import ProfilerContext, profilerDecoration
+from fl_model import FlContext
+from common import getContext, unsafeResetContext, ExtensionManager
+from common.profiler import (
+    ProfilerContext,
+    ProfilerManager,
+    profilerDecoration,
+)
+from common.profiler.histogram import LatencyHistogram
+from common.states import MainState
+from common.util.console_helpers import latency
 from tests.helpers import floatApproxEqMagnitude
 from tests.helpers.performance import perfTestsSkipped
 
@@ -88,3 +96,228 @@ def test_maxes():
             time.sleep(t)
     res = getContext().profiler.getMaxes()  # type: ignore
     assert floatApproxEqMagnitude(50.0, res["test"], 1)
+
+
+def profileNested(profiler: ProfilerManager, number: int) -> None:
+    """Open `number` top-level profiles, each containing a nested profile"""
+    for _ in range(number):
+        profiler.openProfile("outer")
+        profiler.openProfile("inner")
+        profiler.closeProfile()
+        profiler.closeProfile()
+
+
+def test_sample_rate_scaled():
+    profiler = ProfilerManager(False, sample_rate=4)
+    profileNested(profiler, 8)
+    # Only 2 of the profiles were recorded
+    assert profiler._number == {"outer": 2, "outer.inner": 2}
+    assert profiler.getNumbers() == {"outer": 8, "outer.inner": 8}
+    totals = profiler.getTotals()
+    assert totals["outer"] == profiler._totals["outer"] * 4
+
+
+def test_sample_rate_per_name():
+    """Each type of top-level profile is sampled independently"""
+    profiler = ProfilerManager(False, sample_rate=2)
+    for _ in range(2):
+        for name in ["tick", "processEvent"]:
+            profiler.openProfile(name)
+            profiler.closeProfile()
+    assert profiler._number == {"tick": 1, "processEvent": 1}
+
+
+def test_quota():
+    """Once the time quota is used, profiles aren't sampled until the next
+    second
+    """
+    profiler = ProfilerManager(False, quota=1e-6)
+    profileNested(profiler, 5)
+    assert profiler._number == {"outer": 1, "outer.inner": 1}
+    assert profiler.getNumbers() == {"outer": 5, "outer.inner": 5}
+
+
+def test_tracing_disables_sampling(capsys: pytest.CaptureFixture):
+    profiler = ProfilerManager(True, sample_rate=4)
+    profileNested(profiler, 4)
+    assert profiler.getNumbers() == {"outer": 4, "outer.inner": 4}
+    assert capsys.readouterr().out.count("+outer") == 4
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    assert h.getPercentile(50) == 0.0
+    # 1 to 1000 us
+    for i in range(1, 1001):
+        h.record(i * 1000)
+    assert len(h) == 1000
+    for p, expected in [(50, 0.5), (90, 0.9), (99, 0.99), (99.9, 0.999)]:
+        assert abs(h.getPercentile(p) - expected) / expected <= 0.125
+    h.reset()
+    assert len(h) == 0
+    assert h.getPercentile(99) == 0.0
+
+
+def test_histogram_extremes():
+    h = LatencyHistogram()
+    h.record(0)
+    h.record(3)
+    h.record(2 ** 50)
+    assert h.getPercentile(0) < 0.000001
+    assert h.getPercentile(100) > 1000
+
+
+def test_inspect_latency(capsys: pytest.CaptureFixture):
+    profiler = ProfilerManager(False)
+    for name, ns in [("fast", 1_000), ("slow", 5_000_000)]:
+        for _ in range(10):
+            profiler.openProfile(name)
+            profiler.closeProfile()
+            # Override the measured time with a known time
+            profiler._histograms[name].reset()
+        for _ in range(10):
+            profiler._histograms[name].record(ns)
+    assert profiler.getPercentile("slow", 99) == pytest.approx(5, rel=0.125)
+    profiler.inspectLatency()
+    out = capsys.readouterr().out
+    # Worst profiles first
+    assert out.index("slow") < out.index("fast")
+    # The windows were reset
+    assert profiler.getPercentile("slow", 99) == 0.0
+    # But the totals weren't
+    assert profiler.getNumbers()["slow"] == 10
+
+
+def test_latency_helper(capsys: pytest.CaptureFixture):
+    unsafeResetContext()
+    latency()
+    assert "disabled" in capsys.readouterr().out
+    getContext().enableProfiler()
+    with ProfilerContext("test"):
+        pass
+    latency()
+    assert "test" in capsys.readouterr().out
+    unsafeResetContext()
+
+
+@profilerDecoration("module-function")
+def profiledFunction():
+    pass
+
+
+def otherDecorator(func):
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class Profiled:
+    @profilerDecoration("method")
+    def method(self):
+        pass
+
+    @otherDecorator
+    @profilerDecoration("inner")
+    def inner(self):
+        pass
+
+
+class ProfiledSubclass(Profiled):
+    pass
+
+
+def test_instrumentation_disabled():
+    """When profiling is disabled, instrumentation does nothing"""
+    unsafeResetContext()
+    assert getContext().profiler is None
+    assert ProfilerContext("a") is ProfilerContext("b")
+    assert not hasattr(Profiled.__dict__["method"], "__wrapped__")
+
+
+def test_instrumentation_rebuilt():
+    """Methods are swapped for their instrumented versions on their class
+    once profiling is enabled
+    """
+    unsafeResetContext()
+    original = Profiled.__dict__["method"]
+    try:
+        getContext().enableProfiler()
+        assert Profiled.__dict__["method"].__wrapped__ is original
+        assert ProfilerContext("a") is not ProfilerContext("a")
+        Profiled().method()
+        assert getContext().profiler.getNumbers() == {  # type: ignore
+            "method": 1
+        }
+    finally:
+        unsafeResetContext()
+    assert Profiled.__dict__["method"] is original
+
+
+def test_instrumentation_reset():
+    """Resetting the context disables the previous context's
+    instrumentation
+    """
+    unsafeResetContext()
+    getContext().enableProfiler()
+    unsafeResetContext()
+    assert getContext().profiler is None
+    assert ProfilerContext("a") is ProfilerContext("b")
+    assert not hasattr(Profiled.__dict__["method"], "__wrapped__")
+
+
+def test_instrumentation_functions():
+    """Functions and methods wrapped by other decorators are profiled once
+    profiling is enabled
+    """
+    unsafeResetContext()
+    obj = Profiled()
+    profiledFunction()
+    obj.inner()
+    try:
+        getContext().enableProfiler()
+        profiledFunction()
+        obj.inner()
+        assert getContext().profiler.getNumbers() == {  # type: ignore
+            "module-function": 1,
+            "inner": 1,
+        }
+    finally:
+        unsafeResetContext()
+
+
+def test_instrumentation_subclass():
+    """Subclasses use the swapped version of inherited methods"""
+    unsafeResetContext()
+    try:
+        getContext().enableProfiler()
+        ProfiledSubclass().method()
+        assert getContext().profiler.getNumbers() == {  # type: ignore
+            "method": 1
+        }
+    finally:
+        unsafeResetContext()
+
+
+def test_profiling_setting_applied():
+    """Changing the profiling setting enables the profiler on the next tick
+    """
+    unsafeResetContext()
+    settings = getContext().settings
+    try:
+        with FlContext():
+            device = ExtensionManager.devices.getById("Akai.Mpk.Mini.Mk3")
+            getContext().registerDevice(device)
+            getContext().state = MainState(device)
+            settings.set("debug.profiling", True)
+            getContext().tick()
+            profiler = getContext().profiler
+            assert profiler is not None
+            # Profiling starts from the next tick
+            getContext().tick()
+            assert profiler.getNumbers()["tick"] == 1
+            settings.set("debug.profiling", False)
+            getContext().tick()
+            assert getContext().profiler is None
+    finally:
+        settings.set("debug.profiling", False)
+        unsafeResetContext()
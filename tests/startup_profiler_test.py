@@ -0,0 +1,113 @@
+"""
+tests > startup_profiler_test
+
+Tests for the startup profiler
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import sys
+import importlib
+import pytest
+import startup_profiler
+from startup_profiler import StartupProfiler
+
+
+@pytest.fixture
+def profiler():
+    p = StartupProfiler()
+    yield p
+    p.finish()
+
+
+def test_phases(profiler: StartupProfiler):
+    """Phases are recorded in the order they start, with their depth"""
+    profiler.beginPhase("outer")
+    profiler.beginPhase("inner")
+    profiler.endPhase()
+    profiler.mark("event")
+    profiler.endPhase()
+    profiler.beginPhase("next")
+    profiler.endPhase()
+    phases = profiler.getPhases()
+    assert [(name, depth) for name, _, _, depth in phases] == [
+        ("outer", 0),
+        ("inner", 1),
+        ("event", 1),
+        ("next", 0),
+    ]
+    # Phases contain their children
+    _, outer_start, outer_time, _ = phases[0]
+    _, inner_start, inner_time, _ = phases[1]
+    assert outer_start <= inner_start
+    assert inner_start + inner_time <= outer_start + outer_time
+
+
+def test_finish_closes_phases(profiler: StartupProfiler):
+    profiler.beginPhase("unfinished")
+    profiler.finish()
+    assert not profiler.active
+    # Phases after finishing are ignored
+    profiler.beginPhase("ignored")
+    assert [p[0] for p in profiler.getPhases()] == ["unfinished"]
+
+
+def test_import_times(profiler: StartupProfiler, tmp_path, monkeypatch):
+    """Imports are recorded with their self time and total time"""
+    tmp_path.joinpath("startup_test_child.py").write_text(
+        "import time\ntime.sleep(0.05)\n"
+    )
+    tmp_path.joinpath("startup_test_parent.py").write_text(
+        "import time\nimport startup_test_child\ntime.sleep(0.01)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler.installImportHook()
+    try:
+        importlib.import_module("startup_test_parent")
+    finally:
+        profiler.removeImportHook()
+        sys.modules.pop("startup_test_parent", None)
+        sys.modules.pop("startup_test_child", None)
+    imports = {name: (s, t) for name, s, t in profiler.getImports()}
+    parent_self, parent_total = imports["startup_test_parent"]
+    child_self, child_total = imports["startup_test_child"]
+    assert child_self >= 50
+    assert parent_self >= 10
+    assert parent_total == pytest.approx(parent_self + child_total)
+    # Sorted by self time
+    assert [name for name, _, _ in profiler.getImports()].index(
+        "startup_test_child"
+    ) < [name for name, _, _ in profiler.getImports()].index(
+        "startup_test_parent"
+    )
+
+
+def test_hook_removed(profiler: StartupProfiler):
+    profiler.installImportHook()
+    hooks = len(sys.meta_path)
+    profiler.finish()
+    assert len(sys.meta_path) == hooks - 1
+
+
+def test_write(profiler: StartupProfiler, tmp_path):
+    profiler.beginPhase("my-phase")
+    profiler.finish()
+    path = tmp_path.joinpath("profile.txt")
+    profiler.write(str(path))
+    contents = path.read_text()
+    assert "Total startup time" in contents
+    assert "my-phase" in contents
+
+
+def test_inactive_without_begin():
+    """When startup profiling wasn't started (eg during tests), the module
+    functions do nothing
+    """
+    assert startup_profiler.getProfiler() is None
+    assert not startup_profiler.isActive()
+    with startup_profiler.phase("nothing"):
+        startup_profiler.mark("nothing")
+    assert startup_profiler.finish() is None
@@ -0,0 +1,74 @@
+"""
+tests > trace_test
+
+Tests for exporting traces from the profiler
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import json
+import pytest
+from fl_classes import FlMidiMsg
+from fl_model import FlContext
+from common import getContext, ExtensionManager, unsafeResetContext
+from common.profiler import ProfilerManager
+from common.profiler.trace import TraceBuffer
+from common.states import MainState
+
+
+def test_trace_buffer_bounded():
+    buffer = TraceBuffer(2, 0)
+    for i in range(3):
+        buffer.record("span", "span", "span", i + 1, i * 1000, 500)
+    assert len(buffer) == 2
+    assert buffer.getDropped() == 1
+    events = buffer.getEvents()
+    assert [e["args"]["id"] for e in events] == ["span#2", "span#3"]
+    assert events[0]["ts"] == 1.0
+    assert events[0]["dur"] == 0.5
+
+
+def test_export_requires_recording():
+    with pytest.raises(ValueError):
+        ProfilerManager(False).exportTrace()
+
+
+def test_trace_exported(tmp_path):
+    """Ticks and events of a device are exported as nested spans"""
+    path = tmp_path.joinpath("trace.json")
+    with FlContext():
+        device = ExtensionManager.devices.getById("Akai.Mpk.Mini.Mk3")
+        getContext().registerDevice(device)
+        state = MainState(device)
+        getContext().state = state
+        state.initialize()
+        getContext().enableProfiler()
+        profiler = getContext().profiler
+        assert profiler is not None
+        profiler.startTrace()
+        for _ in range(2):
+            getContext().tick()
+            getContext().processEvent(FlMidiMsg(0xB0, 0x46, 0x40))
+        profiler.exportTrace(str(path))
+    unsafeResetContext()
+
+    trace = json.loads(path.read_text())
+    events = trace["traceEvents"]
+    assert trace["otherData"]["dropped_spans"] == 0
+    assert all(e["ph"] == "X" for e in events)
+    # Events are ordered by time
+    assert [e["ts"] for e in events] == sorted(e["ts"] for e in events)
+    roots = [e for e in events if e["args"]["path"] == e["name"]]
+    assert [e["args"]["id"] for e in roots] \
+        == ["tick#1", "processEvent#1", "tick#2", "processEvent#2"]
+    # Each span is within the top-level span with the same ID
+    by_id = {e["args"]["id"]: e for e in roots}
+    for e in events:
+        root = by_id[e["args"]["id"]]
+        assert e["cat"] == root["name"]
+        assert root["ts"] <= e["ts"]
+        assert e["ts"] + e["dur"] <= root["ts"] + root["dur"] + 0.001
+    assert len(events) > len(roots)
@@ -0,0 +1,126 @@
+"""
+tests > track_cache_test
+
+Tests for the track property cache, ensuring that track properties are only
+read from FL Studio once per tick.
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import pytest
+import mixer
+import channels
+from common import getContext, unsafeResetContext
+from common.tracks import MixerTrack, Channel
+from common.types import Color
+
+
+@pytest.fixture
+def mute_reads(monkeypatch):
+    """Count the number of times the mute state of a mixer track is read"""
+    unsafeResetContext()
+    reads: list[int] = []
+
+    def isTrackMuted(index: int) -> bool:
+        reads.append(index)
+        return False
+
+    monkeypatch.setattr(mixer, 'isTrackMuted', isTrackMuted)
+    yield reads
+
+
+def test_reads_outside_frame_not_cached(mute_reads):
+    track = MixerTrack(1)
+    track.mute
+    track.mute
+    assert mute_reads == [1, 1]
+
+
+def test_reads_in_frame_cached(mute_reads):
+    cache = getContext().track_cache
+    cache.beginFrame()
+    track = MixerTrack(1)
+    track.mute
+    MixerTrack(1).mute
+    MixerTrack(2).mute
+    cache.endFrame()
+    assert mute_reads == [1, 2]
+
+
+def test_cache_cleared_between_frames(mute_reads):
+    cache = getContext().track_cache
+    for _ in range(3):
+        cache.beginFrame()
+        MixerTrack(1).mute
+        MixerTrack(1).mute
+        cache.endFrame()
+    assert mute_reads == [1, 1, 1]
+
+
+def test_toggle_invalidates(mute_reads, monkeypatch):
+    monkeypatch.setattr(mixer, 'muteTrack', lambda index: None)
+    cache = getContext().track_cache
+    cache.beginFrame()
+    track = MixerTrack(1)
+    track.mute
+    track.muteToggle()
+    track.mute
+    cache.endFrame()
+    assert mute_reads == [1, 1]
+
+
+def test_write_through(monkeypatch):
+    unsafeResetContext()
+    colors = {3: 0x123456}
+    monkeypatch.setattr(
+        mixer, 'getTrackColor', lambda index: colors[index])
+    monkeypatch.setattr(
+        mixer,
+        'setTrackColor',
+        lambda index, color: colors.__setitem__(index, color),
+    )
+    cache = getContext().track_cache
+    cache.beginFrame()
+    track = MixerTrack(3)
+    assert track.color == Color.fromInteger(0x123456)
+    track.color = Color.fromInteger(0x654321)
+    assert colors[3] == 0x654321
+    assert track.color == Color.fromInteger(0x654321)
+    cache.endFrame()
+
+
+def test_channel_cached(monkeypatch):
+    unsafeResetContext()
+    reads: list[int] = []
+
+    def getChannelColor(index: int) -> int:
+        reads.append(index)
+        return 0
+
+    monkeypatch.setattr(channels, 'getChannelColor', getChannelColor)
+    cache = getContext().track_cache
+    cache.beginFrame()
+    Channel(0).color
+    Channel(0).color
+    cache.endFrame()
+    assert reads == [0]
+
+
+def test_hit_rates_in_profiler(mute_reads):
+    getContext().enableProfiler()
+    cache = getContext().track_cache
+    cache.beginFrame()
+    for _ in range(4):
+        MixerTrack(1).mute
+    cache.endFrame()
+    profiler = getContext().profiler
+    assert profiler is not None
+    assert profiler.getCounters() == {
+        "tracks.cache.hits": 3,
+        "tracks.cache.misses": 1,
+    }
+    assert profiler.getHitRate("tracks.cache") == 0.75
+    assert cache.getHitRate() == 0.75
@@ -0,0 +1,97 @@
+"""
+tests > traffic_test
+
+Tests for counting the events matched and feedback messages sent by each
+control
+
+Authors:
+* Miguel Guthridge [hdsq@outlook.com.au, HDSQ#2154]
+
+This code is licensed under the GPL v3 license. Refer to the LICENSE file for
+more details.
+"""
+import json
+import pytest
+from fl_classes import FlMidiMsg
+from common.profiler.traffic import TrafficReport
+from common.types import Color
+from common.util.console_helpers import traffic
+from tests.helpers.controls import ColorControl, SimpleControl
+
+
+def test_matches_counted():
+    control = SimpleControl(1)
+    control.match(FlMidiMsg(0, 1, 64))
+    control.match(FlMidiMsg(0, 2, 64))
+    matches, sent, _ = control.getTraffic()
+    assert matches == 1
+    # The value changed, but there's no feedback to send it to
+    control.doTick(True)
+    assert control.getTraffic()[1] == sent == 0
+
+
+def test_feedback_counted():
+    control = ColorControl()
+    # Only changes are sent
+    control.doTick(False)
+    assert control.getTraffic()[1] == 0
+    control.color = Color.WHITE
+    control.doTick(False)
+    assert control.getTraffic()[1] == 1
+    # Thorough ticks send everything
+    control.doTick(True)
+    assert control.getTraffic()[1] == 2
+
+
+def test_reset():
+    control = ColorControl()
+    control.match(FlMidiMsg(0, 0, 64))
+    control.doTick(True)
+    _, _, since = control.getTraffic()
+    control.resetTraffic()
+    matches, sent, reset_since = control.getTraffic()
+    assert matches == sent == 0
+    assert reset_since >= since
+
+
+def test_report_rows():
+    quiet = ColorControl(0, (0, 0))
+    busy = ColorControl(1, (0, 1))
+    for _ in range(3):
+        busy.match(FlMidiMsg(0, 1, 64))
+    quiet.match(FlMidiMsg(0, 0, 64))
+    report = TrafficReport([quiet, busy, busy])
+    rows = report.getRows()
+    # Busiest first, without duplicates
+    assert [(r["coordinate"], r["in"]) for r in rows] \
+        == [([0, 1], 3), ([0, 0], 1)]
+    assert report.getTotal() == 4
+
+
+def test_report_printed(capsys: pytest.CaptureFixture):
+    controls = [ColorControl(i, (0, i)) for i in range(4)]
+    for _ in range(9):
+        controls[2].match(FlMidiMsg(0, 2, 64))
+    controls[0].match(FlMidiMsg(0, 0, 64))
+    TrafficReport(controls).print()
+    out = capsys.readouterr().out
+    assert "90.0%" in out
+    # Heatmap, with the busiest control darkest, and untouched controls
+    # blank
+    assert " |. @ |" in out
+
+
+def test_report_exported(tmp_path):
+    control = ColorControl()
+    control.match(FlMidiMsg(0, 0, 64))
+    path = tmp_path.joinpath("traffic.json")
+    TrafficReport([control]).export(str(path))
+    [row] = json.loads(path.read_text())["controls"]
+    assert row["type"] == "ColorControl"
+    assert row["in"] == 1
+    assert row["out"] == 0
+
+
+def test_helper_without_device(capsys: pytest.CaptureFixture):
+    traffic()
+    assert "not recognized" in capsys.readouterr().out